@@ -0,0 +1,382 @@
+"""
+Scaling benchmarks for the BOOTS calculation engine
+Times calculate_boots_operations and every stage on seeded synthetic
+scenarios, reports throughput and peak memory, and compares runs against a
+saved baseline to catch regressions
+
+Usage:
+    python boots_benchmark.py --sizes 10 1000 100000 --save bench_baseline.json
+    python boots_benchmark.py --compare bench_baseline.json
+    python boots_benchmark.py --sizes 100000 --memory      # also trace peak memory
+"""
+
+import argparse
+import json
+import logging
+import platform
+import sys
+import time
+import tracemalloc
+from dataclasses import dataclass, asdict
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from boots_calculator import BOOTSCalculator, BOOTSResults
+from boots_ingest import CompiledOperations
+from hex_grid import hex_key
+from unit_index import HexUnitIndex
+
+DEFAULT_SIZES = (10, 100, 1_000, 10_000, 100_000, 1_000_000)
+
+TERRAIN_TYPES = ['open', 'urban', 'forest', 'mountain', 'coastal']
+TERRAIN_WEIGHTS = [0.45, 0.15, 0.2, 0.1, 0.1]
+RED_TYPES = ['Light', 'Medium', 'Heavy', 'Amphib', 'SOF', 'Airborne', 'Air_Assault', 'Engineer']
+GREEN_TYPES = ['Light', 'Medium', 'Heavy', 'Recon', 'Engineer', 'SHORAD']
+FIRE_SUPPORT_TYPES = ['Towed_Arty', 'SP_Arty', 'Heavy', 'Medium']
+TARGET_TYPES = ['Maneuver', 'Artillery', 'Chokepoints', 'Infrastructure']
+
+
+@dataclass
+class Scenario:
+    """Synthetic inputs for one benchmark size"""
+    size: int
+    landed_bns: pd.DataFrame
+    green_maneuver: pd.DataFrame
+    red_operations: Dict
+    blue_operations: Dict
+    hex_terrain: Dict[str, str]
+
+
+@dataclass
+class BenchmarkResult:
+    """Timing and memory for one stage at one size"""
+    stage: str
+    size: int
+    seconds: float
+    items_per_second: float
+    peak_bytes: Optional[int] = None  # Only when memory was measured
+
+
+def generate_scenario(size: int,
+                      seed: int = 0,
+                      max_map_side: int = 200,
+                      garrison_hexes: int = 32) -> Scenario:
+    """
+    Seeded synthetic scenario with `size` operations of each kind
+
+    The hex map grows with size up to max_map_side x max_map_side hexes.
+    Green units sit in at most garrison_hexes distinct hexes, which bounds
+    the number of route searches movements need.
+    """
+
+    rng = np.random.default_rng(seed)
+
+    side = int(min(max_map_side, max(10, np.sqrt(size) * 2)))
+    qs, rs = np.meshgrid(np.arange(side), np.arange(side), indexing='ij')
+    hexes = np.array([hex_key(int(q), int(r)) for q, r in zip(qs.ravel(), rs.ravel())], dtype=object)
+    terrain = rng.choice(TERRAIN_TYPES, size=len(hexes), p=TERRAIN_WEIGHTS)
+    hex_terrain = dict(zip(hexes.tolist(), terrain.tolist()))
+
+    def pick_hexes(n: int) -> List[str]:
+        return hexes[rng.integers(0, len(hexes), n)].tolist()
+
+    def unit_lines(types: List[str], n_ops: int, max_lines: int, max_count: int) -> List[List[Dict]]:
+        lines = rng.integers(1, max_lines + 1, n_ops)
+        picked = rng.choice(types, size=int(lines.sum())).tolist()
+        counts = rng.integers(1, max_count + 1, int(lines.sum())).tolist()
+        out, k = [], 0
+        for n in lines:
+            out.append([{'type': picked[k + j], 'count': counts[k + j]} for j in range(n)])
+            k += n
+        return out
+
+    # Red landings and attacks (bn_count >= 4 keeps the landing draw ranges valid)
+    landing_hexes = pick_hexes(2 * size)
+    bn_counts = rng.integers(4, 9, 2 * size).tolist()
+    airborne_landings = [{'hex': h, 'bn_count': c, 'bn_type': 'Airborne'}
+                         for h, c in zip(landing_hexes[:size], bn_counts[:size])]
+    air_assault_landings = [{'hex': h, 'bn_count': c, 'bn_type': 'Air_Assault'}
+                            for h, c in zip(landing_hexes[size:], bn_counts[size:])]
+
+    attack_bns = unit_lines(RED_TYPES, size, 3, 4)
+    attack_fire_support = unit_lines(FIRE_SUPPORT_TYPES, size, 2, 3)
+    with_fire_support = rng.random(size) < 0.5
+    ground_attacks = [{'origin_hex': o, 'target_hex': t, 'attacking_bns': bns,
+                       'fire_support': fs if use_fs else []}
+                      for o, t, bns, fs, use_fs in zip(pick_hexes(size), pick_hexes(size), attack_bns,
+                                                       attack_fire_support, with_fire_support)]
+
+    # Green units in garrison hexes, landed Red BNs around the map
+    n_green = max(10, size // 10)
+    garrisons = pick_hexes(min(garrison_hexes, n_green))
+    green_maneuver = pd.DataFrame({
+        'Unit_ID': [f"G{i}" for i in range(n_green)],
+        'Unit_Type': rng.choice(GREEN_TYPES, n_green),
+        'Unit_Count': rng.integers(1, 4, n_green),
+        'Hex': [garrisons[i] for i in rng.integers(0, len(garrisons), n_green)],
+        'TO': rng.integers(1, 6, n_green)
+    })
+    n_landed = max(10, size // 10)
+    landed_bns = pd.DataFrame({
+        'BN_Type': rng.choice(RED_TYPES, n_landed),
+        'BNs_Landed': rng.integers(1, 4, n_landed),
+        'Hex': pick_hexes(n_landed)
+    })
+
+    # Blue movements (half of them routed to a hex) and fire plans
+    movers = rng.integers(0, n_green, size)
+    routed = rng.random(size) < 0.5
+    to_hexes = pick_hexes(size)
+    maneuver_movements = [{'unit_id': f"G{m}", 'unit_type': 'Medium', 'unit_count': 1,
+                           'from_to': int(a), 'to_to': int(b), 'to_hex': h if use_hex else None}
+                          for m, a, b, h, use_hex in zip(movers, rng.integers(1, 6, size),
+                                                         rng.integers(1, 6, size), to_hexes, routed)]
+    fire_support_plans = [{'plan_id': f"FS{i}", 'target_hex': h, 'target_type': t, 'supporting_units': units}
+                          for i, (h, t, units) in enumerate(zip(pick_hexes(size),
+                                                                rng.choice(TARGET_TYPES, size).tolist(),
+                                                                unit_lines(FIRE_SUPPORT_TYPES, size, 3, 3)))]
+
+    return Scenario(
+        size=size,
+        landed_bns=landed_bns,
+        green_maneuver=green_maneuver,
+        red_operations={'airborne_landings': airborne_landings,
+                        'air_assault_landings': air_assault_landings,
+                        'ground_attacks': ground_attacks},
+        blue_operations={'maneuver_movements': maneuver_movements,
+                         'fire_support_plans': fire_support_plans},
+        hex_terrain=hex_terrain
+    )
+
+
+def _measure(func: Callable[[], object], repeat: int, memory: bool = False) -> Tuple[float, Optional[int]]:
+    """
+    Best wall time over `repeat` runs
+
+    With memory, one more run is traced for its peak allocation (tracing
+    slows the run, so it is not timed); otherwise the peak is None.
+    """
+
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+
+    if not memory:
+        return best, None
+
+    tracemalloc.start()
+    try:
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return best, peak
+
+
+def benchmark_stages(scenario: Scenario,
+                     seed: int = 0,
+                     repeat: int = 3,
+                     stages: Optional[Sequence[str]] = None,
+                     memory: bool = False) -> List[BenchmarkResult]:
+    """Time the full calculation and every stage (or only the named stages) on one scenario"""
+
+    def calculator(**kwargs) -> BOOTSCalculator:
+        return BOOTSCalculator(rng=np.random.default_rng(seed), **kwargs)
+
+    s = scenario
+    red, blue = s.red_operations, s.blue_operations
+    ground_attacks = red['ground_attacks']
+
+    # Upstream results feed the casualty and territory stages, and compiled
+    # attacks the batch attack stage; only computed when those stages run
+    upstream: List[BOOTSResults] = []
+    compiled: List[CompiledOperations] = []
+
+    def reference() -> BOOTSResults:
+        if not upstream:
+            upstream.append(calculator().calculate_boots_operations(
+                s.landed_bns, s.green_maneuver, red, blue, s.hex_terrain
+            ))
+        return upstream[0]
+
+    def compiled_attacks() -> CompiledOperations:
+        if not compiled:
+            compiled.append(calculator().compile_operations({'ground_attacks': ground_attacks}, {}, s.hex_terrain))
+        return compiled[0]
+
+    def fresh_index() -> HexUnitIndex:
+        return HexUnitIndex.build(s.green_maneuver, s.landed_bns, BOOTSCalculator().unit_combat_strength)
+
+    # Movements share one calculator so the route cache behaves as across turns
+    movement_calculator = calculator()
+
+    # (stage, items or a function of the upstream results, timed call); item
+    # functions run before timing, so upstream work stays out of the times
+    timed = [
+        ('calculate_boots_operations', 2 * s.size + 3 * s.size,
+         lambda: calculator().calculate_boots_operations(s.landed_bns, s.green_maneuver, red, blue,
+                                                         s.hex_terrain)),
+        ('calculate_boots_operations[batch]', 2 * s.size + 3 * s.size,
+         lambda: calculator(batch_attacks=True).calculate_boots_operations(s.landed_bns, s.green_maneuver,
+                                                                           red, blue, s.hex_terrain)),
+        ('calculate_boots_operations[lightweight]', 2 * s.size + 3 * s.size,
+         lambda: calculator(batch_attacks=True, lightweight=True).calculate_boots_operations(
+             s.landed_bns, s.green_maneuver, red, blue, s.hex_terrain)),
+        ('_process_red_landings', 2 * s.size,
+         lambda: calculator()._process_red_landings(red['airborne_landings'], red['air_assault_landings'],
+                                                    s.hex_terrain)),
+        ('_process_red_ground_attacks', s.size,
+         lambda: calculator()._process_red_ground_attacks(ground_attacks, s.landed_bns, s.green_maneuver,
+                                                          s.hex_terrain)),
+        ('_process_red_ground_attacks_batch',
+         lambda: len(compiled_attacks().attacks),
+         lambda: calculator()._process_red_ground_attacks_batch(compiled_attacks().attacks,
+                                                                compiled_attacks().attack_bns, s.landed_bns,
+                                                                s.green_maneuver, s.hex_terrain)),
+        ('_process_blue_movements', s.size,
+         lambda: movement_calculator._process_blue_movements(blue['maneuver_movements'], s.green_maneuver,
+                                                             fresh_index(), s.hex_terrain)),
+        ('_process_blue_fire_support', s.size,
+         lambda: calculator()._process_blue_fire_support(blue['fire_support_plans'], s.landed_bns,
+                                                         s.green_maneuver, s.hex_terrain)),
+        ('_calculate_unit_casualties',
+         lambda: len(reference().attack_results) + len(reference().fire_support_effectiveness),
+         lambda: calculator()._calculate_unit_casualties(s.landed_bns, s.green_maneuver,
+                                                         reference().attack_results,
+                                                         reference().fire_support_effectiveness,
+                                                         reference().fire_support_area_effects)),
+        ('_update_territory_control',
+         lambda: len(reference().landing_results) + len(reference().attack_results),
+         lambda: calculator()._update_territory_control(reference().landing_results,
+                                                        reference().attack_results,
+                                                        reference().movement_results)),
+    ]
+
+    if stages is not None:
+        unknown = set(stages) - {stage for stage, _, _ in timed}
+        if unknown:
+            raise ValueError(f"Unknown stages {sorted(unknown)}; expected some of {[t[0] for t in timed]}")
+        timed = [t for t in timed if t[0] in stages]
+
+    results = []
+    for stage, items, func in timed:
+        items = items() if callable(items) else items
+        seconds, peak = _measure(func, repeat, memory)
+        results.append(BenchmarkResult(stage, s.size, seconds,
+                                       items / seconds if seconds > 0 else float('inf'), peak))
+
+    return results
+
+
+def run_benchmarks(sizes: Sequence[int] = DEFAULT_SIZES,
+                   seed: int = 0,
+                   repeat: int = 3,
+                   stages: Optional[Sequence[str]] = None,
+                   memory: bool = False) -> List[BenchmarkResult]:
+    """Benchmark every stage (or only the named stages) at each size, tracing peak memory with memory"""
+
+    results = []
+    for size in sizes:
+        scenario = generate_scenario(size, seed)
+        # Large sizes run once: the first timing is representative and repeats are costly
+        size_results = benchmark_stages(scenario, seed, repeat if size <= 10_000 else 1, stages, memory)
+        for r in size_results:
+            results.append(r)
+            peak = f"{r.peak_bytes / 2**20:>9.1f} MiB" if r.peak_bytes is not None else f"{'-':>13}"
+            print(f"{r.stage:<40} {r.size:>9} {r.seconds * 1000:>11.2f} ms "
+                  f"{r.items_per_second:>14,.0f} items/s {peak}", flush=True)
+
+    return results
+
+
+def save_baseline(results: List[BenchmarkResult], path: str):
+    """Save results with the environment they were measured in"""
+
+    with open(path, 'w') as f:
+        json.dump({
+            'meta': {
+                'python': platform.python_version(),
+                'numpy': np.__version__,
+                'pandas': pd.__version__,
+                'machine': platform.machine(),
+                'timestamp': pd.Timestamp.now().isoformat()
+            },
+            'results': [asdict(r) for r in results]
+        }, f, indent=2)
+
+
+def compare_to_baseline(results: List[BenchmarkResult],
+                        path: str,
+                        tolerance: float = 0.25) -> List[str]:
+    """
+    Compare results against a saved baseline
+
+    Returns:
+        One message per stage/size that got slower, or used more peak memory,
+        by more than tolerance (as a fraction); memory is compared only where
+        both runs measured it
+    """
+
+    with open(path) as f:
+        baseline = {(r['stage'], r['size']): r for r in json.load(f)['results']}
+
+    regressions = []
+    for r in results:
+        base = baseline.get((r.stage, r.size))
+        if base is None:
+            continue
+        if r.seconds > base['seconds'] * (1 + tolerance):
+            regressions.append(f"{r.stage} @ {r.size}: {base['seconds'] * 1000:.2f} ms -> "
+                               f"{r.seconds * 1000:.2f} ms ({r.seconds / base['seconds']:.2f}x)")
+        if r.peak_bytes is not None and base.get('peak_bytes') is not None \
+                and r.peak_bytes > base['peak_bytes'] * (1 + tolerance):
+            regressions.append(f"{r.stage} @ {r.size}: peak {base['peak_bytes'] / 2**20:.1f} MiB -> "
+                               f"{r.peak_bytes / 2**20:.1f} MiB")
+
+    return regressions
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description='Benchmark BOOTS calculation stages')
+    parser.add_argument('--sizes', type=int, nargs='+', default=list(DEFAULT_SIZES),
+                        help='Operations per stage to benchmark')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--repeat', type=int, default=3, help='Timing repeats (best is kept)')
+    parser.add_argument('--stages', nargs='+', help='Only run these stages (others are skipped)')
+    parser.add_argument('--memory', action='store_true',
+                        help='Also trace peak memory (runs every stage once more)')
+    parser.add_argument('--save', metavar='PATH', help='Save results as a baseline')
+    parser.add_argument('--compare', metavar='PATH', help='Compare against a saved baseline')
+    parser.add_argument('--tolerance', type=float, default=0.25,
+                        help='Allowed slowdown/memory growth before flagging a regression')
+    args = parser.parse_args(argv)
+
+    # Per-movement restriction warnings would flood the report
+    logging.getLogger('boots_calculator').setLevel(logging.ERROR)
+
+    print(f"{'stage':<40} {'size':>9} {'time':>14} {'throughput':>23} {'peak':>13}")
+    results = run_benchmarks(args.sizes, args.seed, args.repeat, args.stages, args.memory)
+
+    if args.save:
+        save_baseline(results, args.save)
+        print(f"Baseline saved to {args.save}")
+
+    if args.compare:
+        regressions = compare_to_baseline(results, args.compare, args.tolerance)
+        if regressions:
+            print(f"{len(regressions)} regressions against {args.compare}:")
+            for message in regressions:
+                print(f"  {message}")
+            return 1
+        print(f"No regressions against {args.compare}")
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,35 +1,126 @@
 """
 BOOTS (Ground Operations) calculation engine
 Implements landing operations, ground attacks, and movement from PRD.md
+
+The engine itself runs on NumPy arrays; pandas is only imported when a
+DataFrame view of the results is built.
 """
 
-import pandas as pd
+from __future__ import annotations
+
 import numpy as np
-from typing import Dict, Tuple, List, Optional
+from typing import TYPE_CHECKING, Dict, Tuple, List, Optional
 import logging
-from dataclasses import dataclass
+from dataclasses import dataclass, field, replace
+
+from boots_ingest import MISSING_TO, CompiledOperations, compile_operations, count_operations
+from boots_metrics import MetricsHook, StageMetrics, StageRecorder
+from hex_grid import HexTerrain, lookup_terrain, terrain_stamp
+from result_table import ResultTable, Table, as_frame, column, concat_tables, is_missing, object_column
+from route_planner import RoutePlanner
+from unit_index import HexUnitIndex
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+# Output schemas of the result tables
+LANDING_COLUMNS = ['Operation_Type', 'Hex', 'BN_Type', 'BNs_Attempted', 'BNs_Landed', 'Success', 'Terrain']
+ATTACK_RESULT_COLUMNS = ['Origin_Hex', 'Target_Hex', 'Attack_Strength', 'Defending_Strength',
+                         'Strength_Ratio', 'Outcome', 'Casualties_Ratio', 'Terrain',
+                         'Fire_Support_Used']
+MOVEMENT_COLUMNS = ['Unit_ID', 'Unit_Type', 'Unit_Count', 'From_TO', 'To_TO', 'Success', 'Reason',
+                    'Path_Length', 'Arrival_Time']
+CASUALTY_COLUMNS = ['Team', 'Operation', 'Hex', 'Casualties', 'Reason']
+TERRITORY_COLUMNS = ['Hex', 'Control', 'Strength', 'Source']
+
+FIRE_SUPPORT_AREA_COLUMNS = ['Plan_ID', 'Target_Hex', 'Hex', 'Distance', 'Red_Strength', 'Effect']
+
+# Fire support effectiveness multiplier by target type (others: 0.8)
+FIRE_SUPPORT_TARGET_MODIFIERS = {
+    'Maneuver': 1.0,
+    'Artillery': 1.2,       # Better against artillery
+    'Chokepoints': 0.8,     # Harder to hit infrastructure
+    'Infrastructure': 0.6
+}
+
+# Fixed categories for low-cardinality result columns (Terrain categories
+# follow the calculator's terrain_modifiers)
+RESULT_CATEGORIES = {
+    'Team': ['Red', 'Green'],
+    'Control': ['Red', 'Contested'],
+    'Outcome': ['Success', 'Partial', 'Failure'],
+    'Source': ['Airborne Landing', 'Air_Assault Landing', 'Ground Attack', 'Partial Attack']
+}
+
+
+# BOOTSResults fields holding result tables
+RESULT_TABLES = ['landing_results', 'attack_results', 'movement_results', 'unit_casualties',
+                 'territory_control', 'fire_support_area_effects']
+
+
+def _numeric_column(values: List, empty_dtype=np.int64) -> np.ndarray:
+    """Array for collected per-item numbers (int or float as given; object if mixed with non-numbers)"""
+    if not values:
+        return np.zeros(0, dtype=empty_dtype)
+    array = np.asarray(values)
+    return array if array.dtype.kind in 'biuf' else object_column(values)
+
+
+def _to_column(to_codes: np.ndarray) -> np.ndarray:
+    """Movement TOs for output, missing TOs as NaN"""
+    missing = to_codes == MISSING_TO
+    return np.where(missing, np.nan, to_codes) if missing.any() else to_codes
+
 
 @dataclass
 class BOOTSResults:
-    """Results from BOOTS calculations"""
-    landing_results: pd.DataFrame  # Airborne/Air Assault landing outcomes
-    attack_results: pd.DataFrame   # Ground attack outcomes
-    movement_results: pd.DataFrame # Unit movement results
-    unit_casualties: pd.DataFrame  # Updated unit casualties
-    territory_control: pd.DataFrame # Hex control status
+    """
+    Results from BOOTS calculations
+    
+    Result tables are DataFrames, or ResultTables (NumPy columns) from a
+    lightweight calculator; frame()/frames() give the DataFrame view of either.
+    """
+    landing_results: Table  # Airborne/Air Assault landing outcomes
+    attack_results: Table   # Ground attack outcomes
+    movement_results: Table # Unit movement results
+    unit_casualties: Table  # Updated unit casualties
+    territory_control: Table # Hex control status
     fire_support_effectiveness: Dict[str, float]  # Fire support by mission
     total_landings_attempted: int
     total_landings_successful: int
     total_attacks_attempted: int
     total_attacks_successful: int
     warnings: List[str]
+    fire_support_area_effects: Optional[Table] = None  # Red hexes hit by each fire plan
+    metrics: Dict[str, StageMetrics] = field(default_factory=dict)  # Timing/memory/counts per step
+    
+    def frame(self, name: str) -> Optional[pd.DataFrame]:
+        """DataFrame view of one result table (imports pandas on first use)"""
+        return as_frame(getattr(self, name))
+    
+    def frames(self) -> BOOTSResults:
+        """These results with every result table as a DataFrame"""
+        return replace(self, **{name: self.frame(name) for name in RESULT_TABLES})
 
 class BOOTSCalculator:
     """BOOTS calculation engine implementing PRD.md sections 522-563"""
     
-    def __init__(self):
+    def __init__(self, rng=None, batch_attacks: bool = False, lightweight: bool = False):
         self.logger = logging.getLogger(__name__)
         
+        # Random source for all stochastic steps: an np.random.Generator or the
+        # legacy RandomState API. Defaults to the global np.random state so
+        # np.random.seed() keeps working for callers.
+        self.rng = rng if rng is not None else np.random
+        
+        # Resolve ground attacks with the columnar batch engine instead of
+        # the per-attack loop (both give identical results for the same seed)
+        self.batch_attacks = batch_attacks
+        
+        # Return results as ResultTables (NumPy columns) instead of DataFrames,
+        # so runs that only need arrays or summary counts never import pandas
+        self.lightweight = lightweight
+        
         # Unit combat strength values (placeholder - would be defined in config)
         self.unit_combat_strength = {
             'Light': 1.0,
@@ -58,73 +149,159 @@ class BOOTSCalculator:
             'open': 1.0
         }
         
+        # Theater of operations per hex, used by the route planner to apply
+        # TO movement restrictions along paths (placeholder - from scenario)
+        self.hex_to: Optional[Dict[str, int]] = None
+        
+        # Terrain-weighted path cost a maneuver unit covers per turn (placeholder)
+        self.movement_points_per_turn = 10.0
+        
+        # Radius (hexes) of the area hit by a fire support plan (placeholder)
+        self.fire_support_radius = 1
+        
+        # Route planner cached for the last map and movement settings seen
+        self._route_planner: Optional[Tuple[RoutePlanner, Tuple]] = None
+        
+        # Integer-coded unit type tables for batch attacks and fire support,
+        # rebuilt when unit_combat_strength changes
+        self._unit_tables = None
+        
+        # Per-step instrumentation: allocation peaks (tracemalloc, slow) are
+        # only recorded when track_memory is set; each hook is called with the
+        # StageMetrics of every step as it finishes
+        self.track_memory = False
+        self.metrics_hooks: List[MetricsHook] = []
+        
     def calculate_boots_operations(self,
-                                 landed_bns: pd.DataFrame,
-                                 green_maneuver: pd.DataFrame,
+                                 landed_bns: Table,
+                                 green_maneuver: Table,
                                  red_operations: Dict,
                                  blue_operations: Dict,
-                                 hex_terrain: Dict[str, str]) -> BOOTSResults:
+                                 hex_terrain: HexTerrain) -> BOOTSResults:
         """
         Main BOOTS calculation following PRD.md specification lines 525-563
         
         Args:
-            landed_bns: BNs that successfully landed from Offload
-            green_maneuver: Current Green maneuver unit positions
+            landed_bns: BNs that successfully landed from Offload (DataFrame or ResultTable)
+            green_maneuver: Current Green maneuver unit positions (DataFrame or ResultTable)
             red_operations: Red player operations (landings, attacks)
             blue_operations: Blue player operations (movements, fire support)
-            hex_terrain: Terrain type by hex coordinate
+            hex_terrain: Terrain type by hex coordinate (dict or HexTerrainGrid)
             
         Returns:
-            BOOTSResults with all ground operations
+            BOOTSResults with all ground operations (ResultTables when lightweight)
         """
         
-        warnings = []
+        recorder = StageRecorder(self.track_memory, self.metrics_hooks)
+        
+        # Step 0: Compile and validate the operation dicts once
+        with recorder.stage('ingest', count_operations(red_operations, blue_operations)) as stage:
+            operations = self.compile_operations(red_operations, blue_operations, hex_terrain)
+            stage.items_out = operations.n_operations
+        warnings = list(operations.warnings)
         
         # Step 1: Process Red Airborne/Air Assault Landings
-        landing_results = self._process_red_landings(
-            red_operations.get('airborne_landings', []),
-            red_operations.get('air_assault_landings', []),
-            hex_terrain
-        )
+        with recorder.stage('red_landings', len(operations.landings)) as stage:
+            landing_results = self._resolve_red_landings(operations.landings, hex_terrain)
+            stage.items_out = len(landing_results)
+        
+        # Index Green and landed Red unit strength by hex for this turn
+        with recorder.stage('unit_index', len(green_maneuver) + len(landed_bns)):
+            unit_index = HexUnitIndex.build(green_maneuver, landed_bns, self.unit_combat_strength)
         
         # Step 2: Process Red Ground Attacks
-        attack_results = self._process_red_ground_attacks(
-            red_operations.get('ground_attacks', []),
-            landed_bns, green_maneuver, hex_terrain
-        )
+        with recorder.stage('red_ground_attacks', len(operations.attacks)) as stage:
+            if self.batch_attacks:
+                attack_results = self._process_red_ground_attacks_batch(
+                    operations.attacks, operations.attack_bns, landed_bns, green_maneuver, hex_terrain, unit_index
+                )
+            else:
+                attack_results = self._resolve_red_ground_attacks(
+                    operations.attacks, operations.attack_bns, landed_bns, green_maneuver, hex_terrain, unit_index
+                )
+            stage.items_out = len(attack_results)
         
         # Step 3: Process Blue Maneuver Movements
-        movement_results = self._process_blue_movements(
-            blue_operations.get('maneuver_movements', []),
-            green_maneuver
-        )
+        with recorder.stage('blue_movements', len(operations.movements)) as stage:
+            movement_results = self._resolve_blue_movements(
+                operations.movements, green_maneuver, unit_index, hex_terrain
+            )
+            stage.items_out = len(movement_results)
         
         # Step 4: Process Blue Fire Support
-        fire_support_effectiveness = self._process_blue_fire_support(
-            blue_operations.get('fire_support_plans', []),
-            landed_bns, green_maneuver, hex_terrain
-        )
+        with recorder.stage('blue_fire_support', len(operations.fire_support_plans)) as stage:
+            fire_support_effectiveness, fire_support_area_effects = self._resolve_blue_fire_support(
+                operations.fire_support_plans, operations.fire_support_units,
+                landed_bns, green_maneuver, hex_terrain, unit_index
+            )
+            stage.items_out = len(fire_support_effectiveness)
         
         # Step 5: Calculate Unit Casualties
-        unit_casualties = self._calculate_unit_casualties(
-            landed_bns, green_maneuver, attack_results, fire_support_effectiveness
-        )
+        with recorder.stage('unit_casualties', len(attack_results) + len(fire_support_effectiveness)) as stage:
+            unit_casualties = self._calculate_unit_casualties(
+                landed_bns, green_maneuver, attack_results, fire_support_effectiveness, fire_support_area_effects
+            )
+            stage.items_out = len(unit_casualties)
         
         # Step 6: Update Territory Control
-        territory_control = self._update_territory_control(
-            landing_results, attack_results, movement_results
+        with recorder.stage('territory_control',
+                            len(landing_results) + len(attack_results) + len(movement_results)) as stage:
+            territory_control = self._update_territory_control(
+                landing_results, attack_results, movement_results
+            )
+            stage.items_out = len(territory_control)
+        
+        return self._build_results(
+            operations, landing_results, attack_results, movement_results, unit_casualties,
+            territory_control, fire_support_effectiveness, fire_support_area_effects, warnings, recorder
         )
         
+    def compile_operations(self,
+                           red_operations: Dict,
+                           blue_operations: Dict,
+                           hex_terrain: Optional[HexTerrain] = None) -> CompiledOperations:
+        """
+        Compile operation dicts into the columnar records the steps run on
+        
+        Malformed entries, unknown unit or target types and hexes missing from
+        hex_terrain are reported in CompiledOperations.warnings along with the
+        default used in their place.
+        """
+        type_codes, _, _ = self._unit_type_tables()
+        return compile_operations(red_operations, blue_operations, type_codes, hex_terrain)
+        
+    def _compiled(self, red_operations: Dict, blue_operations: Dict,
+                  hex_terrain: Optional[HexTerrain]) -> CompiledOperations:
+        """Compiled operations for the dict-based step methods, logging validation warnings"""
+        operations = self.compile_operations(red_operations, blue_operations, hex_terrain)
+        for warning in operations.warnings:
+            self.logger.warning(warning)
+        return operations
+        
+    def _build_results(self,
+                       operations: CompiledOperations,
+                       landing_results: ResultTable,
+                       attack_results: ResultTable,
+                       movement_results: ResultTable,
+                       unit_casualties: ResultTable,
+                       territory_control: ResultTable,
+                       fire_support_effectiveness: Dict[str, float],
+                       fire_support_area_effects: ResultTable,
+                       warnings: List[str],
+                       recorder: StageRecorder) -> BOOTSResults:
+        """Summarize the stage outputs into BOOTSResults (DataFrames unless lightweight)"""
+        
         # Calculate summary statistics
-        total_landings_attempted = len(red_operations.get('airborne_landings', [])) + len(red_operations.get('air_assault_landings', []))
-        total_landings_successful = len(landing_results[landing_results['Success'] == True])
-        total_attacks_attempted = len(red_operations.get('ground_attacks', []))
-        total_attacks_successful = len(attack_results[attack_results['Outcome'] == 'Success'])
+        total_landings_attempted = len(operations.landings)
+        total_landings_successful = int(np.count_nonzero(landing_results['Success']))
+        total_attacks_attempted = len(operations.attacks)
+        total_attacks_successful = int(np.count_nonzero(attack_results['Outcome'] == 'Success'))
         
-        self.logger.info(f"BOOTS Complete: {total_landings_successful}/{total_landings_attempted} landings, "
-                        f"{total_attacks_successful}/{total_attacks_attempted} attacks successful")
+        self.logger.info("BOOTS Complete: %d/%d landings, %d/%d attacks successful",
+                         total_landings_successful, total_landings_attempted,
+                         total_attacks_successful, total_attacks_attempted)
         
-        return BOOTSResults(
+        results = BOOTSResults(
             landing_results=landing_results,
             attack_results=attack_results,
             movement_results=movement_results,
@@ -135,118 +312,152 @@ class BOOTSCalculator:
             total_landings_successful=total_landings_successful,
             total_attacks_attempted=total_attacks_attempted,
             total_attacks_successful=total_attacks_successful,
-            warnings=warnings
+            warnings=warnings,
+            fire_support_area_effects=fire_support_area_effects,
+            metrics=recorder.metrics
         )
         
+        if not self.lightweight:
+            # DataFrame view for callers that work with frames
+            with recorder.stage('result_frames', sum(len(getattr(results, name)) for name in RESULT_TABLES)) as stage:
+                results = results.frames()
+                stage.items_out = stage.items_in
+        
+        return results
+        
+    def _randint(self, low: int, high: int) -> int:
+        """Draw an integer in [low, high) from either a Generator or the legacy API"""
+        if isinstance(self.rng, np.random.Generator):
+            return int(self.rng.integers(low, high))
+        return self.rng.randint(low, high)
+        
     def _process_red_landings(self,
                             airborne_landings: List[Dict],
                             air_assault_landings: List[Dict],
-                            hex_terrain: Dict[str, str]) -> pd.DataFrame:
+                            hex_terrain: HexTerrain) -> ResultTable:
         """Process Red airborne and air assault landings (RBOOTT1, RBOOTT2)"""
         
-        landing_data = []
+        operations = self._compiled({'airborne_landings': airborne_landings,
+                                     'air_assault_landings': air_assault_landings}, {}, hex_terrain)
+        return self._resolve_red_landings(operations.landings, hex_terrain)
         
-        # Process airborne landings
-        for landing in airborne_landings:
-            hex_coord = landing.get('hex')
-            bn_count = landing.get('bn_count', 0)
-            bn_type = landing.get('bn_type', 'Airborne')
-            
-            # Simple success calculation (would use Matt's program in reality)
-            terrain = hex_terrain.get(hex_coord, 'open')
-            terrain_mod = self.terrain_modifiers.get(terrain, 1.0)
-            
-            # Airborne units are good at landing in difficult terrain
-            success_chance = 0.8 / terrain_mod  # Better in difficult terrain
-            success = np.random.random() < success_chance
-            
-            units_landed = bn_count if success else max(0, bn_count - np.random.randint(1, bn_count + 1))
-            
-            landing_data.append({
-                'Operation_Type': 'Airborne',
-                'Hex': hex_coord,
-                'BN_Type': bn_type,
-                'BNs_Attempted': bn_count,
-                'BNs_Landed': units_landed,
-                'Success': success,
-                'Terrain': terrain
-            })
-            
-            self.logger.debug(f"Airborne landing at {hex_coord}: {units_landed}/{bn_count} successful")
+    def _resolve_red_landings(self, landings: ResultTable, hex_terrain: HexTerrain) -> ResultTable:
+        """Resolve compiled landings (airborne first, then air assault, as draws are taken in order)"""
         
-        # Process air assault landings
-        for landing in air_assault_landings:
-            hex_coord = landing.get('hex')
-            bn_count = landing.get('bn_count', 0)
-            bn_type = landing.get('bn_type', 'Air_Assault')
-            
-            # Air assault units are more flexible
-            terrain = hex_terrain.get(hex_coord, 'open')
-            terrain_mod = self.terrain_modifiers.get(terrain, 1.0)
-            
-            success_chance = 0.85  # Generally high success rate
-            success = np.random.random() < success_chance
-            
-            units_landed = bn_count if success else max(0, bn_count - np.random.randint(1, max(1, bn_count // 2)))
-            
-            landing_data.append({
-                'Operation_Type': 'Air_Assault',
-                'Hex': hex_coord,
-                'BN_Type': bn_type,
-                'BNs_Attempted': bn_count,
-                'BNs_Landed': units_landed,
-                'Success': success,
-                'Terrain': terrain
-            })
-            
-            self.logger.debug(f"Air assault landing at {hex_coord}: {units_landed}/{bn_count} successful")
+        hexes = landings['Hex']
+        bn_counts = landings['BN_Count']
+        airborne = landings['Operation_Type'] == 'Airborne'
         
-        return pd.DataFrame(landing_data)
+        # Simple success calculation (would use Matt's program in reality)
+        terrain, terrain_mod = lookup_terrain(hex_terrain, hexes, self.terrain_modifiers,
+                                              keys=landings['Hex_Key'])
+        
+        # Airborne units are good at landing in difficult terrain; air
+        # assault units are more flexible
+        success_chance = np.where(airborne, 0.8 / terrain_mod, 0.85)
+        
+        bns_landed = []
+        successes = np.zeros(len(landings), dtype=bool)
+        
+        # Per-item debug lines are only built when DEBUG is on
+        debug = self.logger.isEnabledFor(logging.DEBUG)
+        
+        for i, (bn_count, is_airborne, chance) in enumerate(zip(bn_counts.tolist(), airborne.tolist(),
+                                                                 success_chance.tolist())):
+            success = self.rng.random() < chance
+        
+            if success or bn_count <= 0:
+                units_landed = bn_count  # Nothing to lose without BNs (invalid counts compile to 0)
+            elif is_airborne:
+                units_landed = max(0, bn_count - self._randint(1, bn_count + 1))
+            else:
+                units_landed = max(0, bn_count - self._randint(1, max(2, bn_count // 2)))
+        
+            bns_landed.append(units_landed)
+            successes[i] = success
+        
+            if debug:
+                self.logger.debug("%s landing at %s: %s/%s successful",
+                                  'Airborne' if is_airborne else 'Air assault', hexes[i], units_landed, bn_count)
+        
+        return self._table({
+            'Operation_Type': landings['Operation_Type'],
+            'Hex': hexes,
+            'BN_Type': landings['BN_Type'],
+            'BNs_Attempted': bn_counts,
+            'BNs_Landed': _numeric_column(bns_landed),
+            'Success': successes,
+            'Terrain': object_column(terrain)
+        })
         
     def _process_red_ground_attacks(self,
                                   ground_attacks: List[Dict],
-                                  red_units: pd.DataFrame,
-                                  green_units: pd.DataFrame,
-                                  hex_terrain: Dict[str, str]) -> pd.DataFrame:
+                                  red_units: Table,
+                                  green_units: Table,
+                                  hex_terrain: HexTerrain,
+                                  unit_index: Optional[HexUnitIndex] = None) -> ResultTable:
         """Process Red ground attacks (RBOOTT3)"""
         
-        attack_data = []
+        operations = self._compiled({'ground_attacks': ground_attacks}, {}, hex_terrain)
+        return self._resolve_red_ground_attacks(
+            operations.attacks, operations.attack_bns, red_units, green_units, hex_terrain, unit_index
+        )
+        
+    def _resolve_red_ground_attacks(self,
+                                    attacks: ResultTable,
+                                    attack_bns: ResultTable,
+                                    red_units: Table,
+                                    green_units: Table,
+                                    hex_terrain: HexTerrain,
+                                    unit_index: Optional[HexUnitIndex] = None) -> ResultTable:
+        """Resolve compiled ground attacks one by one (see _process_red_ground_attacks_batch)"""
+        
+        if unit_index is None:
+            unit_index = HexUnitIndex.build(green_units, red_units, self.unit_combat_strength)
+        
+        n_attacks = len(attacks)
+        target_hexes = attacks['Target_Hex']
+        
+        # Calculate attacking force and fire support strength per attack from the coded BN lines
+        _, strength_table, _ = self._unit_type_tables()
+        line_attack = attack_bns['Attack']
+        line_fire_support = attack_bns['Fire_Support']
+        line_strength = attack_bns['Count'] * strength_table[attack_bns['Type_Code']]
+        attack_strength = np.bincount(line_attack[~line_fire_support], weights=line_strength[~line_fire_support],
+                                      minlength=n_attacks)
+        fire_support_strength = np.bincount(line_attack[line_fire_support],
+                                            weights=line_strength[line_fire_support], minlength=n_attacks)
+        fire_support_used = np.bincount(line_attack[line_fire_support], minlength=n_attacks) > 0
+        
+        terrain, terrain_mod = lookup_terrain(hex_terrain, target_hexes, self.terrain_modifiers,
+                                              keys=attacks['Target_Key'])
+        
+        attack_strengths = np.zeros(n_attacks)
+        defending_strengths = np.zeros(n_attacks)
+        strength_ratios = np.zeros(n_attacks)
+        casualties_ratios = np.zeros(n_attacks)
+        outcomes = []
+        debug = self.logger.isEnabledFor(logging.DEBUG)
+        has_green = unit_index.has_positions('Green')
+        if has_green:
+            green_strength = unit_index.strengths_at('Green', target_hexes, keys=attacks['Target_Key'])
+        
+        for i in range(n_attacks):
+            target_hex = target_hexes[i]
+            total_attack_strength = attack_strength[i] + fire_support_strength[i] * 0.5  # Fire support is support
+        
+            # Calculate defending force strength from the Green units in the target hex
+            if has_green:
+                defending_strength = green_strength[i]
+            else:
+                defending_strength = self.rng.uniform(0.5, 1.5) * total_attack_strength  # Placeholder without positions
         
-        for attack in ground_attacks:
-            origin_hex = attack.get('origin_hex')
-            target_hex = attack.get('target_hex')
-            attacking_bns = attack.get('attacking_bns', [])
-            fire_support = attack.get('fire_support', [])
-            
-            # Calculate attacking force strength
-            attack_strength = 0
-            for bn_info in attacking_bns:
-                bn_type = bn_info.get('type')
-                bn_count = bn_info.get('count', 0)
-                unit_strength = self.unit_combat_strength.get(bn_type, 1.0)
-                attack_strength += bn_count * unit_strength
-            
-            # Add fire support
-            fire_support_strength = 0
-            for fs_info in fire_support:
-                fs_type = fs_info.get('type')
-                fs_count = fs_info.get('count', 0)
-                fs_strength = self.unit_combat_strength.get(fs_type, 1.0)
-                fire_support_strength += fs_count * fs_strength
-            
-            total_attack_strength = attack_strength + fire_support_strength * 0.5  # Fire support is support
-            
-            # Calculate defending force strength (simplified)
-            defending_strength = np.random.uniform(0.5, 1.5) * total_attack_strength  # Placeholder
-            
             # Apply terrain modifier
-            terrain = hex_terrain.get(target_hex, 'open')
-            terrain_mod = self.terrain_modifiers.get(terrain, 1.0)
-            defending_strength *= terrain_mod  # Defenders benefit from terrain
-            
+            defending_strength *= terrain_mod[i]  # Defenders benefit from terrain
+        
             # Determine outcome
             strength_ratio = total_attack_strength / max(defending_strength, 0.1)
-            
+        
             if strength_ratio >= 2.0:
                 outcome = 'Success'
                 casualties_ratio = 0.1  # Light casualties for overwhelming victory
@@ -259,69 +470,223 @@ class BOOTSCalculator:
             else:
                 outcome = 'Failure'
                 casualties_ratio = 0.4  # Heavy casualties for failed attack
-            
-            attack_data.append({
-                'Origin_Hex': origin_hex,
-                'Target_Hex': target_hex,
-                'Attack_Strength': total_attack_strength,
-                'Defending_Strength': defending_strength,
-                'Strength_Ratio': strength_ratio,
-                'Outcome': outcome,
-                'Casualties_Ratio': casualties_ratio,
-                'Terrain': terrain,
-                'Fire_Support_Used': len(fire_support) > 0
-            })
-            
-            self.logger.debug(f"Attack {origin_hex}→{target_hex}: {outcome} "
-                            f"(ratio: {strength_ratio:.2f}, casualties: {casualties_ratio:.1%})")
         
-        return pd.DataFrame(attack_data)
+            attack_strengths[i] = total_attack_strength
+            defending_strengths[i] = defending_strength
+            strength_ratios[i] = strength_ratio
+            casualties_ratios[i] = casualties_ratio
+            outcomes.append(outcome)
+        
+            if debug:
+                self.logger.debug("Attack %s→%s: %s (ratio: %.2f, casualties: %.1f%%)",
+                                  attacks['Origin_Hex'][i], target_hex, outcome, strength_ratio,
+                                  casualties_ratio * 100)
+        
+        return self._table({
+            'Origin_Hex': attacks['Origin_Hex'],
+            'Target_Hex': target_hexes,
+            'Attack_Strength': attack_strengths,
+            'Defending_Strength': defending_strengths,
+            'Strength_Ratio': strength_ratios,
+            'Outcome': object_column(outcomes),
+            'Casualties_Ratio': casualties_ratios,
+            'Terrain': object_column(terrain),
+            'Fire_Support_Used': fire_support_used
+        })
+        
+    def _process_red_ground_attacks_batch(self,
+                                        attacks: Table,
+                                        attack_bns: Table,
+                                        red_units: Table,
+                                        green_units: Table,
+                                        hex_terrain: HexTerrain,
+                                        unit_index: Optional[HexUnitIndex] = None) -> ResultTable:
+        """
+        Process Red ground attacks (RBOOTT3) as one columnar batch
+        
+        Same rules and output schema as _process_red_ground_attacks, computed
+        with NumPy operations over the whole batch. Random draws are taken in
+        attack order, so both paths give identical results for the same seed.
+        attacks and attack_bns are the tables of
+        boots_ingest.compile_ground_attacks; tables read from other programs
+        may leave out the Type_Code and Target_Key columns.
+        """
+        
+        n_attacks = len(attacks)
+        target_hexes = np.asarray(attacks['Target_Hex'], dtype=object)
+        
+        # Calculate attacking force and fire support strength per attack
+        type_codes, strength_table, _ = self._unit_type_tables()
+        line_attack = np.asarray(attack_bns['Attack'], dtype=np.int64)
+        line_fire_support = np.asarray(attack_bns['Fire_Support'], dtype=bool)
+        if 'Type_Code' in attack_bns:
+            line_codes = np.asarray(attack_bns['Type_Code'], dtype=np.int64)
+        else:
+            line_codes = np.fromiter((type_codes.get(t, len(type_codes)) for t in attack_bns['Type']),
+                                     dtype=np.int64, count=len(line_attack))
+        line_strength = np.asarray(attack_bns['Count'], dtype=np.float64) * strength_table[line_codes]
+        
+        attack_strength = np.bincount(line_attack[~line_fire_support],
+                                      weights=line_strength[~line_fire_support],
+                                      minlength=n_attacks)
+        fire_support_strength = np.bincount(line_attack[line_fire_support],
+                                            weights=line_strength[line_fire_support],
+                                            minlength=n_attacks)
+        fire_support_used = np.bincount(line_attack[line_fire_support],
+                                        minlength=n_attacks) > 0
+        
+        total_attack_strength = attack_strength + fire_support_strength * 0.5  # Fire support is support
+        
+        # Calculate defending force strength with one join against the hex index
+        target_keys = np.asarray(attacks['Target_Key'], dtype=np.int64) if 'Target_Key' in attacks else None
+        if unit_index is None:
+            unit_index = HexUnitIndex.build(green_units, red_units, self.unit_combat_strength)
+        if unit_index.has_positions('Green'):
+            defending_strength = unit_index.strengths_at('Green', target_hexes, keys=target_keys)
+        else:
+            defending_strength = self.rng.uniform(0.5, 1.5, size=n_attacks) * total_attack_strength  # Placeholder without positions
+        
+        # Apply terrain modifier
+        terrain, terrain_mod = lookup_terrain(hex_terrain, target_hexes, self.terrain_modifiers, keys=target_keys)
+        defending_strength *= terrain_mod  # Defenders benefit from terrain
+        
+        # Determine outcome
+        strength_ratio = total_attack_strength / np.maximum(defending_strength, 0.1)
+        
+        outcome_bands = [strength_ratio >= 2.0, strength_ratio >= 1.5, strength_ratio >= 0.8]
+        outcome = np.select(outcome_bands, ['Success', 'Partial', 'Partial'], default='Failure')
+        casualties_ratio = np.select(outcome_bands, [0.1, 0.2, 0.3], default=0.4)
+        
+        if self.logger.isEnabledFor(logging.DEBUG):
+            self.logger.debug("Batch resolved %d attacks: %d successful",
+                              n_attacks, int((outcome == 'Success').sum()))
+        
+        return self._table({
+            'Origin_Hex': np.asarray(attacks['Origin_Hex'], dtype=object),
+            'Target_Hex': target_hexes,
+            'Attack_Strength': total_attack_strength,
+            'Defending_Strength': defending_strength,
+            'Strength_Ratio': strength_ratio,
+            'Outcome': outcome.astype(object),
+            'Casualties_Ratio': casualties_ratio,
+            'Terrain': object_column(terrain),
+            'Fire_Support_Used': fire_support_used
+        })
         
     def _process_blue_movements(self,
                               movements: List[Dict],
-                              green_units: pd.DataFrame) -> pd.DataFrame:
-        """Process Blue maneuver unit movements (BBOOTT2)"""
+                              green_units: Table,
+                              unit_index: Optional[HexUnitIndex] = None,
+                              hex_terrain: Optional[HexTerrain] = None) -> ResultTable:
+        """
+        Process Blue maneuver unit movements (BBOOTT2)
         
-        movement_data = []
+        Movements that give a destination 'to_hex' are routed over the hex map
+        (origin from 'from_hex' or the unit's indexed position) and fail when
+        no route exists. Successful hex moves also move the unit in
+        unit_index, so later stages see the new position.
+        """
         
-        for movement in movements:
-            unit_id = movement.get('unit_id')
-            from_to = movement.get('from_to')
-            to_to = movement.get('to_to')
-            unit_type = movement.get('unit_type')
-            unit_count = movement.get('unit_count', 0)
-            
+        operations = self._compiled({}, {'maneuver_movements': movements}, hex_terrain)
+        return self._resolve_blue_movements(operations.movements, green_units, unit_index, hex_terrain)
+        
+    def _resolve_blue_movements(self,
+                                movements: ResultTable,
+                                green_units: Table,
+                                unit_index: Optional[HexUnitIndex] = None,
+                                hex_terrain: Optional[HexTerrain] = None) -> ResultTable:
+        """Resolve compiled maneuver movements (see _process_blue_movements)"""
+        
+        unit_ids = movements['Unit_ID']
+        unit_types = movements['Unit_Type']
+        from_tos = movements['From_TO'].tolist()
+        to_tos = movements['To_TO'].tolist()
+        
+        # Route every hex-level movement in one batch
+        from_hexes = movements['From_Hex'].tolist()
+        to_hexes = movements['To_Hex'].tolist()
+        if unit_index is not None:
+            for i, from_hex in enumerate(from_hexes):
+                if from_hex is None:
+                    from_hexes[i] = unit_index.hex_of(unit_ids[i])
+        
+        routed = np.array([f is not None and t is not None for f, t in zip(from_hexes, to_hexes)], dtype=bool)
+        path_length = np.full(len(movements), np.nan)
+        arrival_time = np.full(len(movements), np.nan)
+        if hex_terrain is not None and routed.any():
+            planner = self._get_route_planner(hex_terrain)
+            rows = np.nonzero(routed)[0]
+            _, hops, turns = planner.route_batch([from_hexes[i] for i in rows], [to_hexes[i] for i in rows])
+            path_length[rows] = np.where(hops >= 0, hops, np.nan)
+            arrival_time[rows] = np.where(hops >= 0, turns, np.nan)
+        
+        successes = np.zeros(len(movements), dtype=bool)
+        reasons = []
+        
+        debug = self.logger.isEnabledFor(logging.DEBUG)
+        for i, (from_to, to_to) in enumerate(zip(from_tos, to_tos)):
             # Check movement restrictions
             can_move = self._check_movement_restrictions(from_to, to_to)
-            
-            if can_move:
+            has_route = not routed[i] or hex_terrain is None or not np.isnan(path_length[i])
+        
+            if can_move and has_route:
+                if unit_index is not None and to_hexes[i] is not None:
+                    unit_index.move_unit(unit_ids[i], to_hexes[i])
+        
                 # Successful movement
-                movement_data.append({
-                    'Unit_ID': unit_id,
-                    'Unit_Type': unit_type,
-                    'Unit_Count': unit_count,
-                    'From_TO': from_to,
-                    'To_TO': to_to,
-                    'Success': True,
-                    'Reason': 'Movement completed'
-                })
-                
-                self.logger.debug(f"Green {unit_type} moved from TO {from_to} to TO {to_to}")
+                successes[i] = True
+                reasons.append('Movement completed')
+        
+                if debug:
+                    self.logger.debug("Green %s moved from TO %s to TO %s", unit_types[i], from_to, to_to)
             else:
                 # Failed movement
-                movement_data.append({
-                    'Unit_ID': unit_id,
-                    'Unit_Type': unit_type,
-                    'Unit_Count': unit_count,
-                    'From_TO': from_to,
-                    'To_TO': to_to,
-                    'Success': False,
-                    'Reason': 'Movement restricted'
-                })
-                
-                self.logger.warning(f"Movement TO {from_to}→{to_to} restricted")
-        
-        return pd.DataFrame(movement_data)
+                reasons.append('Movement restricted' if not can_move else 'No route')
+        
+                if not can_move:
+                    self.logger.warning("Movement TO %s→%s restricted", from_to, to_to)
+                else:
+                    self.logger.warning("No route %s→%s for %s", from_hexes[i], to_hexes[i], unit_ids[i])
+        
+        return ResultTable({
+            'Unit_ID': unit_ids,
+            'Unit_Type': unit_types,
+            'Unit_Count': movements['Unit_Count'],
+            'From_TO': _to_column(movements['From_TO']),
+            'To_TO': _to_column(movements['To_TO']),
+            'Success': successes,
+            'Reason': object_column(reasons),
+            'Path_Length': path_length,
+            'Arrival_Time': arrival_time
+        })
+        
+    def _get_route_planner(self, hex_terrain: HexTerrain) -> RoutePlanner:
+        """
+        Route planner for this map, rebuilt when the map or movement settings change
+        
+        Map changes are noticed through terrain_stamp(), without rereading
+        the map each turn: edit grids with set_terrain(), and call
+        clear_route_cache() after changing a dict map hex's terrain in place.
+        """
+        
+        # The planner holds the map, so the stamp's id stays valid while cached
+        settings = (terrain_stamp(hex_terrain), dict(self.terrain_modifiers), dict(self.hex_to or {}),
+                    self.movement_points_per_turn)
+        planner, built_with = self._route_planner or (None, None)
+        if planner is None or built_with != settings:
+            planner = RoutePlanner(
+                hex_terrain, self.terrain_modifiers,
+                hex_to=self.hex_to,
+                is_restricted=lambda a, b: not self._check_movement_restrictions(a, b),
+                movement_points_per_turn=self.movement_points_per_turn
+            )
+            self._route_planner = (planner, settings)
+        
+        return planner
+        
+    def clear_route_cache(self):
+        """Drop the cached route planner so the next movements rebuild it from the map"""
+        self._route_planner = None
         
     def _check_movement_restrictions(self, from_to: int, to_to: int) -> bool:
         """Check movement restrictions (TO 3 and TO 4 cannot move to each other)"""
@@ -335,135 +700,246 @@ class BOOTSCalculator:
         
     def _process_blue_fire_support(self,
                                  fire_support_plans: List[Dict],
-                                 red_units: pd.DataFrame,
-                                 green_units: pd.DataFrame,
-                                 hex_terrain: Dict[str, str]) -> Dict[str, float]:
+                                 red_units: Table,
+                                 green_units: Table,
+                                 hex_terrain: HexTerrain,
+                                 unit_index: Optional[HexUnitIndex] = None) -> Dict[str, float]:
         """Process Blue fire support plans (BBOOTT3)"""
         
-        effectiveness = {}
-        
-        for plan in fire_support_plans:
-            plan_id = plan.get('plan_id', 'unknown')
-            supporting_units = plan.get('supporting_units', [])
-            target_hex = plan.get('target_hex')
-            target_type = plan.get('target_type')  # Maneuver, Chokepoints, Artillery, Infrastructure
-            
-            # Calculate fire support strength
-            fs_strength = 0
-            for unit_info in supporting_units:
-                unit_type = unit_info.get('type')
-                unit_count = unit_info.get('count', 0)
-                unit_strength = self.unit_combat_strength.get(unit_type, 1.0)
-                
-                # Artillery units are more effective in fire support
-                if 'Arty' in unit_type:
-                    fs_strength += unit_count * unit_strength * 1.5
-                else:
-                    fs_strength += unit_count * unit_strength
-            
-            # Calculate effectiveness based on target type
-            base_effectiveness = min(fs_strength * 10, 90)  # Cap at 90%
-            
-            # Modify by target type
-            if target_type == 'Maneuver':
-                target_effectiveness = base_effectiveness * 1.0
-            elif target_type == 'Artillery':
-                target_effectiveness = base_effectiveness * 1.2  # Better against artillery
-            elif target_type == 'Chokepoints':
-                target_effectiveness = base_effectiveness * 0.8  # Harder to hit infrastructure
-            elif target_type == 'Infrastructure':
-                target_effectiveness = base_effectiveness * 0.6
-            else:
-                target_effectiveness = base_effectiveness * 0.8
-            
-            effectiveness[plan_id] = min(target_effectiveness, 95)  # Cap at 95%
-            
-            self.logger.debug(f"Fire support plan {plan_id}: {effectiveness[plan_id]:.1f}% effective "
-                            f"against {target_type} at {target_hex}")
-        
+        operations = self._compiled({}, {'fire_support_plans': fire_support_plans}, hex_terrain)
+        effectiveness, _ = self._resolve_blue_fire_support(
+            operations.fire_support_plans, operations.fire_support_units, red_units, green_units, hex_terrain,
+            unit_index
+        )
         return effectiveness
         
-    def _calculate_unit_casualties(self,
-                                 red_units: pd.DataFrame,
-                                 green_units: pd.DataFrame,
-                                 attack_results: pd.DataFrame,
-                                 fire_support_effectiveness: Dict[str, float]) -> pd.DataFrame:
-        """Calculate unit casualties from combat operations"""
+    def _resolve_blue_fire_support(self,
+                                 plans: ResultTable,
+                                 plan_units: ResultTable,
+                                 red_units: Table,
+                                 green_units: Table,
+                                 hex_terrain: HexTerrain,
+                                 unit_index: Optional[HexUnitIndex] = None) -> Tuple[Dict[str, float], ResultTable]:
+        """
+        Score Blue fire support plans in one batch and resolve them as area effects
         
-        casualty_data = []
+        Red units within fire_support_radius hexes of each target are found
+        through the hex bucket index. When Red positions are known, plans
+        against unit targets (Maneuver, Artillery) with no Red units in the
+        area have no effect.
         
-        # Calculate Red casualties from ground attacks
-        for _, attack in attack_results.iterrows():
-            casualties_ratio = attack['Casualties_Ratio']
-            
-            # Apply casualties to attacking units (simplified)
-            casualty_data.append({
-                'Team': 'Red',
-                'Operation': 'Ground_Attack',
-                'Hex': attack['Target_Hex'],
-                'Casualties': int(10 * casualties_ratio),  # Placeholder calculation
-                'Reason': f"Attack {attack['Outcome']}"
-            })
+        Returns:
+            effectiveness: Effectiveness (%) by plan_id
+            area_effects: One row per plan and Red-held hex inside its radius
+        """
         
-        # Calculate casualties from Blue fire support
-        for plan_id, effectiveness in fire_support_effectiveness.items():
-            casualties = int(effectiveness / 10)  # Simplified calculation
-            
-            casualty_data.append({
-                'Team': 'Red',
-                'Operation': 'Fire_Support',
-                'Hex': 'Various',
-                'Casualties': casualties,
-                'Reason': f"Fire support plan {plan_id}"
+        plan_ids = plans['Plan_ID']
+        target_hexes = plans['Target_Hex']
+        target_types = plans['Target_Type']  # Maneuver, Chokepoints, Artillery, Infrastructure
+        
+        n_plans = len(plans)
+        _, strength_table, fire_support_table = self._unit_type_tables()
+        codes = plan_units['Type_Code']
+        
+        # Calculate fire support strength (artillery units are more effective in fire support)
+        line_strength = plan_units['Count'] * strength_table[codes] * fire_support_table[codes]
+        fs_strength = np.bincount(plan_units['Plan'], weights=line_strength, minlength=n_plans)
+        
+        # Calculate effectiveness based on target type, capped at 90% base and 95% final
+        base_effectiveness = np.minimum(fs_strength * 10, 90)
+        target_mod = np.array([FIRE_SUPPORT_TARGET_MODIFIERS.get(t, 0.8) for t in target_types], dtype=np.float64)
+        plan_effectiveness = np.minimum(base_effectiveness * target_mod, 95)
+        
+        # Resolve area effects against Red units around each target
+        if unit_index is None:
+            unit_index = HexUnitIndex.build(green_units, red_units, self.unit_combat_strength)
+        
+        if unit_index.has_positions('Red') and n_plans > 0:
+            area = unit_index.strength_within('Red', target_hexes, self.fire_support_radius,
+                                              keys=plans['Target_Key'])
+            query = area['Query']
+        
+            unit_target = np.isin(target_types, ['Maneuver', 'Artillery'])
+            no_targets = unit_target & (np.bincount(query, minlength=n_plans) == 0)
+            plan_effectiveness[no_targets] = 0.0
+        
+            falloff = 1.0 - area['Distance'] / (self.fire_support_radius + 1)
+            area_effects = ResultTable({
+                'Plan_ID': plan_ids[query],
+                'Target_Hex': target_hexes[query],
+                'Hex': area['Hex'],
+                'Distance': area['Distance'],
+                'Red_Strength': area['Strength'],
+                'Effect': plan_effectiveness[query] * falloff
+            })
+        else:
+            area_effects = ResultTable({
+                'Plan_ID': object_column([]),
+                'Target_Hex': object_column([]),
+                'Hex': object_column([]),
+                'Distance': np.zeros(0, dtype=np.int64),
+                'Red_Strength': np.zeros(0),
+                'Effect': np.zeros(0)
             })
         
-        return pd.DataFrame(casualty_data)
+        effectiveness = dict(zip(plan_ids, plan_effectiveness.tolist()))
+        
+        if self.logger.isEnabledFor(logging.DEBUG):
+            self.logger.debug("Fire support: %d plans scored, %d Red hexes under fire",
+                              n_plans, len(set(area_effects['Hex'])))
+        
+        return effectiveness, area_effects
+        
+    def _unit_type_tables(self) -> Tuple[Dict[str, int], np.ndarray, np.ndarray]:
+        """
+        Integer-coded unit type tables for batch strength lookups
+        
+        Returns type -> code, combat strength by code and fire support multiplier
+        by code. The last code is for unknown types (strength 1.0, no bonus).
+        """
+        
+        cached = self._unit_tables
+        if cached is not None and cached[0] == self.unit_combat_strength:
+            return cached[1]
+        
+        unit_types = list(self.unit_combat_strength)
+        type_codes = {unit_type: code for code, unit_type in enumerate(unit_types)}
+        strength_table = np.array([self.unit_combat_strength[t] for t in unit_types] + [1.0])
+        fire_support_table = np.array([1.5 if 'Arty' in t else 1.0 for t in unit_types] + [1.0])
+        
+        tables = (type_codes, strength_table, fire_support_table)
+        self._unit_tables = (dict(self.unit_combat_strength), tables)
+        
+        return tables
+        
+    def _calculate_unit_casualties(self,
+                                 red_units: Table,
+                                 green_units: Table,
+                                 attack_results: Table,
+                                 fire_support_effectiveness: Dict[str, float],
+                                 fire_support_area_effects: Optional[Table] = None) -> ResultTable:
+        """
+        Calculate unit casualties from combat operations
+        
+        Fire support losses land in each Red-held hex of a plan's area effects;
+        plans without area effects (no Red positions known, or no Red units
+        near a non-unit target) keep one plan-level row in hex 'Various'.
+        """
+        
+        # Calculate Red casualties from ground attacks
+        # Apply casualties to attacking units (simplified)
+        n_attacks = len(attack_results)
+        attack_casualties = self._table({
+            'Team': np.full(n_attacks, 'Red', dtype=object),
+            'Operation': np.full(n_attacks, 'Ground_Attack', dtype=object),
+            'Hex': column(attack_results, 'Target_Hex', object),
+            'Casualties': (10 * column(attack_results, 'Casualties_Ratio', np.float64)).astype(np.int64),  # Placeholder calculation
+            'Reason': object_column(['Attack ' + str(o) for o in column(attack_results, 'Outcome', object)])
+        })
+        
+        # Calculate casualties from Blue fire support, per hex where the plan hit Red units
+        plan_ids = list(fire_support_effectiveness)
+        n_plans = len(plan_ids)
+        effectiveness = np.fromiter(fire_support_effectiveness.values(), dtype=np.float64, count=n_plans)
+        
+        if fire_support_area_effects is None or len(fire_support_area_effects) == 0:
+            area_plan = np.zeros(0, dtype=np.int64)
+            area_hexes = object_column([])
+            area_effect = np.zeros(0)
+        else:
+            position = {plan_id: i for i, plan_id in enumerate(plan_ids)}
+            area_ids = column(fire_support_area_effects, 'Plan_ID', object)
+            area_plan = np.fromiter((position[p] for p in area_ids), dtype=np.int64, count=len(area_ids))
+            area_hexes = column(fire_support_area_effects, 'Hex', object)
+            area_effect = column(fire_support_area_effects, 'Effect', np.float64)
+        
+        plan_level = np.ones(n_plans, dtype=bool)
+        plan_level[area_plan] = False
+        plan_rows = np.nonzero(plan_level)[0]
+        
+        # Rows in plan order: area rows of a plan, or its plan-level row
+        row_plan = np.concatenate([plan_rows, area_plan])
+        order = np.argsort(row_plan, kind='stable')
+        row_plan = row_plan[order]
+        hexes = np.concatenate([np.full(len(plan_rows), 'Various', dtype=object), area_hexes])[order]
+        effect = np.concatenate([effectiveness[plan_rows], area_effect])[order]
+        
+        fire_support_casualties = self._table({
+            'Team': np.full(len(row_plan), 'Red', dtype=object),
+            'Operation': np.full(len(row_plan), 'Fire_Support', dtype=object),
+            'Hex': hexes,
+            'Casualties': (effect / 10).astype(np.int64),  # Simplified calculation
+            'Reason': object_column(['Fire support plan ' + str(plan_ids[i]) for i in row_plan])
+        })
+        
+        return concat_tables([attack_casualties, fire_support_casualties], CASUALTY_COLUMNS)
         
     def _update_territory_control(self,
-                                landing_results: pd.DataFrame,
-                                attack_results: pd.DataFrame,
-                                movement_results: pd.DataFrame) -> pd.DataFrame:
+                                landing_results: Table,
+                                attack_results: Table,
+                                movement_results: Table) -> ResultTable:
         """Update territory control based on operations"""
         
-        control_data = []
+        outcome = column(attack_results, 'Outcome', object)
+        attack_hexes = column(attack_results, 'Target_Hex', object)
+        attack_strength = column(attack_results, 'Attack_Strength', np.float64)
         
         # Process successful landings
-        successful_landings = landing_results[landing_results['Success'] == True]
-        for _, landing in successful_landings.iterrows():
-            control_data.append({
-                'Hex': landing['Hex'],
-                'Control': 'Red',
-                'Strength': landing['BNs_Landed'],
-                'Source': f"{landing['Operation_Type']} Landing"
-            })
+        landed = column(landing_results, 'Success') == True
+        n_landed = int(np.count_nonzero(landed))
+        landing_control = self._table({
+            'Hex': column(landing_results, 'Hex', object)[landed],
+            'Control': np.full(n_landed, 'Red', dtype=object),
+            'Strength': column(landing_results, 'BNs_Landed')[landed],
+            'Source': object_column([str(t) + ' Landing' for t in column(landing_results, 'Operation_Type', object)[landed]])
+        })
         
         # Process successful attacks
-        successful_attacks = attack_results[attack_results['Outcome'] == 'Success']
-        for _, attack in successful_attacks.iterrows():
-            control_data.append({
-                'Hex': attack['Target_Hex'],
-                'Control': 'Red',
-                'Strength': attack['Attack_Strength'],
-                'Source': 'Ground Attack'
-            })
+        successful = outcome == 'Success'
+        n_successful = int(np.count_nonzero(successful))
+        attack_control = self._table({
+            'Hex': attack_hexes[successful],
+            'Control': np.full(n_successful, 'Red', dtype=object),
+            'Strength': attack_strength[successful],
+            'Source': np.full(n_successful, 'Ground Attack', dtype=object)
+        })
         
         # Process contested areas (partial attacks)
-        partial_attacks = attack_results[attack_results['Outcome'] == 'Partial']
-        for _, attack in partial_attacks.iterrows():
-            control_data.append({
-                'Hex': attack['Target_Hex'],
-                'Control': 'Contested',
-                'Strength': attack['Attack_Strength'] / 2,
-                'Source': 'Partial Attack'
-            })
+        partial = outcome == 'Partial'
+        n_partial = int(np.count_nonzero(partial))
+        contested_control = self._table({
+            'Hex': attack_hexes[partial],
+            'Control': np.full(n_partial, 'Contested', dtype=object),
+            'Strength': attack_strength[partial] / 2,
+            'Source': np.full(n_partial, 'Partial Attack', dtype=object)
+        })
         
-        return pd.DataFrame(control_data)
+        return concat_tables([landing_control, attack_control, contested_control], TERRITORY_COLUMNS)
+        
+    def _table(self, columns: Dict[str, np.ndarray]) -> ResultTable:
+        """Result table with the low-cardinality columns marked as categoricals"""
+        
+        categories = {name: values for name, values in RESULT_CATEGORIES.items() if name in columns}
+        
+        if 'Terrain' in columns:
+            terrain = list(self.terrain_modifiers)
+            terrain += sorted({t for t in columns['Terrain'] if not is_missing(t)} - set(terrain))
+            categories['Terrain'] = terrain
+        
+        return ResultTable(columns, categories)
         
     def export_boots_data_for_external_program(self, 
                                              red_operations: Dict,
                                              blue_operations: Dict,
                                              current_positions: pd.DataFrame) -> Dict:
-        """Export data for Matt's external BOOTS program"""
+        """
+        Export data for Matt's external BOOTS program
+        
+        For large scenarios use boots_exchange.export_operations_columnar,
+        which writes the same data as memory-mappable column files.
+        """
+        
+        import pandas as pd
         
         export_data = {
             'red_operations': {
@@ -0,0 +1,154 @@
+"""
+Multi-turn BOOTS campaign driver
+Carries hex control from turn to turn and applies each turn's results as deltas
+"""
+
+import logging
+from typing import Dict, List, Optional, Tuple
+
+import pandas as pd
+
+from boots_calculator import BOOTSCalculator, BOOTSResults
+from hex_grid import HexTerrain
+
+# Columns of the per-turn control diffs and of snapshots
+DIFF_COLUMNS = ['Turn', 'Hex', 'Previous_Control', 'Control', 'Strength', 'Source']
+SNAPSHOT_COLUMNS = ['Hex', 'Control', 'Strength', 'Source', 'Since_Turn']
+
+
+class BOOTSCampaign:
+    """
+    Campaign driver around BOOTSCalculator with a persistent hex-control store
+
+    Control is held in a dict keyed by hex, so applying a turn costs time
+    proportional to the hexes that turn touched, not to the map size. Every
+    turn's changes are kept as a small diff frame; snapshots of any past turn
+    are rebuilt by replaying those diffs.
+    """
+
+    def __init__(self,
+                 calculator: Optional[BOOTSCalculator] = None,
+                 initial_control: Optional[pd.DataFrame] = None):
+        self.logger = logging.getLogger(__name__)
+        self.calculator = calculator if calculator is not None else BOOTSCalculator()
+
+        # Hex -> (Control, Strength, Source, Since_Turn)
+        self._initial: Dict[str, Tuple[str, float, str, int]] = {}
+        if initial_control is not None and len(initial_control) > 0:
+            for hex_coord, control, strength, source in zip(initial_control['Hex'],
+                                                            initial_control['Control'],
+                                                            initial_control['Strength'],
+                                                            initial_control['Source']):
+                self._initial[hex_coord] = (control, float(strength), source, 0)
+
+        self._control = dict(self._initial)
+        self._diffs: List[pd.DataFrame] = []
+
+    @property
+    def turn(self) -> int:
+        """Number of turns applied so far"""
+        return len(self._diffs)
+
+    def run_turn(self,
+                 landed_bns: pd.DataFrame,
+                 green_maneuver: pd.DataFrame,
+                 red_operations: Dict,
+                 blue_operations: Dict,
+                 hex_terrain: HexTerrain) -> BOOTSResults:
+        """Run one BOOTS turn and apply its territory changes to the campaign"""
+
+        results = self.calculator.calculate_boots_operations(
+            landed_bns, green_maneuver, red_operations, blue_operations, hex_terrain
+        )
+        self.apply_turn_results(results)
+
+        return results
+
+    def apply_turn_results(self, results: BOOTSResults) -> pd.DataFrame:
+        """
+        Apply one turn's territory_control to the store as a delta
+
+        A turn's result for a hex replaces whatever was held there before. When
+        a turn has several rows for one hex, Red control beats Contested and
+        the strengths of the winning rows are summed.
+
+        Returns:
+            The diff for this turn (only hexes whose control or strength changed)
+        """
+
+        turn = self.turn + 1
+        territory = results.frame('territory_control')
+        changes = []
+
+        if len(territory) > 0:
+            red_rows = territory['Control'] == 'Red'
+            winning = territory[red_rows | ~territory['Hex'].isin(territory.loc[red_rows, 'Hex'])]
+            turn_control = winning.groupby('Hex', sort=False, observed=True).agg(
+                Control=('Control', 'first'),
+                Strength=('Strength', 'sum'),
+                Source=('Source', 'first')
+            )
+
+            for hex_coord, control, strength, source in zip(turn_control.index,
+                                                            turn_control['Control'],
+                                                            turn_control['Strength'],
+                                                            turn_control['Source']):
+                strength = float(strength)
+                previous = self._control.get(hex_coord)
+                if previous is not None and previous[0] == control and previous[1] == strength:
+                    continue
+
+                self._control[hex_coord] = (control, strength, source, turn)
+                changes.append((turn, hex_coord, previous[0] if previous else None,
+                                control, strength, source))
+
+        diff = pd.DataFrame(changes, columns=DIFF_COLUMNS)
+        self._diffs.append(diff)
+
+        self.logger.info("Campaign turn %d: %d hexes changed, %d hexes held",
+                         turn, len(diff), len(self._control))
+
+        return diff
+
+    def diff(self, turn: int) -> pd.DataFrame:
+        """Control changes made by a single turn (turns are numbered from 1)"""
+        if turn < 1 or turn > self.turn:
+            raise ValueError(f"Turn {turn} out of range 1-{self.turn}")
+        return self._diffs[turn - 1]
+
+    def diffs(self, from_turn: int = 1, to_turn: Optional[int] = None) -> pd.DataFrame:
+        """All control changes made in turns from_turn..to_turn inclusive"""
+        to_turn = self.turn if to_turn is None else to_turn
+        frames = [d for d in self._diffs[from_turn - 1:to_turn] if len(d) > 0]
+        if not frames:
+            return pd.DataFrame(columns=DIFF_COLUMNS)
+        return pd.concat(frames, ignore_index=True)
+
+    def control_of(self, hex_coord: str) -> Optional[str]:
+        """Current controller of a hex, or None if nobody has taken it"""
+        entry = self._control.get(hex_coord)
+        return entry[0] if entry else None
+
+    def snapshot(self, turn: Optional[int] = None) -> pd.DataFrame:
+        """
+        Hex control after the given turn (default: the latest turn)
+
+        Past turns are rebuilt from the initial state by replaying diffs, so
+        the cost grows with the number of changes rather than turns x hexes.
+        """
+
+        if turn is None or turn == self.turn:
+            control = self._control
+        else:
+            if turn < 0 or turn > self.turn:
+                raise ValueError(f"Turn {turn} out of range 0-{self.turn}")
+            control = dict(self._initial)
+            for diff in self._diffs[:turn]:
+                for diff_turn, hex_coord, control_state, strength, source in zip(diff['Turn'], diff['Hex'],
+                                                                               diff['Control'],
+                                                                               diff['Strength'],
+                                                                               diff['Source']):
+                    control[hex_coord] = (control_state, strength, source, diff_turn)
+
+        return pd.DataFrame([(hex_coord,) + entry for hex_coord, entry in control.items()],
+                            columns=SNAPSHOT_COLUMNS)
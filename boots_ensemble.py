@@ -0,0 +1,231 @@
+"""
+Monte Carlo ensemble runner for BOOTS calculations
+Runs independent replications of calculate_boots_operations on a process pool
+and aggregates them into outcome distributions
+"""
+
+import copy
+import logging
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from boots_calculator import BOOTSCalculator
+from hex_grid import HexTerrain
+
+
+@dataclass
+class BOOTSEnsembleResults:
+    """Aggregated results from an ensemble of BOOTS replications"""
+    n_replications: int
+    root_seed: int
+    landing_success_probability: pd.DataFrame    # Per-hex landing success rate
+    attack_outcome_frequencies: pd.DataFrame     # Per-target-hex outcome frequencies
+    casualty_quantiles: pd.DataFrame             # Quantiles of casualties per replication
+    territory_control_probability: pd.DataFrame  # Per-hex probability of each control state
+    replication_summary: pd.DataFrame            # Summary counts for every replication
+
+
+# Calculator template and scenario inputs of a pool worker, set once per
+# worker by _init_worker so blocks only carry their replications
+_worker_state: Optional[Tuple[BOOTSCalculator, Tuple]] = None
+
+
+def _init_worker(template: BOOTSCalculator, inputs: Tuple):
+    global _worker_state
+    _worker_state = (template, inputs)
+
+
+def _run_worker_block(block: List[Tuple[int, np.random.SeedSequence]]) -> List[Dict]:
+    """Run a block of replications against the inputs _init_worker gave this worker"""
+    template, inputs = _worker_state
+    return _run_replication_block(template, inputs, block)
+
+
+def _run_replication_block(template: BOOTSCalculator,
+                           inputs: Tuple,
+                           block: List[Tuple[int, np.random.SeedSequence]]) -> List[Dict]:
+    """Run a block of replications in a worker process (module level so it pickles)"""
+
+    landed_bns, green_maneuver, red_operations, blue_operations, hex_terrain = inputs
+    reduced = []
+
+    for replication, seed_seq in block:
+        calculator = copy.copy(template)
+        calculator.rng = np.random.default_rng(seed_seq)
+
+        results = calculator.calculate_boots_operations(
+            landed_bns, green_maneuver, red_operations, blue_operations, hex_terrain
+        )
+        reduced.append(_reduce_replication(replication, results))
+
+    return reduced
+
+
+def _reduce_replication(replication: int, results) -> Dict:
+    """Keep only the columns the ensemble aggregates, tagged with the replication"""
+
+    results = results.frames()
+    landings = results.landing_results.reindex(columns=['Hex', 'Success', 'BNs_Landed'])
+    attacks = results.attack_results.reindex(columns=['Target_Hex', 'Outcome'])
+
+    casualties = (results.unit_casualties.reindex(columns=['Team', 'Operation', 'Casualties'])
+                  .groupby(['Team', 'Operation'], observed=True, as_index=False)['Casualties'].sum())
+
+    # A hex taken outright this turn counts as Red even if also contested
+    control = results.territory_control.reindex(columns=['Hex', 'Control'])
+    control = (control.assign(Red=control['Control'] == 'Red')
+               .groupby('Hex', observed=True, as_index=False)['Red'].any())
+    control['Control'] = np.where(control['Red'], 'Red', 'Contested')
+
+    for frame in (landings, attacks, casualties, control):
+        frame.insert(0, 'Replication', replication)
+
+    return {
+        'landings': landings,
+        'attacks': attacks,
+        'casualties': casualties,
+        'control': control[['Replication', 'Hex', 'Control']],
+        'summary': {
+            'Replication': replication,
+            'Landings_Successful': results.total_landings_successful,
+            'Attacks_Successful': results.total_attacks_successful,
+            'Total_Casualties': int(results.unit_casualties.reindex(columns=['Casualties'])['Casualties'].sum())
+        }
+    }
+
+
+class BOOTSEnsembleRunner:
+    """Run N replications of a BOOTS turn across all cores"""
+
+    def __init__(self,
+                 calculator: Optional[BOOTSCalculator] = None,
+                 max_workers: Optional[int] = None,
+                 quantiles: Sequence[float] = (0.05, 0.25, 0.5, 0.75, 0.95)):
+        self.logger = logging.getLogger(__name__)
+        self.calculator = calculator if calculator is not None else BOOTSCalculator()
+        self.max_workers = max_workers
+        self.quantiles = list(quantiles)
+
+    def run(self,
+            landed_bns: pd.DataFrame,
+            green_maneuver: pd.DataFrame,
+            red_operations: Dict,
+            blue_operations: Dict,
+            hex_terrain: HexTerrain,
+            n_replications: int,
+            root_seed: int = 0) -> BOOTSEnsembleResults:
+        """
+        Run n_replications independent samples of calculate_boots_operations
+
+        Every replication draws from its own np.random.Generator spawned from
+        root_seed, and aggregation happens in replication order, so results
+        are bit-identical no matter how many workers are used.
+
+        Args:
+            landed_bns, green_maneuver, red_operations, blue_operations, hex_terrain:
+                Inputs passed unchanged to calculate_boots_operations
+            n_replications: Number of replications to run
+            root_seed: Seed all replication streams are spawned from
+
+        Returns:
+            BOOTSEnsembleResults with aggregated outcome distributions
+        """
+
+        if n_replications < 1:
+            raise ValueError(f"n_replications must be at least 1, got {n_replications}")
+
+        seed_seqs = np.random.SeedSequence(root_seed).spawn(n_replications)
+        replications = list(enumerate(seed_seqs))
+
+        # The calculator's own rng may be the np.random module, which does not pickle
+        template = copy.copy(self.calculator)
+        template.rng = None
+        inputs = (landed_bns, green_maneuver, red_operations, blue_operations, hex_terrain)
+
+        if self.max_workers == 1 or n_replications <= 1:
+            reduced = _run_replication_block(template, inputs, replications)
+        else:
+            max_workers = self.max_workers or os.cpu_count() or 1
+            # Inputs are pickled once per worker, not once per block
+            with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_worker,
+                                     initargs=(template, inputs)) as executor:
+                n_blocks = min(n_replications, max_workers * 4)
+                blocks = [replications[i::n_blocks] for i in range(n_blocks)]
+                reduced = [item
+                           for block_result in executor.map(_run_worker_block, blocks)
+                           for item in block_result]
+
+        reduced.sort(key=lambda item: item['summary']['Replication'])
+
+        self.logger.info("BOOTS ensemble complete: %d replications (root seed %s)", n_replications, root_seed)
+
+        return self._aggregate(reduced, n_replications, root_seed)
+
+    def _aggregate(self, reduced: List[Dict], n_replications: int, root_seed: int) -> BOOTSEnsembleResults:
+        """Aggregate per-replication frames into ensemble statistics"""
+
+        def stack(key: str, columns: List[str]) -> pd.DataFrame:
+            frames = [item[key] for item in reduced if len(item[key]) > 0]
+            if not frames:
+                return pd.DataFrame(columns=['Replication'] + columns)
+            return pd.concat(frames, ignore_index=True)
+
+        landings = stack('landings', ['Hex', 'Success', 'BNs_Landed'])
+        attacks = stack('attacks', ['Target_Hex', 'Outcome'])
+        casualties = stack('casualties', ['Team', 'Operation', 'Casualties'])
+        control = stack('control', ['Hex', 'Control'])
+
+        # Per-hex landing success probability
+        landing_success_probability = (
+            landings.assign(Success=landings['Success'].astype(float),
+                            BNs_Landed=landings['BNs_Landed'].astype(float))
+            .groupby('Hex', observed=True)
+            .agg(Landings=('Success', 'size'),
+                 Success_Probability=('Success', 'mean'),
+                 Mean_BNs_Landed=('BNs_Landed', 'mean'))
+            .reset_index()
+        )
+
+        # Attack outcome frequencies per target hex
+        outcome_counts = (attacks.groupby(['Target_Hex', 'Outcome'], observed=True).size()
+                          .unstack('Outcome', fill_value=0)
+                          .reindex(columns=['Success', 'Partial', 'Failure'], fill_value=0))
+        attack_outcome_frequencies = outcome_counts.div(outcome_counts.sum(axis=1), axis=0)
+        attack_outcome_frequencies.insert(0, 'Attacks', outcome_counts.sum(axis=1))
+        attack_outcome_frequencies = attack_outcome_frequencies.reset_index()
+        attack_outcome_frequencies.columns.name = None
+
+        # Casualty quantiles over replications (replications without casualties count as zero)
+        per_replication = (casualties.pivot_table(index='Replication', columns=['Team', 'Operation'],
+                                                  values='Casualties', aggfunc='sum', fill_value=0)
+                           .reindex(range(n_replications), fill_value=0))
+        casualty_quantiles = per_replication.quantile(self.quantiles).T
+        casualty_quantiles.columns = [f"Q{q:g}" for q in self.quantiles]
+        casualty_quantiles.insert(0, 'Mean', per_replication.mean())
+        casualty_quantiles = casualty_quantiles.reset_index()
+
+        # Territory control probabilities per hex
+        control_counts = (control.groupby(['Hex', 'Control'], observed=True).size()
+                          .unstack('Control', fill_value=0)
+                          .reindex(columns=['Red', 'Contested'], fill_value=0))
+        territory_control_probability = control_counts / n_replications
+        territory_control_probability['Uncontrolled'] = 1.0 - territory_control_probability.sum(axis=1)
+        territory_control_probability = territory_control_probability.reset_index()
+        territory_control_probability.columns.name = None
+
+        replication_summary = pd.DataFrame([item['summary'] for item in reduced])
+
+        return BOOTSEnsembleResults(
+            n_replications=n_replications,
+            root_seed=root_seed,
+            landing_success_probability=landing_success_probability,
+            attack_outcome_frequencies=attack_outcome_frequencies,
+            casualty_quantiles=casualty_quantiles,
+            territory_control_probability=territory_control_probability,
+            replication_summary=replication_summary
+        )
@@ -0,0 +1,231 @@
+"""
+Binary columnar exchange with the external BOOTS program
+Writes operations, unit positions and results as a directory bundle of
+memory-mappable .npy columns (or Parquet files when pyarrow is installed)
+and reads results back into BOOTSResults without row-by-row conversion
+"""
+
+import json
+import logging
+import os
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from boots_calculator import BOOTSResults
+from boots_ingest import compile_ground_attacks
+from result_table import is_missing, object_column
+
+try:
+    import pyarrow.parquet as pq
+    HAS_PYARROW = True
+except ImportError:
+    HAS_PYARROW = False
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_NAME = 'manifest.json'
+BUNDLE_FORMATS = ('npy', 'parquet')
+
+# Result frames stored in a results bundle
+RESULT_TABLES = ['landing_results', 'attack_results', 'movement_results', 'unit_casualties',
+                 'territory_control', 'fire_support_area_effects']
+
+
+def _json_value(value):
+    """Convert NumPy scalars in category lists to plain JSON values"""
+    return value.item() if isinstance(value, np.generic) else value
+
+
+def _is_nested(value) -> bool:
+    """Whether a cell holds a list or dict (e.g. unit lists in bn_allocations)"""
+    return isinstance(value, (list, tuple, dict))
+
+
+def write_table_bundle(tables: Dict[str, pd.DataFrame],
+                       path: str,
+                       file_format: str = 'npy',
+                       metadata: Optional[Dict] = None):
+    """
+    Write named frames to a bundle directory
+
+    npy: one .npy file per column. Numeric and bool columns are written as
+    is; string, object and categorical columns are written as int32 codes
+    with their categories in the manifest, so every column can be
+    memory-mapped on load. Object columns holding lists or dicts are coded
+    as JSON strings and decoded again on load.
+    parquet: one .parquet file per table (requires pyarrow).
+    """
+
+    if file_format not in BUNDLE_FORMATS:
+        raise ValueError(f"Unknown bundle format {file_format!r}, expected one of {BUNDLE_FORMATS}")
+    if file_format == 'parquet' and not HAS_PYARROW:
+        raise ImportError("Parquet bundles require pyarrow (pip install pyarrow)")
+
+    os.makedirs(path, exist_ok=True)
+    manifest = {'format': file_format, 'metadata': metadata or {}, 'tables': {}}
+
+    for name, frame in tables.items():
+        if file_format == 'parquet':
+            file_name = f"{name}.parquet"
+            frame.reset_index(drop=True).to_parquet(os.path.join(path, file_name), index=False)
+            manifest['tables'][name] = {'file': file_name, 'rows': len(frame)}
+            continue
+
+        columns = []
+        for i, column in enumerate(frame.columns):
+            series = frame[column]
+            file_name = f"{name}__{i}.npy"
+            entry = {'name': column, 'file': file_name}
+
+            if isinstance(series.dtype, pd.CategoricalDtype):
+                values = series.cat.codes.to_numpy(dtype=np.int32)
+                entry['kind'] = 'category'
+                entry['categories'] = [_json_value(c) for c in series.cat.categories]
+            elif pd.api.types.is_bool_dtype(series.dtype) or pd.api.types.is_numeric_dtype(series.dtype):
+                values = series.to_numpy()
+                entry['kind'] = 'numeric'
+            else:
+                nested = any(_is_nested(v) for v in series)
+                if nested:
+                    series = pd.Series([None if is_missing(v) else json.dumps(v) for v in series], dtype=object)
+                codes, categories = pd.factorize(series, use_na_sentinel=True)
+                values = codes.astype(np.int32)
+                entry['kind'] = 'json' if nested else 'string'
+                entry['categories'] = [_json_value(c) for c in categories]
+
+            np.save(os.path.join(path, file_name), values, allow_pickle=False)
+            columns.append(entry)
+
+        manifest['tables'][name] = {'columns': columns, 'rows': len(frame)}
+
+    with open(os.path.join(path, MANIFEST_NAME), 'w') as f:
+        json.dump(manifest, f)
+
+    logger.debug("Wrote %d tables to %s bundle %s", len(tables), file_format, path)
+
+
+def read_table_bundle(path: str, mmap: bool = True) -> Tuple[Dict[str, pd.DataFrame], Dict]:
+    """
+    Read a bundle written by write_table_bundle
+
+    Returns:
+        tables: frames by name (npy columns are memory-mapped when mmap=True)
+        metadata: the bundle's metadata dict
+    """
+
+    with open(os.path.join(path, MANIFEST_NAME)) as f:
+        manifest = json.load(f)
+
+    tables = {}
+    for name, table in manifest['tables'].items():
+        if manifest['format'] == 'parquet':
+            tables[name] = pq.read_table(os.path.join(path, table['file'])).to_pandas()
+            continue
+
+        data = {}
+        for entry in table['columns']:
+            values = np.load(os.path.join(path, entry['file']), mmap_mode='r' if mmap else None,
+                             allow_pickle=False)
+            if entry['kind'] == 'category':
+                data[entry['name']] = pd.Categorical.from_codes(np.asarray(values), categories=entry['categories'])
+            elif entry['kind'] in ('string', 'json'):
+                # Code -1 (missing) indexes the trailing None
+                categories = entry['categories']
+                if entry['kind'] == 'json':
+                    categories = [json.loads(c) for c in categories]
+                lookup = object_column(categories + [None])
+                data[entry['name']] = lookup[values]
+            else:
+                data[entry['name']] = values
+
+        columns = [entry['name'] for entry in table['columns']]
+        tables[name] = pd.DataFrame(data, columns=columns, index=pd.RangeIndex(table['rows']))
+
+    return tables, manifest['metadata']
+
+
+def _records_frame(records: List[Dict], nested_keys: List[str]) -> pd.DataFrame:
+    """Flat operation records as a frame, without their nested list fields"""
+    frame = pd.DataFrame(records)
+    return frame.drop(columns=[k for k in nested_keys if k in frame.columns])
+
+
+def export_operations_columnar(red_operations: Dict,
+                               blue_operations: Dict,
+                               current_positions: pd.DataFrame,
+                               path: str,
+                               file_format: str = 'npy'):
+    """
+    Columnar counterpart of BOOTSCalculator.export_boots_data_for_external_program
+
+    Nested unit lists are flattened into child tables that point back at
+    their parent row: ground_attack_bns.Attack and fire_support_units.Plan
+    hold the positional index of the attack or plan.
+    """
+
+    # Unit types are exported as given, so no type codes are needed
+    attacks, attack_bns = compile_ground_attacks(red_operations.get('ground_attacks', []), {})
+
+    fire_support_plans = blue_operations.get('fire_support_plans', [])
+    plan_units = [(i, unit.get('type'), unit.get('count', 0))
+                  for i, plan in enumerate(fire_support_plans)
+                  for unit in plan.get('supporting_units', [])]
+
+    tables = {
+        'airborne_landings': pd.DataFrame(red_operations.get('airborne_landings', [])),
+        'air_assault_landings': pd.DataFrame(red_operations.get('air_assault_landings', [])),
+        'ground_attacks': attacks.to_frame()[['Origin_Hex', 'Target_Hex']],
+        'ground_attack_bns': attack_bns.to_frame()[['Attack', 'Type', 'Count', 'Fire_Support']],
+        'maneuver_movements': pd.DataFrame(blue_operations.get('maneuver_movements', [])),
+        'fire_support_plans': _records_frame(fire_support_plans, ['supporting_units']),
+        'fire_support_units': pd.DataFrame(plan_units, columns=['Plan', 'Type', 'Count']),
+        'bn_allocations': pd.DataFrame(blue_operations.get('bn_allocations', [])),
+        'current_unit_positions': current_positions
+    }
+
+    write_table_bundle(tables, path, file_format, metadata={'timestamp': pd.Timestamp.now().isoformat()})
+
+
+def write_boots_results(results: BOOTSResults, path: str, file_format: str = 'npy'):
+    """Write BOOTSResults as a bundle (the layout read_boots_results expects)"""
+
+    tables = {name: results.frame(name) for name in RESULT_TABLES if getattr(results, name) is not None}
+    tables['fire_support_effectiveness'] = pd.DataFrame({
+        'Plan_ID': pd.Series(list(results.fire_support_effectiveness.keys()), dtype=object),
+        'Effectiveness': np.fromiter(results.fire_support_effectiveness.values(), dtype=np.float64,
+                                     count=len(results.fire_support_effectiveness))
+    })
+
+    metadata = {
+        'total_landings_attempted': int(results.total_landings_attempted),
+        'total_landings_successful': int(results.total_landings_successful),
+        'total_attacks_attempted': int(results.total_attacks_attempted),
+        'total_attacks_successful': int(results.total_attacks_successful),
+        'warnings': list(results.warnings)
+    }
+
+    write_table_bundle(tables, path, file_format, metadata)
+
+
+def read_boots_results(path: str, mmap: bool = True) -> BOOTSResults:
+    """Load a results bundle (from the external program or write_boots_results) into BOOTSResults"""
+
+    tables, metadata = read_table_bundle(path, mmap)
+    fire_support = tables.get('fire_support_effectiveness', pd.DataFrame(columns=['Plan_ID', 'Effectiveness']))
+
+    return BOOTSResults(
+        landing_results=tables.get('landing_results', pd.DataFrame()),
+        attack_results=tables.get('attack_results', pd.DataFrame()),
+        movement_results=tables.get('movement_results', pd.DataFrame()),
+        unit_casualties=tables.get('unit_casualties', pd.DataFrame()),
+        territory_control=tables.get('territory_control', pd.DataFrame()),
+        fire_support_effectiveness=dict(zip(fire_support['Plan_ID'], fire_support['Effectiveness'].tolist())),
+        total_landings_attempted=metadata.get('total_landings_attempted', 0),
+        total_landings_successful=metadata.get('total_landings_successful', 0),
+        total_attacks_attempted=metadata.get('total_attacks_attempted', 0),
+        total_attacks_successful=metadata.get('total_attacks_successful', 0),
+        warnings=metadata.get('warnings', []),
+        fire_support_area_effects=tables.get('fire_support_area_effects')
+    )
@@ -0,0 +1,334 @@
+"""
+Ingest stage for BOOTS operations
+Compiles the loosely typed red/blue operation dicts once into columnar
+records with integer-coded unit types and hexes, validating them on the way
+so malformed or unknown entries are reported instead of silently defaulted
+"""
+
+import math
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from hex_grid import NO_TERRAIN, HexTerrain, HexTerrainGrid, dict_terrain, hex_keys
+from result_table import ResultTable, object_column
+
+# Fire support target types with a known effectiveness modifier
+# (boots_calculator.FIRE_SUPPORT_TARGET_MODIFIERS)
+FIRE_SUPPORT_TARGET_TYPES = ('Maneuver', 'Artillery', 'Chokepoints', 'Infrastructure')
+
+# Movement TO for a missing or invalid from_to / to_to
+MISSING_TO = -1
+
+# Operation lists of the red / blue operations dicts
+RED_OPERATIONS = ('airborne_landings', 'air_assault_landings', 'ground_attacks')
+BLUE_OPERATIONS = ('maneuver_movements', 'fire_support_plans')
+
+
+class Issues:
+    """
+    Validation messages for BOOTSResults.warnings
+
+    Repeats of a message are counted rather than listed, so an order book
+    with one recurring problem gives one warning.
+    """
+
+    def __init__(self):
+        self._counts: Dict[str, int] = {}
+
+    def add(self, message: str):
+        self._counts[message] = self._counts.get(message, 0) + 1
+
+    def messages(self) -> List[str]:
+        return [message if n == 1 else f"{message} ({n} entries)" for message, n in self._counts.items()]
+
+
+@dataclass
+class CompiledOperations:
+    """
+    Red and Blue operations as columnar records
+
+    Type_Code columns index the calculator's unit type tables (the last code
+    is for unknown types); *_Key columns are packed axial hex keys
+    (hex_grid.NO_HEX_KEY where missing or unparsable), used for terrain grid
+    and fire support radius lookups. The original hex strings are kept for
+    dict terrain, per-hex unit index lookups and output.
+    """
+    landings: ResultTable            # Operation_Type, Hex, Hex_Key, BN_Type, Type_Code, BN_Count
+    attacks: ResultTable             # Origin_Hex, Target_Hex, Target_Key
+    attack_bns: ResultTable          # Attack, Type, Type_Code, Count, Fire_Support
+    movements: ResultTable           # Unit_ID, Unit_Type, Type_Code, Unit_Count, From_TO, To_TO, From_Hex, To_Hex
+    fire_support_plans: ResultTable  # Plan_ID, Target_Hex, Target_Key, Target_Type
+    fire_support_units: ResultTable  # Plan, Type, Type_Code, Count
+    warnings: List[str] = field(default_factory=list)
+
+    @property
+    def n_operations(self) -> int:
+        """Operations that passed validation"""
+        return len(self.landings) + len(self.attacks) + len(self.movements) + len(self.fire_support_plans)
+
+
+def _entries(operations: Sequence, kind: str, issues: Issues) -> List[Dict]:
+    """Operation dicts of one kind; other entries are reported and skipped"""
+    if not isinstance(operations, (list, tuple)):
+        issues.add(f"{kind}: not a list of operations (ignored)")
+        return []
+    entries = [entry for entry in operations if isinstance(entry, dict)]
+    for _ in range(len(operations) - len(entries)):
+        issues.add(f"{kind}: entry is not a dict (skipped)")
+    return entries
+
+
+def _count(value, kind: str, name: str, issues: Issues):
+    """A non-negative count; anything else is reported and read as 0"""
+    if isinstance(value, (int, float, np.integer, np.floating)) and not isinstance(value, (bool, np.bool_)):
+        if math.isfinite(value) and value >= 0:
+            return value
+    issues.add(f"{kind}: {'missing' if value is None else 'invalid'} {name} (0 assumed)")
+    return 0
+
+
+def _counts_array(values: List, dtype=None) -> np.ndarray:
+    """Counts as int64 when all are integers, else float64"""
+    if dtype is None:
+        dtype = np.int64 if all(isinstance(v, (int, np.integer)) for v in values) else np.float64
+    return np.asarray(values, dtype=dtype)
+
+
+def _type_codes(unit_types: List, kind: str, type_codes: Dict[str, int], issues: Issues) -> np.ndarray:
+    """Integer unit type codes; unknown types are reported (strength 1.0 assumed)"""
+    unknown = len(type_codes)
+    codes = np.fromiter((type_codes.get(t, unknown) for t in unit_types), dtype=np.int64, count=len(unit_types))
+    for i in np.nonzero(codes == unknown)[0]:
+        issues.add(f"{kind}: unknown unit type {unit_types[i]!r} (strength 1.0 assumed)")
+    return codes
+
+
+def _hex_keys(hexes: List, kind: str, name: str, issues: Issues,
+              hex_terrain: Optional[HexTerrain], required: bool = True) -> np.ndarray:
+    """Packed hex keys, reporting missing, unparsable and off-map hexes"""
+
+    keys = hex_keys(hexes)
+    present = np.fromiter((h is not None for h in hexes), dtype=bool, count=len(hexes))
+    parsed = keys >= 0
+
+    for _ in range(int(np.count_nonzero(~present)) if required else 0):
+        issues.add(f"{kind}: missing {name}")
+    for _ in range(int(np.count_nonzero(present & ~parsed))):
+        issues.add(f"{kind}: {name} is not an axial 'q,r' hex")
+
+    if hex_terrain is not None and parsed.any():
+        if isinstance(hex_terrain, HexTerrainGrid):
+            on_map = hex_terrain.codes_for_keys(keys) != NO_TERRAIN
+        else:
+            on_map = np.fromiter((t is not None for t in dict_terrain(hex_terrain, hexes, keys)),
+                                 dtype=bool, count=len(hexes))
+        for _ in range(int(np.count_nonzero(parsed & ~on_map))):
+            issues.add(f"{kind}: {name} not on the terrain map (open terrain assumed)")
+
+    return keys
+
+
+def _unit_lines(entries: List[Dict], list_name: str, kind: str, issues: Issues) -> List[Tuple[int, object, object]]:
+    """(entry index, type, count) for the unit lines listed under list_name of each entry"""
+
+    lines = []
+    for i, entry in enumerate(entries):
+        units = entry.get(list_name, [])
+        if not isinstance(units, (list, tuple)):
+            issues.add(f"{kind}: {list_name} is not a list (ignored)")
+            continue
+        for unit in units:
+            if not isinstance(unit, dict):
+                issues.add(f"{kind}: {list_name} entry is not a dict (skipped)")
+                continue
+            lines.append((i, unit.get('type'), _count(unit.get('count'), kind, f"{list_name} count", issues)))
+    return lines
+
+
+def compile_landings(airborne_landings: Sequence,
+                     air_assault_landings: Sequence,
+                     type_codes: Dict[str, int],
+                     hex_terrain: Optional[HexTerrain] = None,
+                     issues: Optional[Issues] = None) -> ResultTable:
+    """Airborne then air assault landings as one table"""
+
+    issues = issues if issues is not None else Issues()
+    parts = []
+    for kind, operation_type, operations in (('airborne_landings', 'Airborne', airborne_landings),
+                                             ('air_assault_landings', 'Air_Assault', air_assault_landings)):
+        landings = _entries(operations, kind, issues)
+        hexes = [landing.get('hex') for landing in landings]
+        bn_types = [landing.get('bn_type', operation_type) for landing in landings]
+        parts.append({
+            'Operation_Type': np.full(len(landings), operation_type, dtype=object),
+            'Hex': object_column(hexes),
+            'Hex_Key': _hex_keys(hexes, kind, 'hex', issues, hex_terrain),
+            'BN_Type': object_column(bn_types),
+            'Type_Code': _type_codes(bn_types, kind, type_codes, issues),
+            'BN_Count': [_count(landing.get('bn_count'), kind, 'bn_count', issues) for landing in landings]
+        })
+
+    columns = {name: np.concatenate([part[name] for part in parts]) for name in parts[0] if name != 'BN_Count'}
+    columns['BN_Count'] = _counts_array(parts[0]['BN_Count'] + parts[1]['BN_Count'])
+    return ResultTable(columns)
+
+
+def compile_ground_attacks(ground_attacks: Sequence,
+                           type_codes: Dict[str, int],
+                           hex_terrain: Optional[HexTerrain] = None,
+                           issues: Optional[Issues] = None) -> Tuple[ResultTable, ResultTable]:
+    """
+    Ground attacks and their BN lines (the batch attack engine's columnar form)
+
+    attack_bns.Attack is the positional index into attacks; lines are in
+    attack order, attacking BNs before fire support.
+    """
+
+    issues = issues if issues is not None else Issues()
+    kind = 'ground_attacks'
+    attacks = _entries(ground_attacks, kind, issues)
+
+    lines = []
+    for list_name, fire_support in (('attacking_bns', False), ('fire_support', True)):
+        lines += [(i, t, c, fire_support) for i, t, c in _unit_lines(attacks, list_name, kind, issues)]
+    lines.sort(key=lambda line: (line[0], line[3]))
+
+    origin_hexes = [attack.get('origin_hex') for attack in attacks]
+    target_hexes = [attack.get('target_hex') for attack in attacks]
+    _hex_keys(origin_hexes, kind, 'origin_hex', issues, None, required=False)
+    line_types = [line[1] for line in lines]
+
+    return (
+        ResultTable({
+            'Origin_Hex': object_column(origin_hexes),
+            'Target_Hex': object_column(target_hexes),
+            'Target_Key': _hex_keys(target_hexes, kind, 'target_hex', issues, hex_terrain)
+        }),
+        ResultTable({
+            'Attack': np.asarray([line[0] for line in lines], dtype=np.int64),
+            'Type': object_column(line_types),
+            'Type_Code': _type_codes(line_types, kind, type_codes, issues),
+            'Count': _counts_array([line[2] for line in lines], np.float64),
+            'Fire_Support': np.asarray([line[3] for line in lines], dtype=bool)
+        })
+    )
+
+
+def compile_movements(maneuver_movements: Sequence,
+                      type_codes: Dict[str, int],
+                      hex_terrain: Optional[HexTerrain] = None,
+                      issues: Optional[Issues] = None) -> ResultTable:
+    """Maneuver movements; from_hex / to_hex are optional and None when not given"""
+
+    issues = issues if issues is not None else Issues()
+    kind = 'maneuver_movements'
+    movements = _entries(maneuver_movements, kind, issues)
+
+    def to_code(value, name):
+        # TOs read from JSON or a float column come back as 3.0
+        if isinstance(value, (int, float, np.integer, np.floating)) and not isinstance(value, (bool, np.bool_)):
+            if math.isfinite(value) and float(value).is_integer():
+                return int(value)
+        issues.add(f"{kind}: {'missing' if value is None else 'invalid'} {name}")
+        return MISSING_TO
+
+    unit_types = [movement.get('unit_type') for movement in movements]
+    from_hexes = [movement.get('from_hex') for movement in movements]
+    to_hexes = [movement.get('to_hex') for movement in movements]
+    _hex_keys(from_hexes, kind, 'from_hex', issues, hex_terrain, required=False)
+    _hex_keys(to_hexes, kind, 'to_hex', issues, hex_terrain, required=False)
+
+    return ResultTable({
+        'Unit_ID': object_column([movement.get('unit_id') for movement in movements]),
+        'Unit_Type': object_column(unit_types),
+        'Type_Code': _type_codes(unit_types, kind, type_codes, issues),
+        'Unit_Count': _counts_array([_count(movement.get('unit_count'), kind, 'unit_count', issues)
+                                     for movement in movements]),
+        'From_TO': np.asarray([to_code(movement.get('from_to'), 'from_to') for movement in movements],
+                              dtype=np.int64),
+        'To_TO': np.asarray([to_code(movement.get('to_to'), 'to_to') for movement in movements], dtype=np.int64),
+        'From_Hex': object_column(from_hexes),
+        'To_Hex': object_column(to_hexes)
+    })
+
+
+def compile_fire_support(fire_support_plans: Sequence,
+                         type_codes: Dict[str, int],
+                         hex_terrain: Optional[HexTerrain] = None,
+                         issues: Optional[Issues] = None) -> Tuple[ResultTable, ResultTable]:
+    """Fire support plans and their supporting unit lines (Plan is the index into plans)"""
+
+    issues = issues if issues is not None else Issues()
+    kind = 'fire_support_plans'
+    plans = _entries(fire_support_plans, kind, issues)
+
+    plan_ids = []
+    for plan in plans:
+        plan_id = plan.get('plan_id')
+        if plan_id is None:
+            issues.add(f"{kind}: missing plan_id ('unknown' assumed)")
+            plan_id = 'unknown'
+        plan_ids.append(plan_id)
+    for _ in range(len(plan_ids) - len(set(plan_ids))):
+        issues.add(f"{kind}: duplicate plan_id (only the last plan's effectiveness is kept)")
+
+    target_types = [plan.get('target_type') for plan in plans]
+    for target_type in target_types:
+        if target_type not in FIRE_SUPPORT_TARGET_TYPES:
+            problem = 'missing target_type' if target_type is None else f"unknown target_type {target_type!r}"
+            issues.add(f"{kind}: {problem} (modifier 0.8 assumed)")
+
+    target_hexes = [plan.get('target_hex') for plan in plans]
+    lines = _unit_lines(plans, 'supporting_units', kind, issues)
+    line_types = [line[1] for line in lines]
+
+    return (
+        ResultTable({
+            'Plan_ID': object_column(plan_ids),
+            'Target_Hex': object_column(target_hexes),
+            'Target_Key': _hex_keys(target_hexes, kind, 'target_hex', issues, hex_terrain),
+            'Target_Type': object_column(target_types)
+        }),
+        ResultTable({
+            'Plan': np.asarray([line[0] for line in lines], dtype=np.int64),
+            'Type': object_column(line_types),
+            'Type_Code': _type_codes(line_types, kind, type_codes, issues),
+            'Count': _counts_array([line[2] for line in lines], np.float64)
+        })
+    )
+
+
+def count_operations(red_operations: Dict, blue_operations: Dict) -> int:
+    """Number of operation entries before validation"""
+    lists = ([red_operations.get(kind) for kind in RED_OPERATIONS] +
+             [blue_operations.get(kind) for kind in BLUE_OPERATIONS])
+    return sum(len(entries) for entries in lists if isinstance(entries, (list, tuple)))
+
+
+def compile_operations(red_operations: Dict,
+                       blue_operations: Dict,
+                       type_codes: Dict[str, int],
+                       hex_terrain: Optional[HexTerrain] = None) -> CompiledOperations:
+    """
+    Compile one turn's operations, collecting validation warnings
+
+    Args:
+        red_operations: Red player operations (landings, attacks)
+        blue_operations: Blue player operations (movements, fire support)
+        type_codes: Unit type -> code (BOOTSCalculator._unit_type_tables)
+        hex_terrain: Map to check hexes against (optional)
+    """
+
+    issues = Issues()
+    landings = compile_landings(red_operations.get('airborne_landings', []),
+                                red_operations.get('air_assault_landings', []),
+                                type_codes, hex_terrain, issues)
+    attacks, attack_bns = compile_ground_attacks(red_operations.get('ground_attacks', []),
+                                                 type_codes, hex_terrain, issues)
+    movements = compile_movements(blue_operations.get('maneuver_movements', []), type_codes, hex_terrain, issues)
+    plans, plan_units = compile_fire_support(blue_operations.get('fire_support_plans', []),
+                                             type_codes, hex_terrain, issues)
+
+    return CompiledOperations(landings, attacks, attack_bns, movements, plans, plan_units, issues.messages())
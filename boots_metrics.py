@@ -0,0 +1,85 @@
+"""
+Per-stage instrumentation for BOOTS calculations
+Records wall time, allocation peak and item counts for each step of
+calculate_boots_operations and forwards them to optional collector hooks
+"""
+
+import logging
+import time
+import tracemalloc
+from contextlib import contextmanager
+from dataclasses import dataclass, asdict
+from typing import TYPE_CHECKING, Callable, Dict, Iterator, Optional, Sequence
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+MetricsHook = Callable[['StageMetrics'], None]
+
+
+@dataclass
+class StageMetrics:
+    """Telemetry for one calculation step"""
+    stage: str
+    items_in: int                      # Operations or rows the step consumed
+    items_out: int = 0                 # Rows the step produced
+    seconds: float = 0.0               # Wall time
+    peak_bytes: Optional[int] = None   # Allocation peak (None unless memory tracking is on)
+
+
+class StageRecorder:
+    """
+    Collects StageMetrics for one run
+
+    Allocation peaks use tracemalloc, which slows Python allocation down, so
+    they are only recorded with track_memory=True. If tracemalloc is already
+    running (e.g. under the benchmark suite) its peak is reset per stage
+    rather than restarted, and memory already traced when the stage starts
+    is subtracted, so each stage reports only its own peak.
+    """
+
+    def __init__(self, track_memory: bool = False, hooks: Sequence[MetricsHook] = ()):
+        self.logger = logging.getLogger(__name__)
+        self.track_memory = track_memory
+        self.hooks = list(hooks)
+        self.metrics: Dict[str, StageMetrics] = {}
+
+    @contextmanager
+    def stage(self, name: str, items_in: int) -> Iterator[StageMetrics]:
+        """Time a stage; set items_out on the yielded StageMetrics inside the block"""
+
+        metrics = StageMetrics(stage=name, items_in=items_in)
+        started_tracing = False
+        traced_at_start = 0
+        if self.track_memory:
+            if tracemalloc.is_tracing():
+                tracemalloc.reset_peak()
+                traced_at_start = tracemalloc.get_traced_memory()[0]
+            else:
+                tracemalloc.start()
+                started_tracing = True
+
+        start = time.perf_counter()
+        try:
+            yield metrics
+        finally:
+            metrics.seconds = time.perf_counter() - start
+            if self.track_memory:
+                metrics.peak_bytes = tracemalloc.get_traced_memory()[1] - traced_at_start
+                if started_tracing:
+                    tracemalloc.stop()
+
+        self.metrics[name] = metrics
+        for hook in self.hooks:
+            try:
+                hook(metrics)
+            except Exception:
+                self.logger.warning("Metrics hook %r failed for stage %s", hook, name, exc_info=True)
+
+
+def metrics_to_frame(metrics: Dict[str, StageMetrics]) -> 'pd.DataFrame':
+    """Stage metrics as a frame, one row per stage in run order"""
+    import pandas as pd
+
+    return pd.DataFrame([asdict(m) for m in metrics.values()],
+                        columns=['stage', 'items_in', 'items_out', 'seconds', 'peak_bytes'])
@@ -0,0 +1,424 @@
+"""
+Async batched client for the external BOOTS adjudication program
+Includes a local stand-in server that wraps BOOTSCalculator, so the whole
+submission pipeline can be load-tested offline
+
+Wire protocol: HTTP/1.1 keep-alive, POST /boots/batch with a JSON body
+{"scenarios": [...]}, answered with {"results": [...]} in the same order.
+A scenario is the export_boots_data_for_external_program dict plus the
+'landed_bns' records, 'hex_terrain' and an optional 'seed'.
+"""
+
+import asyncio
+import json
+import logging
+from concurrent.futures import Executor, ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from boots_calculator import BOOTSCalculator, BOOTSResults
+from hex_grid import HexTerrain, HexTerrainGrid
+
+BATCH_PATH = '/boots/batch'
+
+# BOOTSResults frames carried over the wire
+RESULT_FRAMES = ['landing_results', 'attack_results', 'movement_results', 'unit_casualties',
+                 'territory_control', 'fire_support_area_effects']
+RESULT_COUNTS = ['total_landings_attempted', 'total_landings_successful',
+                 'total_attacks_attempted', 'total_attacks_successful']
+
+
+class BOOTSRemoteError(Exception):
+    """Raised when the adjudication server rejects or fails a batch"""
+
+
+def _json_default(value):
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    if isinstance(value, pd.Timestamp):
+        return value.isoformat()
+    raise TypeError(f"Not JSON serializable: {type(value).__name__}")
+
+
+def _frame_to_json(frame: pd.DataFrame) -> Dict:
+    """Column-oriented frame encoding; categorical columns carry their categories, as in boots_exchange"""
+    return {
+        'columns': {column: frame[column].astype(object).tolist() for column in frame.columns},
+        'categories': {column: frame[column].cat.categories.tolist() for column in frame.columns
+                       if isinstance(frame[column].dtype, pd.CategoricalDtype)}
+    }
+
+
+def _frame_from_json(payload: Dict) -> pd.DataFrame:
+    frame = pd.DataFrame(payload['columns'])
+    for column, categories in payload.get('categories', {}).items():
+        frame[column] = pd.Categorical(frame[column], categories=categories)
+    return frame
+
+
+def results_to_json(results: BOOTSResults) -> Dict:
+    """Encode BOOTSResults for the wire"""
+    payload = {name: _frame_to_json(results.frame(name))
+               for name in RESULT_FRAMES if getattr(results, name) is not None}
+    payload.update({name: int(getattr(results, name)) for name in RESULT_COUNTS})
+    payload['fire_support_effectiveness'] = results.fire_support_effectiveness
+    payload['warnings'] = list(results.warnings)
+    return payload
+
+
+def results_from_json(payload: Dict) -> BOOTSResults:
+    """Decode BOOTSResults from the wire"""
+    frames = {name: _frame_from_json(payload[name]) for name in RESULT_FRAMES if name in payload}
+    return BOOTSResults(
+        landing_results=frames.get('landing_results', pd.DataFrame()),
+        attack_results=frames.get('attack_results', pd.DataFrame()),
+        movement_results=frames.get('movement_results', pd.DataFrame()),
+        unit_casualties=frames.get('unit_casualties', pd.DataFrame()),
+        territory_control=frames.get('territory_control', pd.DataFrame()),
+        fire_support_effectiveness=payload['fire_support_effectiveness'],
+        total_landings_attempted=payload['total_landings_attempted'],
+        total_landings_successful=payload['total_landings_successful'],
+        total_attacks_attempted=payload['total_attacks_attempted'],
+        total_attacks_successful=payload['total_attacks_successful'],
+        warnings=payload['warnings'],
+        fire_support_area_effects=frames.get('fire_support_area_effects')
+    )
+
+
+def build_scenario(calculator: BOOTSCalculator,
+                   landed_bns: pd.DataFrame,
+                   green_maneuver: pd.DataFrame,
+                   red_operations: Dict,
+                   blue_operations: Dict,
+                   hex_terrain: HexTerrain,
+                   seed: Optional[int] = None) -> Dict:
+    """Scenario payload: the external-program export plus what the stand-in server needs to run it"""
+
+    scenario = calculator.export_boots_data_for_external_program(red_operations, blue_operations, green_maneuver)
+    scenario['landed_bns'] = landed_bns.to_dict('records')
+    scenario['hex_terrain'] = hex_terrain.to_dict() if isinstance(hex_terrain, HexTerrainGrid) else dict(hex_terrain)
+    scenario['seed'] = seed
+    return scenario
+
+
+def run_scenario(scenario: Dict, calculator_factory: Callable[..., BOOTSCalculator] = BOOTSCalculator) -> Dict:
+    """Run one scenario payload through a fresh calculator and encode the results"""
+
+    seed = scenario.get('seed')
+    calculator = calculator_factory(rng=np.random.default_rng(seed) if seed is not None else None)
+
+    results = calculator.calculate_boots_operations(
+        pd.DataFrame(scenario.get('landed_bns', [])),
+        pd.DataFrame(scenario.get('current_unit_positions', [])),
+        scenario.get('red_operations', {}),
+        scenario.get('blue_operations', {}),
+        scenario.get('hex_terrain', {})
+    )
+    return results_to_json(results)
+
+
+async def _read_http_message(reader: asyncio.StreamReader) -> Tuple[str, Dict[str, str], bytes]:
+    """Read one HTTP/1.1 message: (start line, headers, body)"""
+
+    start_line = (await reader.readline()).decode('latin-1').strip()
+    if not start_line:
+        raise ConnectionResetError("Connection closed")
+
+    headers = {}
+    while True:
+        line = (await reader.readline()).decode('latin-1').strip()
+        if not line:
+            break
+        name, _, value = line.partition(':')
+        headers[name.strip().lower()] = value.strip()
+
+    body = await reader.readexactly(int(headers.get('content-length', 0)))
+    return start_line, headers, body
+
+
+class BOOTSStandInServer:
+    """
+    Local stand-in for the external adjudication program
+
+    Serves POST /boots/batch by running every scenario through
+    BOOTSCalculator on an executor, so many connections and batches are
+    processed concurrently.
+    """
+
+    def __init__(self,
+                 host: str = '127.0.0.1',
+                 port: int = 0,
+                 calculator_factory: Callable[..., BOOTSCalculator] = BOOTSCalculator,
+                 executor: Optional[Executor] = None):
+        self.logger = logging.getLogger(__name__)
+        self.host = host
+        self.port = port
+        self.calculator_factory = calculator_factory
+        self.executor = executor if executor is not None else ThreadPoolExecutor()
+        self._server: Optional[asyncio.AbstractServer] = None
+
+    async def start(self) -> 'BOOTSStandInServer':
+        self._server = await asyncio.start_server(self._handle_connection, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        self.logger.info("BOOTS stand-in server listening on %s:%d", self.host, self.port)
+        return self
+
+    async def close(self):
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+
+    async def __aenter__(self) -> 'BOOTSStandInServer':
+        return await self.start()
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    async def serve_forever(self):
+        if self._server is None:
+            await self.start()
+        await self._server.serve_forever()
+
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            while True:
+                try:
+                    start_line, headers, body = await _read_http_message(reader)
+                except (ConnectionResetError, asyncio.IncompleteReadError):
+                    break
+
+                method, path, _ = start_line.split(' ', 2)
+                if method != 'POST' or path != BATCH_PATH:
+                    status, payload = '404 Not Found', {'error': f"No route for {method} {path}"}
+                else:
+                    try:
+                        status, payload = '200 OK', await self._run_batch(json.loads(body))
+                    except Exception as e:
+                        self.logger.exception("Batch failed")
+                        status, payload = '500 Internal Server Error', {'error': str(e)}
+
+                data = json.dumps(payload, default=_json_default).encode()
+                writer.write(f"HTTP/1.1 {status}\r\nContent-Type: application/json\r\n"
+                             f"Content-Length: {len(data)}\r\n\r\n".encode('latin-1') + data)
+                await writer.drain()
+
+                if headers.get('connection', '').lower() == 'close':
+                    break
+        finally:
+            writer.close()
+
+    async def _run_batch(self, request: Dict) -> Dict:
+        loop = asyncio.get_running_loop()
+        results = await asyncio.gather(*[
+            loop.run_in_executor(self.executor, run_scenario, scenario, self.calculator_factory)
+            for scenario in request['scenarios']
+        ])
+        return {'results': results}
+
+
+class BOOTSAsyncClient:
+    """
+    Async client that submits scenarios to the adjudication server in batches
+
+    submit() returns a future for each scenario's BOOTSResults. Queued
+    scenarios are grouped into batches of up to batch_size (waiting at most
+    batch_delay seconds to fill one), sent over a pool of keep-alive
+    connections with at most max_in_flight requests outstanding, and
+    retried with exponential backoff on connection or server errors.
+    """
+
+    def __init__(self,
+                 host: str = '127.0.0.1',
+                 port: int = 8765,
+                 max_connections: int = 8,
+                 max_in_flight: int = 16,
+                 batch_size: int = 16,
+                 batch_delay: float = 0.005,
+                 retries: int = 3,
+                 backoff: float = 0.1,
+                 timeout: float = 300.0):
+        self.logger = logging.getLogger(__name__)
+        self.host = host
+        self.port = port
+        self.max_connections = max_connections
+        self.batch_size = batch_size
+        self.batch_delay = batch_delay
+        self.retries = retries
+        self.backoff = backoff
+        self.timeout = timeout
+
+        self._in_flight = asyncio.Semaphore(max_in_flight)
+        self._idle: List[Tuple[asyncio.StreamReader, asyncio.StreamWriter]] = []
+        self._open_connections = 0
+        self._connection_available = asyncio.Condition()
+        self._queue: "asyncio.Queue[Tuple[Dict, asyncio.Future]]" = asyncio.Queue()
+        self._batcher: Optional[asyncio.Task] = None
+        self._requests: set = set()
+
+    async def __aenter__(self) -> 'BOOTSAsyncClient':
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    def submit(self, scenario: Dict) -> asyncio.Future:
+        """Queue a scenario; the returned future resolves to its BOOTSResults"""
+        future = asyncio.get_running_loop().create_future()
+        self._queue.put_nowait((scenario, future))
+        if self._batcher is None or self._batcher.done():
+            self._batcher = asyncio.create_task(self._batch_loop())
+        return future
+
+    async def run_many(self, scenarios: List[Dict]) -> List[BOOTSResults]:
+        """Submit scenarios and wait for all results, in submission order"""
+        return await asyncio.gather(*[self.submit(scenario) for scenario in scenarios])
+
+    async def close(self):
+        """Wait for outstanding requests, then close pooled connections"""
+        if self._batcher is not None:
+            await self._queue.join()
+            self._batcher.cancel()
+        if self._requests:
+            await asyncio.gather(*self._requests, return_exceptions=True)
+        for _, writer in self._idle:
+            writer.close()
+        self._idle.clear()
+        self._open_connections = 0
+
+    async def _batch_loop(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            deadline = loop.time() + self.batch_delay
+            while len(batch) < self.batch_size:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), remaining))
+                except asyncio.TimeoutError:
+                    break
+
+            await self._in_flight.acquire()
+            task = asyncio.create_task(self._send_batch(batch))
+            self._requests.add(task)
+            task.add_done_callback(self._requests.discard)
+
+    async def _send_batch(self, batch: List[Tuple[Dict, asyncio.Future]]):
+        try:
+            body = json.dumps({'scenarios': [scenario for scenario, _ in batch]},
+                              default=_json_default).encode()
+            last_error = None
+
+            for attempt in range(self.retries + 1):
+                if attempt > 0:
+                    await asyncio.sleep(self.backoff * 2 ** (attempt - 1))
+                try:
+                    payload = await asyncio.wait_for(self._post(body), self.timeout)
+                    results = self._decode_results(payload, len(batch))
+                except (OSError, asyncio.IncompleteReadError, asyncio.TimeoutError, BOOTSRemoteError) as e:
+                    last_error = e
+                    self.logger.warning("Batch of %d failed (attempt %d): %s", len(batch), attempt + 1, e)
+                    continue
+
+                for (_, future), result in zip(batch, results):
+                    if not future.done():
+                        future.set_result(result)
+                return
+
+            self._fail(batch, BOOTSRemoteError(f"Batch failed after {self.retries + 1} attempts: {last_error}"))
+        except Exception as e:
+            # Anything unexpected must still resolve the batch, or run_many waits forever
+            self.logger.exception("Batch of %d failed", len(batch))
+            self._fail(batch, e)
+        finally:
+            for _, future in batch:
+                if not future.done():
+                    future.cancel()
+            self._in_flight.release()
+            for _ in batch:
+                self._queue.task_done()
+
+    @staticmethod
+    def _decode_results(payload, n_scenarios: int) -> List[BOOTSResults]:
+        """Results of a batch reply, one per scenario; BOOTSRemoteError if the reply is malformed"""
+        results = payload.get('results') if isinstance(payload, dict) else None
+        if not isinstance(results, list):
+            raise BOOTSRemoteError("Reply has no 'results' list")
+        if len(results) != n_scenarios:
+            raise BOOTSRemoteError(f"Reply has {len(results)} results for {n_scenarios} scenarios")
+        try:
+            return [results_from_json(result) for result in results]
+        except (KeyError, TypeError, ValueError) as e:
+            raise BOOTSRemoteError(f"Malformed result in reply: {e!r}") from e
+
+    @staticmethod
+    def _fail(batch: List[Tuple[Dict, asyncio.Future]], error: BaseException):
+        for _, future in batch:
+            if not future.done():
+                future.set_exception(error)
+
+    async def _post(self, body: bytes) -> Dict:
+        reader, writer = await self._acquire_connection()
+        reusable = False
+        try:
+            writer.write(f"POST {BATCH_PATH} HTTP/1.1\r\nHost: {self.host}:{self.port}\r\n"
+                         f"Content-Type: application/json\r\nContent-Length: {len(body)}\r\n\r\n"
+                         .encode('latin-1') + body)
+            await writer.drain()
+
+            status_line, _, response = await _read_http_message(reader)
+            reusable = True
+            status = status_line.split(' ', 2)[1]
+            if status != '200':
+                raise BOOTSRemoteError(f"Server returned {status_line}: {response[:200]!r}")
+
+            try:
+                return json.loads(response)
+            except ValueError as e:
+                raise BOOTSRemoteError(f"Reply is not JSON: {response[:200]!r}") from e
+        finally:
+            await self._release_connection(reader, writer, reusable)
+
+    async def _acquire_connection(self) -> Tuple[asyncio.StreamReader, asyncio.StreamWriter]:
+        async with self._connection_available:
+            while not self._idle and self._open_connections >= self.max_connections:
+                await self._connection_available.wait()
+            if self._idle:
+                return self._idle.pop()
+            self._open_connections += 1
+
+        try:
+            return await asyncio.open_connection(self.host, self.port)
+        except OSError:
+            async with self._connection_available:
+                self._open_connections -= 1
+                self._connection_available.notify()
+            raise
+
+    async def _release_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter,
+                                  reusable: bool):
+        async with self._connection_available:
+            if reusable and not writer.is_closing():
+                self._idle.append((reader, writer))
+            else:
+                writer.close()
+                self._open_connections -= 1
+            self._connection_available.notify()
+
+
+if __name__ == '__main__':
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Local stand-in BOOTS adjudication server')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(BOOTSStandInServer(args.host, args.port).serve_forever())
@@ -0,0 +1,414 @@
+"""
+Content-hashed stage cache for BOOTS calculations
+Models the six calculation steps as a dependency graph and caches each step's
+output under a hash of its inputs, parameters and RNG substream, so parameter
+sweeps only recompute the steps a change actually reaches
+"""
+
+import copy
+import hashlib
+import inspect
+import itertools
+import logging
+import os
+import pickle
+import sys
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, Optional, Tuple
+
+import numpy as np
+
+import boots_calculator
+import boots_ingest
+import hex_grid
+import result_table
+import unit_index
+from boots_calculator import BOOTSCalculator, BOOTSResults
+from boots_ingest import BLUE_OPERATIONS, RED_OPERATIONS, CompiledOperations, count_operations
+from boots_metrics import StageRecorder
+from hex_grid import HexTerrain, HexTerrainGrid
+from unit_index import HexUnitIndex
+
+
+@dataclass(frozen=True)
+class StageSpec:
+    """One calculation step of the dependency graph"""
+    inputs: Tuple[str, ...]     # Scenario inputs and upstream stages it reads
+    params: Tuple[str, ...]     # BOOTSCalculator attributes it reads
+    stochastic: bool = False    # Draws from its own RNG substream
+
+
+# Scenario inputs a run is keyed on
+SCENARIO_INPUTS = ('landed_bns', 'green_maneuver', 'airborne_landings', 'air_assault_landings',
+                   'ground_attacks', 'maneuver_movements', 'fire_support_plans', 'hex_terrain')
+
+# The six steps of calculate_boots_operations in run order. Fire support only
+# reads Red strength from the unit index, which Blue movements never change,
+# so it does not depend on them. batch_attacks is left out of the attack key
+# because the batch and loop engines give identical results.
+STAGE_GRAPH: Dict[str, StageSpec] = {
+    'red_landings': StageSpec(
+        inputs=('airborne_landings', 'air_assault_landings', 'hex_terrain'),
+        params=('terrain_modifiers',),
+        stochastic=True),
+    'red_ground_attacks': StageSpec(
+        inputs=('ground_attacks', 'landed_bns', 'green_maneuver', 'hex_terrain'),
+        params=('unit_combat_strength', 'terrain_modifiers'),
+        stochastic=True),
+    'blue_movements': StageSpec(
+        inputs=('maneuver_movements', 'green_maneuver', 'landed_bns', 'hex_terrain'),
+        params=('terrain_modifiers', 'hex_to', 'movement_points_per_turn')),
+    'blue_fire_support': StageSpec(
+        inputs=('fire_support_plans', 'landed_bns', 'green_maneuver'),
+        params=('unit_combat_strength', 'fire_support_radius')),
+    'unit_casualties': StageSpec(
+        inputs=('red_ground_attacks', 'blue_fire_support'),
+        params=()),
+    'territory_control': StageSpec(
+        inputs=('red_landings', 'red_ground_attacks', 'blue_movements'),
+        params=())
+}
+
+
+# Bump when the layout of cached entries changes
+CACHE_FORMAT_VERSION = 1
+
+# Modules whose code produces the stage outputs
+_ENGINE_MODULES = (boots_calculator, boots_ingest, hex_grid, result_table, unit_index)
+
+
+def engine_version() -> str:
+    """
+    Digest of the code the stages run
+
+    Stage keys include it, so on-disk entries written by an older version
+    of the engine go stale instead of being served after a code change.
+    """
+
+    digest = hashlib.blake2b(digest_size=8)
+    for module in _ENGINE_MODULES + (sys.modules[__name__],):
+        digest.update(inspect.getsource(module).encode())
+    return digest.hexdigest()
+
+
+def _update_digest(digest, value):
+    """
+    Feed a value into a hash by content
+
+    Tables hash by column values (a ResultTable and its DataFrame view agree),
+    terrain grids by their code array, anything else by its pickle. Equal
+    values built differently (e.g. dicts in another key order) may hash
+    differently, which only costs a recompute, never a wrong hit.
+    """
+
+    if isinstance(value, np.ndarray):
+        digest.update(f"ndarray:{value.dtype.str}:{value.shape};".encode())
+        if value.dtype == object:
+            digest.update(pickle.dumps(value.tolist(), protocol=pickle.HIGHEST_PROTOCOL))
+        else:
+            digest.update(np.ascontiguousarray(value).tobytes())
+    elif isinstance(value, HexTerrainGrid):
+        digest.update(b'grid:')
+        _update_digest(digest, value.codes)
+        _update_digest(digest, (value.q_min, value.r_min, value.terrain_names, value.default_terrain))
+    elif hasattr(value, 'columns'):
+        # ResultTable or DataFrame
+        digest.update(b'table:')
+        for name in value.columns:
+            _update_digest(digest, name)
+            _update_digest(digest, np.asarray(value[name]))
+    else:
+        digest.update(pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL))
+
+
+def _count(value) -> int:
+    """Rows of a stage input or output (fire support outputs are (effectiveness, area) pairs)"""
+    return len(value[0] if isinstance(value, tuple) else value)
+
+
+def content_hash(*values) -> str:
+    """Hex digest of values by content"""
+    digest = hashlib.blake2b(digest_size=16)
+    for value in values:
+        _update_digest(digest, value)
+    return digest.hexdigest()
+
+
+class StageCache:
+    """
+    Size-bounded cache of stage outputs with an optional on-disk tier
+
+    The memory tier is an LRU bounded by the pickled size of its entries.
+    With cache_dir set, every output is also written there and memory misses
+    fall back to disk (bounded by max_disk_bytes, oldest files evicted), so a
+    sweep can resume across processes.
+    """
+
+    def __init__(self,
+                 max_bytes: int = 256 * 1024 * 1024,
+                 cache_dir: Optional[Path] = None,
+                 max_disk_bytes: Optional[int] = None):
+        self.logger = logging.getLogger(__name__)
+        self.max_bytes = max_bytes
+        self.cache_dir = Path(cache_dir) if cache_dir is not None else None
+        self.max_disk_bytes = max_disk_bytes
+        if self.cache_dir is not None:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+        self._entries: "OrderedDict[str, Tuple[Any, int]]" = OrderedDict()
+        self._bytes = 0
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._entries or (self.cache_dir is not None and self._path(key).exists())
+
+    @property
+    def nbytes(self) -> int:
+        """Pickled size of the entries held in memory"""
+        return self._bytes
+
+    def get(self, key: str) -> Tuple[bool, Any]:
+        """(found, value) for a key, from memory or disk"""
+
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return True, entry[0]
+
+        if self.cache_dir is not None:
+            path = self._path(key)
+            try:
+                with open(path, 'rb') as f:
+                    payload = f.read()
+            except FileNotFoundError:
+                pass
+            else:
+                value = pickle.loads(payload)
+                self._remember(key, value, len(payload))
+                os.utime(path)
+                self.disk_hits += 1
+                return True, value
+
+        self.misses += 1
+        return False, None
+
+    def put(self, key: str, value: Any):
+        """Store a stage output"""
+
+        payload = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        self._remember(key, value, len(payload))
+
+        if self.cache_dir is not None:
+            path = self._path(key)
+            tmp = path.with_suffix('.tmp')
+            with open(tmp, 'wb') as f:
+                f.write(payload)
+            os.replace(tmp, path)
+            if self.max_disk_bytes is not None:
+                self._evict_disk()
+
+    def clear(self):
+        """Drop the memory tier (the disk tier is kept)"""
+        self._entries.clear()
+        self._bytes = 0
+
+    def _remember(self, key: str, value: Any, size: int):
+        if size > self.max_bytes:
+            return
+        previous = self._entries.pop(key, None)
+        if previous is not None:
+            self._bytes -= previous[1]
+        self._entries[key] = (value, size)
+        self._bytes += size
+        while self._bytes > self.max_bytes:
+            _, (_, evicted) = self._entries.popitem(last=False)
+            self._bytes -= evicted
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}.pkl"
+
+    def _evict_disk(self):
+        files = sorted(self.cache_dir.glob('*.pkl'), key=lambda p: p.stat().st_mtime)
+        total = sum(p.stat().st_size for p in files)
+        for path in files:
+            if total <= self.max_disk_bytes:
+                break
+            total -= path.stat().st_size
+            path.unlink(missing_ok=True)
+
+
+class CachedBOOTSRunner:
+    """
+    Runs calculate_boots_operations step by step through a StageCache
+
+    Each step's key hashes the scenario inputs and calculator attributes it
+    reads (STAGE_GRAPH), the keys of the steps it depends on, its RNG
+    substream, and the cache format and engine versions. Stochastic steps draw from their own Generator seeded from
+    (seed, step), so a step's randomness does not shift when another step
+    changes; results match calculate_boots_operations given the same
+    substreams, not a single shared rng.
+    """
+
+    def __init__(self,
+                 calculator: Optional[BOOTSCalculator] = None,
+                 cache: Optional[StageCache] = None,
+                 seed: int = 0):
+        self.logger = logging.getLogger(__name__)
+        self.calculator = calculator if calculator is not None else BOOTSCalculator()
+        self.cache = cache if cache is not None else StageCache()
+        self.seed = seed
+
+        # Whether each step of the last run came from the cache
+        self.last_hits: Dict[str, bool] = {}
+        self._version = (CACHE_FORMAT_VERSION, engine_version())
+
+    def stage_rng(self, stage: str, seed: Optional[int] = None) -> np.random.Generator:
+        """The RNG substream of a step"""
+        seed = self.seed if seed is None else seed
+        return np.random.default_rng(np.random.SeedSequence(seed, spawn_key=(list(STAGE_GRAPH).index(stage),)))
+
+    def run(self,
+            landed_bns,
+            green_maneuver,
+            red_operations: Dict,
+            blue_operations: Dict,
+            hex_terrain: HexTerrain,
+            seed: Optional[int] = None) -> BOOTSResults:
+        """Calculate a turn, reusing every step whose key is already cached"""
+
+        scenario = self._scenario(landed_bns, green_maneuver, red_operations, blue_operations, hex_terrain)
+        return self._run(scenario, self._input_hashes(scenario), seed)
+
+    @staticmethod
+    def _scenario(landed_bns, green_maneuver, red_operations: Dict, blue_operations: Dict,
+                  hex_terrain: HexTerrain) -> Dict[str, Any]:
+        return {
+            'landed_bns': landed_bns,
+            'green_maneuver': green_maneuver,
+            'airborne_landings': red_operations.get('airborne_landings', []),
+            'air_assault_landings': red_operations.get('air_assault_landings', []),
+            'ground_attacks': red_operations.get('ground_attacks', []),
+            'maneuver_movements': blue_operations.get('maneuver_movements', []),
+            'fire_support_plans': blue_operations.get('fire_support_plans', []),
+            'hex_terrain': hex_terrain
+        }
+
+    @staticmethod
+    def _input_hashes(scenario: Dict[str, Any]) -> Dict[str, str]:
+        return {name: content_hash(scenario[name]) for name in SCENARIO_INPUTS}
+
+    def _run(self,
+             scenario: Dict[str, Any],
+             input_hashes: Dict[str, str],
+             seed: Optional[int]) -> BOOTSResults:
+        calc = self.calculator
+        seed = self.seed if seed is None else seed
+        recorder = StageRecorder(calc.track_memory, calc.metrics_hooks)
+        landed_bns = scenario['landed_bns']
+        green_maneuver = scenario['green_maneuver']
+        hex_terrain = scenario['hex_terrain']
+
+        # Compiling is cheap next to the steps and its type codes follow
+        # unit_combat_strength, so it is redone every run rather than cached
+        red_operations = {kind: scenario[kind] for kind in RED_OPERATIONS}
+        blue_operations = {kind: scenario[kind] for kind in BLUE_OPERATIONS}
+        with recorder.stage('ingest', count_operations(red_operations, blue_operations)) as stage:
+            operations = calc.compile_operations(red_operations, blue_operations, hex_terrain)
+            stage.items_out = operations.n_operations
+
+        def build_index() -> HexUnitIndex:
+            return HexUnitIndex.build(green_maneuver, landed_bns, calc.unit_combat_strength)
+
+        compute: Dict[str, Callable[[Dict[str, Any]], Any]] = {
+            'red_landings': lambda out: calc._resolve_red_landings(operations.landings, hex_terrain),
+            'red_ground_attacks': lambda out: self._ground_attacks(scenario, operations, build_index()),
+            'blue_movements': lambda out: calc._resolve_blue_movements(
+                operations.movements, green_maneuver, build_index(), hex_terrain),
+            'blue_fire_support': lambda out: calc._resolve_blue_fire_support(
+                operations.fire_support_plans, operations.fire_support_units, landed_bns, green_maneuver,
+                hex_terrain, build_index()),
+            'unit_casualties': lambda out: calc._calculate_unit_casualties(
+                landed_bns, green_maneuver, out['red_ground_attacks'], *out['blue_fire_support']),
+            'territory_control': lambda out: calc._update_territory_control(
+                out['red_landings'], out['red_ground_attacks'], out['blue_movements'])
+        }
+
+        keys: Dict[str, str] = {}
+        outputs: Dict[str, Any] = {}
+        self.last_hits = {}
+        for name, spec in STAGE_GRAPH.items():
+            dependencies = [keys[i] if i in keys else input_hashes[i] for i in spec.inputs]
+            params = [getattr(calc, p) for p in spec.params]
+            keys[name] = content_hash(self._version, name, dependencies, params,
+                                      seed if spec.stochastic else None)
+
+            items_in = sum(_count(outputs[i] if i in outputs else scenario[i])
+                           for i in spec.inputs if i != 'hex_terrain')
+            with recorder.stage(name, items_in) as stage:
+                found, output = self.cache.get(keys[name])
+                if not found:
+                    rng = calc.rng
+                    if spec.stochastic:
+                        calc.rng = self.stage_rng(name, seed)
+                    try:
+                        output = compute[name](outputs)
+                    finally:
+                        calc.rng = rng
+                    self.cache.put(keys[name], output)
+                outputs[name] = output
+                stage.items_out = _count(output)
+            self.last_hits[name] = found
+
+        self.logger.debug("Stage cache: %d/%d steps reused", sum(self.last_hits.values()), len(STAGE_GRAPH))
+
+        effectiveness, area_effects = outputs['blue_fire_support']
+        return calc._build_results(
+            operations, outputs['red_landings'], outputs['red_ground_attacks'], outputs['blue_movements'],
+            outputs['unit_casualties'], outputs['territory_control'], dict(effectiveness), area_effects,
+            list(operations.warnings), recorder
+        )
+
+    def sweep(self,
+              grid: Dict[str, Iterable],
+              landed_bns,
+              green_maneuver,
+              red_operations: Dict,
+              blue_operations: Dict,
+              hex_terrain: HexTerrain) -> Iterator[Tuple[Dict[str, Any], BOOTSResults]]:
+        """
+        Run every combination of calculator attribute values in grid
+
+        Values replace the attribute (e.g. {'terrain_modifiers': [...variants]}),
+        and the calculator is restored afterwards. The scenario must not change
+        during the sweep. Yields (variant, results).
+        """
+
+        # The scenario is fixed for the sweep, so its inputs are hashed once
+        scenario = self._scenario(landed_bns, green_maneuver, red_operations, blue_operations, hex_terrain)
+        input_hashes = self._input_hashes(scenario)
+
+        names = list(grid)
+        original = {name: getattr(self.calculator, name) for name in names}
+        try:
+            for values in itertools.product(*(grid[name] for name in names)):
+                variant = dict(zip(names, values))
+                for name, value in variant.items():
+                    setattr(self.calculator, name, copy.deepcopy(value))
+                yield variant, self._run(scenario, input_hashes, None)
+        finally:
+            for name, value in original.items():
+                setattr(self.calculator, name, value)
+
+    def _ground_attacks(self, scenario: Dict[str, Any], operations: CompiledOperations, unit_index: HexUnitIndex):
+        calc = self.calculator
+        resolve = calc._process_red_ground_attacks_batch if calc.batch_attacks else calc._resolve_red_ground_attacks
+        return resolve(operations.attacks, operations.attack_bns, scenario['landed_bns'], scenario['green_maneuver'],
+                       scenario['hex_terrain'], unit_index)
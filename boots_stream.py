@@ -0,0 +1,209 @@
+"""
+Streaming BOOTS calculation over large operation sets
+Reads operations from JSONL or Parquet in chunks and resolves each chunk
+through the regular calculation stages, so memory use stays flat however
+large the order book is
+"""
+
+import json
+import logging
+import os
+from dataclasses import asdict, dataclass, field
+from itertools import islice
+from typing import Dict, Iterable, Iterator, List, Tuple, Union
+
+from boots_calculator import BOOTSCalculator, BOOTSResults
+from hex_grid import HexTerrain
+from result_table import Table
+
+try:
+    import pyarrow.parquet as pq
+    HAS_PYARROW = True
+except ImportError:
+    HAS_PYARROW = False
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CHUNK_SIZE = 10_000
+STREAM_MANIFEST = 'stream.json'
+
+# Operation record kinds and the operations dict they belong to
+OPERATION_KINDS = {
+    'airborne_landings': 'red',
+    'air_assault_landings': 'red',
+    'ground_attacks': 'red',
+    'maneuver_movements': 'blue',
+    'fire_support_plans': 'blue'
+}
+
+Operations = Union[str, os.PathLike, Iterable[Dict]]
+
+
+@dataclass
+class StreamSummary:
+    """
+    Running totals over the chunks of a streamed calculation
+
+    Warnings are counted, not kept: a long stream can raise one per
+    operation. Their text stays with each chunk's results.
+    """
+    chunks: int = 0
+    operations: int = 0
+    total_landings_attempted: int = 0
+    total_landings_successful: int = 0
+    total_attacks_attempted: int = 0
+    total_attacks_successful: int = 0
+    warnings: int = 0
+    chunk_warnings: List[int] = field(default_factory=list)
+
+    def add(self, results: BOOTSResults, operations: int):
+        self.chunks += 1
+        self.operations += operations
+        self.total_landings_attempted += results.total_landings_attempted
+        self.total_landings_successful += results.total_landings_successful
+        self.total_attacks_attempted += results.total_attacks_attempted
+        self.total_attacks_successful += results.total_attacks_successful
+        self.warnings += len(results.warnings)
+        self.chunk_warnings.append(len(results.warnings))
+
+
+def write_operations_jsonl(red_operations: Dict, blue_operations: Dict, path: str):
+    """Write operation dicts as JSONL records, one operation per line tagged with its kind"""
+
+    with open(path, 'w', encoding='utf-8') as f:
+        for kind, side in OPERATION_KINDS.items():
+            operations = red_operations if side == 'red' else blue_operations
+            for operation in operations.get(kind, []):
+                f.write(json.dumps({'kind': kind, **operation}) + '\n')
+
+
+def iter_operation_records(path: str, batch_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[Dict]:
+    """
+    Operation records from a .jsonl or .parquet file, read incrementally
+
+    Parquet files hold one row per operation with a kind column; null fields
+    (columns that belong to other kinds) are dropped so the stages fall back
+    to their defaults as they do for missing dict keys.
+    """
+
+    if path.endswith('.parquet'):
+        if not HAS_PYARROW:
+            raise ImportError("Parquet operations require pyarrow (pip install pyarrow)")
+        for batch in pq.ParquetFile(path).iter_batches(batch_size=batch_size):
+            for record in batch.to_pylist():
+                yield {key: value for key, value in record.items() if value is not None}
+        return
+
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+
+def chunk_operations(records: Iterable[Dict],
+                     chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[Tuple[Dict, Dict, int, List[str]]]:
+    """
+    Group operation records into red/blue operations dicts of at most chunk_size operations
+
+    Yields (red_operations, blue_operations, n_operations, warnings).
+    """
+
+    records = iter(records)
+    while True:
+        chunk = list(islice(records, chunk_size))
+        if not chunk:
+            return
+
+        red_operations: Dict[str, List[Dict]] = {}
+        blue_operations: Dict[str, List[Dict]] = {}
+        warnings = []
+        for record in chunk:
+            kind = record.get('kind')
+            side = OPERATION_KINDS.get(kind)
+            if side is None:
+                warnings.append(f"Skipped operation with unknown kind {kind!r}")
+                continue
+            operations = red_operations if side == 'red' else blue_operations
+            operations.setdefault(kind, []).append({k: v for k, v in record.items() if k != 'kind'})
+
+        yield red_operations, blue_operations, len(chunk), warnings
+
+
+def _stream(calculator: BOOTSCalculator,
+            operations: Operations,
+            landed_bns: Table,
+            green_maneuver: Table,
+            hex_terrain: HexTerrain,
+            chunk_size: int) -> Iterator[Tuple[BOOTSResults, int]]:
+    """(results, operations in chunk) for every chunk"""
+
+    if isinstance(operations, (str, os.PathLike)):
+        operations = iter_operation_records(os.fspath(operations), chunk_size)
+
+    for red_operations, blue_operations, n_operations, warnings in chunk_operations(operations, chunk_size):
+        results = calculator.calculate_boots_operations(
+            landed_bns, green_maneuver, red_operations, blue_operations, hex_terrain
+        )
+        results.warnings.extend(warnings)
+        logger.debug("Resolved chunk of %d operations", n_operations)
+        yield results, n_operations
+
+
+def stream_boots_operations(calculator: BOOTSCalculator,
+                            operations: Operations,
+                            landed_bns: Table,
+                            green_maneuver: Table,
+                            hex_terrain: HexTerrain,
+                            chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[BOOTSResults]:
+    """
+    Calculate a turn chunk by chunk, yielding partial BOOTSResults
+
+    operations is a .jsonl/.parquet path or an iterable of records. Every
+    chunk is resolved against the same starting landed and Green unit
+    positions. Movements update unit positions only within their chunk: a
+    later movement of the same unit without a From_Hex starts where an
+    earlier one left it only if both fall in one chunk, so chunk results
+    can differ from one calculate_boots_operations call over all
+    operations. Random draws are also taken chunk by chunk, so they differ
+    from that call with the same seed.
+    """
+
+    for results, _ in _stream(calculator, operations, landed_bns, green_maneuver, hex_terrain, chunk_size):
+        yield results
+
+
+def write_boots_stream(calculator: BOOTSCalculator,
+                       operations: Operations,
+                       landed_bns: Table,
+                       green_maneuver: Table,
+                       hex_terrain: HexTerrain,
+                       path: str,
+                       chunk_size: int = DEFAULT_CHUNK_SIZE,
+                       file_format: str = 'npy') -> StreamSummary:
+    """
+    Calculate a turn chunk by chunk, writing each chunk's results to disk
+
+    Each chunk becomes a results bundle <path>/chunk-NNNNN (read back with
+    boots_exchange.read_boots_results); stream.json lists the chunks, the
+    summed totals and the warning count of each chunk. Only one chunk's results are held in memory at a time.
+    """
+
+    # boots_exchange needs pandas; streaming into memory does not
+    from boots_exchange import write_boots_results
+
+    os.makedirs(path, exist_ok=True)
+    summary = StreamSummary()
+    chunks = []
+
+    for results, n_operations in _stream(calculator, operations, landed_bns, green_maneuver, hex_terrain,
+                                         chunk_size):
+        name = f"chunk-{summary.chunks:05d}"
+        write_boots_results(results, os.path.join(path, name), file_format)
+        summary.add(results, n_operations)
+        chunks.append(name)
+
+    with open(os.path.join(path, STREAM_MANIFEST), 'w') as f:
+        json.dump({'chunks': chunks, 'chunk_size': chunk_size, 'summary': asdict(summary)}, f, indent=2)
+
+    logger.info("Streamed %d operations in %d chunks to %s", summary.operations, summary.chunks, path)
+    return summary
@@ -1,6 +1,35 @@
 const puppeteer = require('puppeteer');
 const path = require('path');
 const fs = require('fs');
+const http = require('http');
+
+const CONTENT_TYPES = {
+    '.html': 'text/html; charset=utf-8',
+    '.json': 'application/json',
+    '.js': 'text/javascript',
+    '.svg': 'image/svg+xml',
+    '.png': 'image/png'
+};
+
+// Serve this directory over HTTP: the map fetches scenario/ files, which file:// pages cannot do
+function serveDirectory(root) {
+    const server = http.createServer((req, res) => {
+        const filePath = path.join(root, decodeURIComponent(new URL(req.url, 'http://localhost').pathname));
+        if (!filePath.startsWith(root)) {
+            res.writeHead(403).end();
+            return;
+        }
+        fs.readFile(filePath, (error, data) => {
+            if (error) {
+                res.writeHead(404).end();
+                return;
+            }
+            res.writeHead(200, { 'Content-Type': CONTENT_TYPES[path.extname(filePath)] || 'application/octet-stream' });
+            res.end(data);
+        });
+    });
+    return new Promise(resolve => server.listen(0, '127.0.0.1', () => resolve(server)));
+}
 
 async function captureAndAnalyze() {
     const launchOptions = {
@@ -17,15 +46,16 @@ async function captureAndAnalyze() {
     }
 
     const browser = await puppeteer.launch(launchOptions);
+    const server = await serveDirectory(path.resolve('.'));
     
     try {
         const page = await browser.newPage();
         await page.setViewport({ width: 1920, height: 1080 });
         
-        // Load the HTML file
-        const filePath = 'file:///' + path.resolve('taiwan-military-map-enhanced.html').replace(/\\/g, '/');
-        console.log('Loading:', filePath);
-        await page.goto(filePath, { waitUntil: 'networkidle0' });
+        // Load the map page
+        const pageUrl = `http://127.0.0.1:${server.address().port}/taiwan-military-map-enhanced.html`;
+        console.log('Loading:', pageUrl);
+        await page.goto(pageUrl, { waitUntil: 'networkidle0' });
         
         // Wait for map to load
         await new Promise(resolve => setTimeout(resolve, 3000));
@@ -52,6 +82,7 @@ async function captureAndAnalyze() {
         console.error('Error:', error);
     } finally {
         await browser.close();
+        server.close();
     }
 }
 
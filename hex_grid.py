@@ -0,0 +1,329 @@
+"""
+Array-backed hex terrain grid
+Stores terrain as small-integer codes keyed by integer axial (q, r) coordinates
+"""
+
+import json
+import logging
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+# Code 0 means "no terrain recorded" and resolves to the default terrain
+NO_TERRAIN = 0
+
+# Packs axial (q, r) into one int64 key for vectorized coordinate joins;
+# missing or unparsable hexes get NO_HEX_KEY
+_PACK_BITS = 24
+_PACK_OFFSET = 1 << (_PACK_BITS - 1)
+NO_HEX_KEY = -1
+
+
+def parse_hex(hex_coord) -> Optional[Tuple[int, int]]:
+    """Parse a hex key ("q,r" string or (q, r) pair) into axial coordinates"""
+    if hex_coord is None:
+        return None
+    try:
+        if isinstance(hex_coord, str):
+            q, r = hex_coord.split(',')
+            return int(q), int(r)
+        q, r = hex_coord
+        return int(q), int(r)
+    except (TypeError, ValueError):
+        return None
+
+
+def hex_key(q: int, r: int) -> str:
+    """Format axial coordinates as the "q,r" string key used by operations"""
+    return f"{q},{r}"
+
+
+def parse_hexes(hexes: Iterable) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Parse many hex keys at once
+
+    Returns:
+        q, r: int64 axial coordinate arrays
+        valid: bool array, False where a key could not be parsed
+    """
+    parsed = [parse_hex(h) for h in hexes]
+    valid = np.fromiter((p is not None for p in parsed), dtype=bool, count=len(parsed))
+    q = np.fromiter((p[0] if p else 0 for p in parsed), dtype=np.int64, count=len(parsed))
+    r = np.fromiter((p[1] if p else 0 for p in parsed), dtype=np.int64, count=len(parsed))
+    return q, r, valid
+
+
+def pack_axial(q: np.ndarray, r: np.ndarray) -> np.ndarray:
+    """Integer keys for axial coordinates"""
+    return ((q + _PACK_OFFSET) << _PACK_BITS) | (r + _PACK_OFFSET)
+
+
+def unpack_axial(keys: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Axial coordinates of integer keys (the inverse of pack_axial)
+
+    Returns:
+        q, r: int64 axial coordinate arrays
+        valid: bool array, False where the key is NO_HEX_KEY
+    """
+    keys = np.asarray(keys, dtype=np.int64)
+    valid = keys != NO_HEX_KEY
+    q = np.where(valid, (keys >> _PACK_BITS) - _PACK_OFFSET, 0)
+    r = np.where(valid, (keys & ((1 << _PACK_BITS) - 1)) - _PACK_OFFSET, 0)
+    return q, r, valid
+
+
+def hex_keys(hexes: Iterable) -> np.ndarray:
+    """Integer keys for hex keys, NO_HEX_KEY where a key could not be parsed"""
+    q, r, valid = parse_hexes(hexes)
+    return np.where(valid, pack_axial(q, r), NO_HEX_KEY)
+
+
+class HexTerrainGrid:
+    """
+    Hex terrain stored as a uint8 code array over an axial bounding box
+
+    Supports the dict lookups the BOOTS stages already make
+    (hex_terrain.get(hex_coord, 'open')) plus batch lookups over arrays of
+    hexes, and can be saved to and memory-mapped from disk. The code array
+    is read-only: edits go through set_terrain(), which bumps version so
+    caches derived from the grid notice them.
+    """
+
+    def __init__(self,
+                 codes: np.ndarray,
+                 q_min: int,
+                 r_min: int,
+                 terrain_names: Sequence[str],
+                 default_terrain: str = 'open'):
+        self.logger = logging.getLogger(__name__)
+
+        if codes.ndim != 2:
+            raise ValueError("Terrain codes must be a 2-D (q, r) array")
+        if len(terrain_names) > np.iinfo(np.uint8).max:
+            raise ValueError(f"Too many terrain types for uint8 codes: {len(terrain_names)}")
+
+        self.codes = codes.view()
+        self.codes.flags.writeable = False
+        self.version = 0
+        self.q_min = int(q_min)
+        self.r_min = int(r_min)
+        # terrain_names[0] is the placeholder for NO_TERRAIN
+        self.terrain_names = list(terrain_names)
+        self.default_terrain = default_terrain
+        self._names = np.array(self.terrain_names, dtype=object)
+        self._names[NO_TERRAIN] = default_terrain
+        self._code_of = {name: code for code, name in enumerate(self.terrain_names) if code != NO_TERRAIN}
+
+    @classmethod
+    def from_dict(cls, hex_terrain: Dict[str, str], default_terrain: str = 'open') -> 'HexTerrainGrid':
+        """Build a grid from the legacy {"q,r": terrain} dict"""
+
+        terrain_names = [''] + sorted(set(hex_terrain.values()))
+        code_of = {name: code for code, name in enumerate(terrain_names)}
+
+        keys = list(hex_terrain.keys())
+        q, r, valid = parse_hexes(keys)
+        if not valid.all():
+            bad = [k for k, ok in zip(keys, valid) if not ok]
+            raise ValueError(f"Hex keys are not axial 'q,r' coordinates: {bad[:5]}")
+
+        if len(keys) == 0:
+            return cls(np.zeros((0, 0), dtype=np.uint8), 0, 0, terrain_names, default_terrain)
+
+        q_min, r_min = int(q.min()), int(r.min())
+        codes = np.zeros((int(q.max()) - q_min + 1, int(r.max()) - r_min + 1), dtype=np.uint8)
+        codes[q - q_min, r - r_min] = [code_of[t] for t in hex_terrain.values()]
+
+        return cls(codes, q_min, r_min, terrain_names, default_terrain)
+
+    def set_terrain(self, hexes: Iterable, terrain: Optional[str]):
+        """
+        Set the terrain of hexes inside the grid; None removes them from the map
+
+        The code array is replaced by an edited copy (which also detaches a
+        memory-mapped grid from its file) and version is incremented.
+        """
+
+        q, r, valid = parse_hexes(hexes)
+        qi, ri = q - self.q_min, r - self.r_min
+        inside = valid & (qi >= 0) & (qi < self.codes.shape[0]) & (ri >= 0) & (ri < self.codes.shape[1])
+        if not inside.all():
+            raise ValueError(f"Hexes outside the grid: {len(inside) - int(inside.sum())}")
+
+        if terrain is None:
+            code = NO_TERRAIN
+        elif terrain in self._code_of:
+            code = self._code_of[terrain]
+        else:
+            if len(self.terrain_names) >= np.iinfo(np.uint8).max:
+                raise ValueError(f"Too many terrain types for uint8 codes: {len(self.terrain_names) + 1}")
+            code = len(self.terrain_names)
+            self.terrain_names.append(terrain)
+            self._names = np.append(self._names, np.array([terrain], dtype=object))
+            self._code_of[terrain] = code
+
+        codes = np.array(self.codes)
+        codes[qi, ri] = code
+        codes.flags.writeable = False
+        self.codes = codes
+        self.version += 1
+
+    def save(self, path: str):
+        """Write codes to <path> (.npy) and the coordinate/terrain metadata to <path>.json"""
+        np.save(path, self.codes, allow_pickle=False)
+        with open(f"{path}.json", 'w') as f:
+            json.dump({
+                'q_min': self.q_min,
+                'r_min': self.r_min,
+                'terrain_names': self.terrain_names,
+                'default_terrain': self.default_terrain
+            }, f)
+
+    @classmethod
+    def load(cls, path: str, mmap: bool = True) -> 'HexTerrainGrid':
+        """Load a grid written by save(), memory-mapping the code array by default"""
+        with open(f"{path}.json") as f:
+            meta = json.load(f)
+        codes = np.load(path, mmap_mode='r' if mmap else None, allow_pickle=False)
+        return cls(codes, meta['q_min'], meta['r_min'], meta['terrain_names'], meta['default_terrain'])
+
+    def codes_at(self, q: np.ndarray, r: np.ndarray) -> np.ndarray:
+        """Terrain codes for arrays of axial coordinates (NO_TERRAIN outside the grid)"""
+        qi = np.asarray(q, dtype=np.int64) - self.q_min
+        ri = np.asarray(r, dtype=np.int64) - self.r_min
+        inside = (qi >= 0) & (qi < self.codes.shape[0]) & (ri >= 0) & (ri < self.codes.shape[1])
+
+        codes = np.full(qi.shape, NO_TERRAIN, dtype=np.uint8)
+        codes[inside] = self.codes[qi[inside], ri[inside]]
+        return codes
+
+    def codes_for(self, hexes: Iterable) -> np.ndarray:
+        """Terrain codes for hex keys; unparsable keys get NO_TERRAIN"""
+        q, r, valid = parse_hexes(hexes)
+        codes = self.codes_at(q, r)
+        codes[~valid] = NO_TERRAIN
+        return codes
+
+    def codes_for_keys(self, keys: np.ndarray) -> np.ndarray:
+        """Terrain codes for packed hex keys (hex_keys); NO_HEX_KEY gets NO_TERRAIN"""
+        q, r, valid = unpack_axial(keys)
+        codes = self.codes_at(q, r)
+        codes[~valid] = NO_TERRAIN
+        return codes
+
+    def terrain_for(self, hexes: Iterable) -> np.ndarray:
+        """Terrain names for hex keys as an object array"""
+        return self._names[self.codes_for(hexes)]
+
+    def modifier_table(self, terrain_modifiers: Dict[str, float], default: float = 1.0) -> np.ndarray:
+        """Modifier per terrain code, for indexing with code arrays"""
+        return np.array([terrain_modifiers.get(name, default) for name in self._names], dtype=np.float64)
+
+    def modifiers_for(self, hexes: Iterable, terrain_modifiers: Dict[str, float],
+                      default: float = 1.0) -> np.ndarray:
+        """Terrain modifiers for hex keys in one batch lookup"""
+        return self.modifier_table(terrain_modifiers, default)[self.codes_for(hexes)]
+
+    # Dict-style access so existing per-hex lookups work unchanged
+
+    def get(self, hex_coord, default: Optional[str] = None) -> Optional[str]:
+        parsed = parse_hex(hex_coord)
+        if parsed is None:
+            return default
+        code = self.codes_at(np.array([parsed[0]]), np.array([parsed[1]]))[0]
+        return default if code == NO_TERRAIN else self.terrain_names[code]
+
+    def __getitem__(self, hex_coord) -> str:
+        terrain = self.get(hex_coord)
+        if terrain is None:
+            raise KeyError(hex_coord)
+        return terrain
+
+    def __contains__(self, hex_coord) -> bool:
+        return self.get(hex_coord) is not None
+
+    def __len__(self) -> int:
+        return int(np.count_nonzero(self.codes))
+
+    def to_dict(self) -> Dict[str, str]:
+        """Expand back to the legacy {"q,r": terrain} dict"""
+        qi, ri = np.nonzero(self.codes)
+        return {hex_key(int(q) + self.q_min, int(r) + self.r_min): self.terrain_names[self.codes[q, r]]
+                for q, r in zip(qi, ri)}
+
+
+HexTerrain = Union[Dict[str, str], HexTerrainGrid]
+
+
+def terrain_stamp(hex_terrain: HexTerrain) -> Tuple[int, int]:
+    """
+    Constant-time change stamp of a terrain map, for caches derived from it
+
+    A grid's stamp changes with every set_terrain(); a dict's when hexes are
+    added or removed. A dict hex whose terrain is changed in place keeps the
+    stamp, so caches of such maps must be dropped by hand. Stamps include
+    the map's id, so only compare them while holding a reference to the map.
+    """
+    if isinstance(hex_terrain, HexTerrainGrid):
+        return id(hex_terrain), hex_terrain.version
+    return id(hex_terrain), len(hex_terrain)
+
+
+def dict_terrain(hex_terrain: Dict[str, str],
+                 hexes: Sequence,
+                 keys: Optional[np.ndarray] = None) -> List[Optional[str]]:
+    """
+    Terrain of each hex in a dict map, None where the hex is not on it
+
+    Hexes are looked up as spelled first; misses are retried under their
+    canonical "q,r" key, so '3, 4' finds '3,4' as it does in a grid. keys
+    are the packed keys of hexes (hex_keys), if already computed.
+    """
+
+    terrain: List[Optional[str]] = []
+    missed = []
+    for i, h in enumerate(hexes):
+        t = hex_terrain.get(h) if isinstance(h, str) else None
+        if t is None:
+            missed.append((i, h))
+        terrain.append(t)
+
+    if missed:
+        if keys is None:
+            q, r, valid = parse_hexes([h for _, h in missed])
+        else:
+            q, r, valid = unpack_axial(np.asarray(keys)[[i for i, _ in missed]])
+        for j, (i, _) in enumerate(missed):
+            if valid[j]:
+                terrain[i] = hex_terrain.get(hex_key(int(q[j]), int(r[j])))
+
+    return terrain
+
+
+def lookup_terrain(hex_terrain: HexTerrain,
+                   hexes: Sequence,
+                   terrain_modifiers: Dict[str, float],
+                   default_terrain: str = 'open',
+                   keys: Optional[np.ndarray] = None) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Batch terrain lookup for either a HexTerrainGrid or a legacy dict
+
+    keys are the packed keys of hexes (hex_keys), if already computed; a
+    grid looks them up without parsing the hex strings again. Both map kinds
+    accept any spelling of a hex (see dict_terrain).
+
+    Returns:
+        terrain: object array of terrain names
+        modifiers: float64 array of terrain modifiers
+    """
+
+    if isinstance(hex_terrain, HexTerrainGrid):
+        codes = hex_terrain.codes_for(hexes) if keys is None else hex_terrain.codes_for_keys(keys)
+        return (hex_terrain._names[codes],
+                hex_terrain.modifier_table(terrain_modifiers)[codes])
+
+    terrain = np.array([default_terrain if t is None else t for t in dict_terrain(hex_terrain, hexes, keys)],
+                       dtype=object)
+    modifiers = np.array([terrain_modifiers.get(t, 1.0) for t in terrain], dtype=np.float64)
+    return terrain, modifiers
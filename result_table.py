@@ -0,0 +1,109 @@
+"""
+Lightweight column-oriented result tables
+Lets the BOOTS engine run on plain NumPy arrays and only import pandas when a
+caller asks for a DataFrame view
+"""
+
+from typing import TYPE_CHECKING, Dict, Iterable, List, Optional, Sequence, Union
+
+import numpy as np
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+# Result fields hold a ResultTable (lightweight mode) or a DataFrame
+Table = Union['pd.DataFrame', 'ResultTable']
+
+
+def is_missing(value) -> bool:
+    """None or NaN, the values pandas treats as missing in object columns"""
+    return value is None or value != value
+
+
+class ResultTable:
+    """
+    Result rows stored as one NumPy array per column
+
+    Supports the small part of the DataFrame interface the engine itself
+    uses (len, .columns, `name in table`, table[name]), so stages accept
+    either. Columns listed in categories become pandas categoricals in
+    to_frame().
+    """
+
+    __slots__ = ('_columns', 'categories')
+
+    def __init__(self,
+                 columns: Dict[str, np.ndarray],
+                 categories: Optional[Dict[str, List]] = None):
+        self._columns = columns
+        self.categories = categories or {}
+
+    @property
+    def columns(self) -> List[str]:
+        return list(self._columns)
+
+    def __len__(self) -> int:
+        return len(next(iter(self._columns.values()))) if self._columns else 0
+
+    def __getitem__(self, name: str) -> np.ndarray:
+        return self._columns[name]
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._columns
+
+    def __repr__(self) -> str:
+        return f"ResultTable({len(self)} rows, columns={self.columns})"
+
+    def to_frame(self) -> 'pd.DataFrame':
+        """DataFrame view of the table (imports pandas on first use)"""
+        import pandas as pd
+
+        data = {}
+        for name, values in self._columns.items():
+            categories = self.categories.get(name)
+            data[name] = values if categories is None else pd.Categorical(values, categories=categories)
+
+        return pd.DataFrame(data, columns=self.columns, index=pd.RangeIndex(len(self)))
+
+
+def as_frame(table: Optional[Table]) -> Optional['pd.DataFrame']:
+    """DataFrame for a ResultTable; DataFrames and None pass through"""
+    return table.to_frame() if isinstance(table, ResultTable) else table
+
+
+def column(table: Table, name: str, dtype=None) -> np.ndarray:
+    """
+    A column of a ResultTable or DataFrame as a NumPy array
+
+    Missing columns read as all-missing (like DataFrame.reindex): None in an
+    object array, or NaN for a numeric dtype. Stages therefore tolerate
+    results loaded without every column.
+    """
+    if name in table.columns:
+        return np.asarray(table[name], dtype=dtype)
+    if dtype is None or dtype == object:
+        return np.full(len(table), None, dtype=object)
+    return np.full(len(table), np.nan)
+
+
+def concat_tables(tables: Sequence[ResultTable], columns: Sequence[str]) -> ResultTable:
+    """
+    Concatenate result tables, keeping the schema
+
+    Empty pieces are dropped before concatenating so they do not widen the
+    dtypes of the rows that remain.
+    """
+    pieces = [table for table in tables if len(table) > 0] or list(tables[:1])
+
+    categories = {}
+    for table in tables:
+        categories.update(table.categories)
+
+    return ResultTable({name: np.concatenate([piece[name] for piece in pieces]) for name in columns},
+                       categories)
+
+
+def object_column(values: Iterable) -> np.ndarray:
+    """Object array for string-like values (never a fixed-width '<U' array)"""
+    values = values if isinstance(values, (list, tuple)) else list(values)
+    return np.fromiter(values, dtype=object, count=len(values))
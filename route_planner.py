@@ -0,0 +1,218 @@
+"""
+Hex-level route planner for Blue maneuver movements
+Builds a weighted hex graph from terrain modifiers and the TO restriction rules
+and answers batches of movement requests with cached shortest paths
+"""
+
+import heapq
+import logging
+from collections import OrderedDict
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from hex_grid import HexTerrain, HexTerrainGrid, hex_key, parse_hexes
+
+# Axial neighbour offsets
+HEX_DIRECTIONS = np.array([(1, 0), (1, -1), (0, -1), (-1, 0), (-1, 1), (0, 1)], dtype=np.int64)
+
+# TO code for hexes without a theater of operations
+NO_TO = 0
+
+
+class RoutePlanner:
+    """
+    Shortest-path movement engine over the hex map
+
+    Entering a hex costs its terrain modifier, so rough terrain is slower.
+    Edges between hexes whose TOs may not move to each other are dropped.
+    Single-source Dijkstra results are cached per origin hex (LRU), so
+    repeated turns on the same map reuse rows of the all-pairs table instead
+    of searching again.
+    """
+
+    def __init__(self,
+                 hex_terrain: HexTerrain,
+                 terrain_modifiers: Dict[str, float],
+                 hex_to: Optional[Dict[str, int]] = None,
+                 is_restricted: Optional[Callable[[int, int], bool]] = None,
+                 movement_points_per_turn: float = 10.0,
+                 max_cached_sources: int = 1024):
+        """
+        Args:
+            hex_terrain: Terrain by hex ("q,r" dict or HexTerrainGrid); defines the map
+            terrain_modifiers: Cost of entering each terrain type
+            hex_to: Theater of operations per hex, used for TO restrictions
+            is_restricted: Returns True when units may not move between two TOs
+            movement_points_per_turn: Path cost a unit covers in one turn
+            max_cached_sources: Number of origin hexes to keep shortest paths for
+        """
+        self.logger = logging.getLogger(__name__)
+        self.hex_terrain = hex_terrain
+        self.movement_points_per_turn = movement_points_per_turn
+        self.max_cached_sources = max_cached_sources
+        self._cache: "OrderedDict[int, Tuple[np.ndarray, np.ndarray, np.ndarray]]" = OrderedDict()
+
+        # Nodes: every hex with recorded terrain
+        if isinstance(hex_terrain, HexTerrainGrid):
+            qi, ri = np.nonzero(hex_terrain.codes)
+            q = qi.astype(np.int64) + hex_terrain.q_min
+            r = ri.astype(np.int64) + hex_terrain.r_min
+            costs = hex_terrain.modifier_table(terrain_modifiers)[hex_terrain.codes[qi, ri]]
+        else:
+            keys = list(hex_terrain.keys())
+            q, r, valid = parse_hexes(keys)
+            q, r = q[valid], r[valid]
+            costs = np.array([terrain_modifiers.get(t, 1.0) for t, ok in zip(hex_terrain.values(), valid) if ok],
+                             dtype=np.float64)
+
+        self.n_nodes = len(q)
+        self._q = q
+        self._r = r
+        self._node_of: Dict[str, int] = {hex_key(int(a), int(b)): i for i, (a, b) in enumerate(zip(q, r))}
+
+        to_codes = np.full(self.n_nodes, NO_TO, dtype=np.int64)
+        if hex_to:
+            for hex_coord, to in hex_to.items():
+                node = self._node_of.get(hex_coord)
+                if node is not None:
+                    to_codes[node] = to
+
+        self._build_graph(costs, to_codes, is_restricted)
+
+    def _build_graph(self,
+                     costs: np.ndarray,
+                     to_codes: np.ndarray,
+                     is_restricted: Optional[Callable[[int, int], bool]]):
+        """Build CSR adjacency with entry costs as edge weights"""
+
+        if self.n_nodes == 0:
+            self._indptr, self._indices, self._weights = [0], [], []
+            return
+
+        q_min, r_min = int(self._q.min()), int(self._r.min())
+        shape = (int(self._q.max()) - q_min + 3, int(self._r.max()) - r_min + 3)
+        node_at = np.full(shape, -1, dtype=np.int64)
+        node_at[self._q - q_min + 1, self._r - r_min + 1] = np.arange(self.n_nodes)
+
+        sources = []
+        targets = []
+        for dq, dr in HEX_DIRECTIONS:
+            neighbours = node_at[self._q - q_min + 1 + dq, self._r - r_min + 1 + dr]
+            present = neighbours >= 0
+            sources.append(np.nonzero(present)[0])
+            targets.append(neighbours[present])
+        sources = np.concatenate(sources)
+        targets = np.concatenate(targets)
+
+        # Drop edges between TOs that may not move to each other
+        if is_restricted is not None:
+            crossing = to_codes[sources] != to_codes[targets]
+            pairs = np.unique(np.stack([to_codes[sources[crossing]], to_codes[targets[crossing]]], axis=1), axis=0)
+            blocked = [(a, b) for a, b in pairs if is_restricted(int(a), int(b))]
+            keep = np.ones(len(sources), dtype=bool)
+            for a, b in blocked:
+                keep &= ~((to_codes[sources] == a) & (to_codes[targets] == b))
+            sources, targets = sources[keep], targets[keep]
+
+        order = np.argsort(sources, kind='stable')
+        sources, targets = sources[order], targets[order]
+
+        # Plain lists are much faster than NumPy scalars inside the heap loop
+        self._indptr = np.searchsorted(sources, np.arange(self.n_nodes + 1)).tolist()
+        self._indices = targets.tolist()
+        self._weights = costs[targets].tolist()
+
+        self.logger.debug("Route graph: %d hexes, %d edges", self.n_nodes, len(self._indices))
+
+    def node_of(self, hex_coord: str) -> Optional[int]:
+        """Graph node for a hex key, or None if the hex is not on the map"""
+        return self._node_of.get(hex_coord)
+
+    def _search(self, source: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Cached single-source Dijkstra: (cost, hops, predecessor) per node"""
+
+        cached = self._cache.get(source)
+        if cached is not None:
+            self._cache.move_to_end(source)
+            return cached
+
+        indptr, indices, weights = self._indptr, self._indices, self._weights
+        cost = [np.inf] * self.n_nodes
+        hops = [-1] * self.n_nodes
+        pred = [-1] * self.n_nodes
+        cost[source] = 0.0
+        hops[source] = 0
+        heap = [(0.0, source)]
+
+        while heap:
+            d, node = heapq.heappop(heap)
+            if d > cost[node]:
+                continue
+            for k in range(indptr[node], indptr[node + 1]):
+                neighbour = indices[k]
+                nd = d + weights[k]
+                if nd < cost[neighbour]:
+                    cost[neighbour] = nd
+                    hops[neighbour] = hops[node] + 1
+                    pred[neighbour] = node
+                    heapq.heappush(heap, (nd, neighbour))
+
+        result = (np.array(cost), np.array(hops, dtype=np.int64), np.array(pred, dtype=np.int64))
+        self._cache[source] = result
+        if len(self._cache) > self.max_cached_sources:
+            self._cache.popitem(last=False)
+
+        return result
+
+    def route_batch(self,
+                    from_hexes: Iterable[str],
+                    to_hexes: Iterable[str]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Resolve a batch of movement requests
+
+        One search runs per distinct origin hex (or none if cached).
+
+        Returns:
+            path_cost: terrain-weighted path cost (inf when unreachable)
+            path_length: number of hexes moved (-1 when unreachable)
+            arrival_time: turns needed to arrive (inf when unreachable)
+        """
+
+        from_nodes = np.array([self._node_of.get(h, -1) for h in from_hexes], dtype=np.int64)
+        to_nodes = np.array([self._node_of.get(h, -1) for h in to_hexes], dtype=np.int64)
+
+        path_cost = np.full(len(from_nodes), np.inf)
+        path_length = np.full(len(from_nodes), -1, dtype=np.int64)
+        on_map = (from_nodes >= 0) & (to_nodes >= 0)
+
+        for source in np.unique(from_nodes[on_map]):
+            rows = np.nonzero(on_map & (from_nodes == source))[0]
+            cost, hops, _ = self._search(int(source))
+            path_cost[rows] = cost[to_nodes[rows]]
+            path_length[rows] = hops[to_nodes[rows]]
+
+        arrival_time = path_cost / self.movement_points_per_turn
+
+        return path_cost, path_length, arrival_time
+
+    def path(self, from_hex: str, to_hex: str) -> Optional[List[str]]:
+        """Hexes along the shortest path, or None when there is no route"""
+
+        source, target = self._node_of.get(from_hex), self._node_of.get(to_hex)
+        if source is None or target is None:
+            return None
+
+        _, hops, pred = self._search(source)
+        if hops[target] < 0:
+            return None
+
+        nodes = [target]
+        while nodes[-1] != source:
+            nodes.append(int(pred[nodes[-1]]))
+
+        return [hex_key(int(self._q[n]), int(self._r[n])) for n in reversed(nodes)]
+
+    def clear_cache(self):
+        """Drop all cached shortest-path rows"""
+        self._cache.clear()
@@ -0,0 +1,305 @@
+"""
+Tiled scenario files for the map
+Writes unit positions and hex control as a small index, one file per map tile
+and one delta file per turn, so the page only loads the units in view and
+applies turns incrementally instead of carrying the order of battle inline
+"""
+
+import argparse
+import json
+import logging
+import math
+import re
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from hex_grid import hex_key, parse_hexes
+from result_table import Table, column, is_missing
+from threat_geometry import HexProjection, ThreatGeometry, convex_hull
+
+FORMAT_VERSION = 1
+DEFAULT_TILE_DEGREES = 0.25
+COORD_PRECISION = 5
+
+# Column order of unit rows in tile and turn files (repeated in the index)
+UNIT_FIELDS = ['id', 'force', 'type', 'size', 'designation', 'name', 'lat', 'lng',
+               'count', 'description', 'subordinates']
+
+# BOOTS battalion types -> map symbol types (createNATOSymbol)
+BN_TYPE_SYMBOLS = {
+    'Light': 'infantry',
+    'Medium': 'mech-infantry',
+    'Heavy': 'armor',
+    'Amphib': 'amphibious',
+    'SOF': 'sof',
+    'Towed_Arty': 'artillery',
+    'SP_Arty': 'sp-arty',
+    'C2': 'corps-hq',
+    'Recon': 'recon',
+    'SHORAD': 'shorad',
+    'Cargo_Handling': 'transportation',
+    'Engineer': 'engineers',
+    'Airborne': 'airborne',
+    'Air_Assault': 'air-assault',
+    'DOS': 'supply'
+}
+
+# Inline arrays in the map page and the force of their units
+INLINE_ARRAYS = {'redUnits': 'red', 'militaryUnits': 'green'}
+
+
+def extract_inline_units(html_path: Path) -> List[Dict]:
+    """
+    Unit records from the redUnits / militaryUnits arrays of a map page
+
+    One-time migration of a hard-coded order of battle (the main map page no
+    longer carries one; its copy still does). The arrays are plain object
+    literals, so they are converted to JSON by quoting keys and dropping
+    comments and trailing commas. Ids are force:designation (force:position
+    without one); repeats get a #n suffix so every id is unique.
+    """
+
+    source = Path(html_path).read_text(encoding='utf-8')
+    units: List[Dict] = []
+    seen: Dict[str, int] = {}
+    for name, force in INLINE_ARRAYS.items():
+        match = re.search(rf'const {name} = (\[.*?\n\s*\]);', source, re.DOTALL)
+        if match is None:
+            raise ValueError(f"No inline {name} array in {html_path}")
+
+        literal = re.sub(r'^\s*//.*$', '', match.group(1), flags=re.MULTILINE)
+        literal = re.sub(r'^(\s*)([A-Za-z_]\w*)\s*:', r'\1"\2":', literal, flags=re.MULTILINE)
+        literal = re.sub(r',(\s*[\]}])', r'\1', literal)
+
+        for i, unit in enumerate(json.loads(literal)):
+            unit_id = f"{force}:{unit.get('designation') or i}"
+            seen[unit_id] = seen.get(unit_id, 0) + 1
+            if seen[unit_id] > 1:
+                unit_id = f"{unit_id}#{seen[unit_id]}"
+            units.append({
+                'id': unit_id,
+                'force': unit.get('force', force),
+                'type': unit.get('natoType') or unit.get('type'),
+                'size': unit.get('size'),
+                'designation': unit.get('designation'),
+                'name': unit.get('name'),
+                'lat': unit['lat'],
+                'lng': unit['lng'],
+                'description': unit.get('description'),
+                'subordinates': unit.get('subordinates')
+            })
+
+    return units
+
+
+class ScenarioExporter:
+    """
+    Writes a scenario directory for the map
+
+    Layout:
+        index.json        bbox, tile grid, unit fields, threat zone, turn count
+        tiles/X_Y.json    base unit rows of one tile_degrees x tile_degrees tile
+        turns/N.json      per-turn delta: unit rows by tile, removed ids and
+                          the GeoJSON control delta from ThreatGeometry
+
+    Rows are lists in UNIT_FIELDS order. Coordinates are [lat, lng] like
+    Leaflet, except inside the GeoJSON control features.
+    """
+
+    def __init__(self,
+                 out_dir: Path,
+                 tile_degrees: float = DEFAULT_TILE_DEGREES,
+                 projection: Optional[HexProjection] = None):
+        self.logger = logging.getLogger(__name__)
+        self.out_dir = Path(out_dir)
+        self.tile_degrees = tile_degrees
+        self.geometry = ThreatGeometry(projection)
+
+        self._tiles: Dict[str, List[list]] = {}
+        self._bbox: Optional[List[float]] = None
+        self._threat_zone: List[List[float]] = []
+        self.turn = 0
+
+        # Red battalions landed so far by unit id (landings accumulate across turns)
+        self._landed: Dict[str, float] = {}
+
+    def tile_of(self, lat: float, lng: float) -> str:
+        """Tile key of a position"""
+        return f"{math.floor(lng / self.tile_degrees)}_{math.floor(lat / self.tile_degrees)}"
+
+    def write_units(self, units: Iterable[Dict]) -> Dict:
+        """Write the base order of battle as tiles and the index; returns the index"""
+
+        units = list(units)
+        self._tiles = {}
+        for unit in units:
+            self._tiles.setdefault(self.tile_of(unit['lat'], unit['lng']), []).append(self._row(unit))
+
+        if units:
+            lats = np.array([u['lat'] for u in units], dtype=np.float64)
+            lngs = np.array([u['lng'] for u in units], dtype=np.float64)
+            self._bbox = [round(float(v), COORD_PRECISION) for v in (lngs.min(), lats.min(), lngs.max(), lats.max())]
+
+            # Only the hull vertices of the Red positions are needed for the threat zone
+            red = np.array([[u['lat'], u['lng']] for u in units if u['force'] == 'red'], dtype=np.float64)
+            self._threat_zone = red[convex_hull(red)].tolist() if len(red) else []
+
+        tile_dir = self.out_dir / 'tiles'
+        tile_dir.mkdir(parents=True, exist_ok=True)
+        for stale in tile_dir.glob('*.json'):
+            stale.unlink()
+        for key, rows in self._tiles.items():
+            self._dump(tile_dir / f"{key}.json", {'tile': key, 'rows': rows})
+
+        self.logger.info("Wrote %d units in %d tiles to %s", len(units), len(self._tiles), self.out_dir)
+        return self._write_index()
+
+    def write_turn(self,
+                   results,
+                   units: Optional[Table] = None,
+                   removed: Iterable[str] = ()) -> Dict:
+        """
+        Write one turn's delta from BOOTSResults; returns the delta
+
+        Successful landings are shown as Red battalions per hex and type, and
+        territory_control becomes the GeoJSON control delta. units optionally
+        repositions tracked units (Unit_ID, Hex, Unit_Type, Unit_Count and
+        optionally Team columns, e.g. Green positions after maneuver).
+        """
+
+        self.turn += 1
+        by_tile: Dict[str, List[list]] = {}
+
+        for row in self._landing_rows(results.landing_results) + self._unit_rows(units):
+            by_tile.setdefault(self.tile_of(row[6], row[7]), []).append(row)
+
+        delta = {
+            'turn': self.turn,
+            'units': by_tile,
+            'removed': list(removed),
+            'control': self.geometry.apply_turn_results(results)
+        }
+
+        turn_dir = self.out_dir / 'turns'
+        turn_dir.mkdir(parents=True, exist_ok=True)
+        self._dump(turn_dir / f"{self.turn}.json", delta)
+        self._write_index()
+
+        return delta
+
+    def _landing_rows(self, landing_results: Table) -> List[list]:
+        """Red battalion rows for this turn's successful landings"""
+
+        success = column(landing_results, 'Success', object)
+        hexes = column(landing_results, 'Hex', object)
+        # Canonical "q,r" keys, so every spelling of a hex gives the same unit id
+        q, r, valid = parse_hexes(hexes)
+        hexes = [hex_key(int(q[i]), int(r[i])) if valid[i] else h for i, h in enumerate(hexes)]
+        bn_types = column(landing_results, 'BN_Type', object)
+        landed = column(landing_results, 'BNs_Landed', np.float64)
+
+        arrived: Dict[Tuple[str, str], float] = {}
+        for ok, hex_coord, bn_type, count in zip(success, hexes, bn_types, landed):
+            if not is_missing(ok) and ok and not is_missing(hex_coord) and count > 0:
+                key = (hex_coord, bn_type)
+                arrived[key] = arrived.get(key, 0.0) + float(count)
+
+        return self._hex_rows('red', [(f"red:{h}:{t}", h, t, c) for (h, t), c in arrived.items()],
+                              accumulate=True)
+
+    def _unit_rows(self, units: Optional[Table]) -> List[list]:
+        """Rows repositioning tracked units"""
+
+        if units is None or len(units) == 0:
+            return []
+        teams = column(units, 'Team', object)
+        counts = column(units, 'Unit_Count', np.float64)
+        records = zip(column(units, 'Unit_ID', object), column(units, 'Hex', object),
+                      column(units, 'Unit_Type', object), counts)
+
+        rows = []
+        for team, record in zip(teams, records):
+            force = 'green' if is_missing(team) else str(team).lower()
+            rows += self._hex_rows(force, [record])
+        return rows
+
+    def _hex_rows(self, force: str, units: List[tuple], accumulate: bool = False) -> List[list]:
+        """Rows for (id, hex, unit type, count) tuples placed at their hex centres"""
+
+        q, r, valid = parse_hexes([unit[1] for unit in units])
+        plane = self.geometry.projection.to_plane(q, r)
+        lnglat = self.geometry.projection.to_lnglat(plane)
+
+        rows = []
+        for i, (unit_id, hex_coord, unit_type, count) in enumerate(units):
+            if not valid[i]:
+                self.logger.warning("Unit %s has unparsable hex %r", unit_id, hex_coord)
+                continue
+            count = 1.0 if is_missing(count) else float(count)
+            if accumulate:
+                count = self._landed[unit_id] = self._landed.get(unit_id, 0.0) + count
+
+            rows.append(self._row({
+                'id': unit_id,
+                'force': force,
+                'type': BN_TYPE_SYMBOLS.get(unit_type, unit_type),
+                'size': 'battalion',
+                'designation': f"{count:g}x" if count != 1 else None,
+                'name': f"{unit_type} ({hex_coord})",
+                'lat': lnglat[i, 1],
+                'lng': lnglat[i, 0],
+                'count': count
+            }))
+        return rows
+
+    def _row(self, unit: Dict) -> list:
+        row = [unit.get(field) for field in UNIT_FIELDS]
+        row[6] = round(float(row[6]), COORD_PRECISION)
+        row[7] = round(float(row[7]), COORD_PRECISION)
+        return row
+
+    def _write_index(self) -> Dict:
+        index = {
+            'version': FORMAT_VERSION,
+            'tile_degrees': self.tile_degrees,
+            'fields': UNIT_FIELDS,
+            'bbox': self._bbox,
+            'tiles': {key: {'bbox': self._tile_bbox(key), 'units': len(rows)} for key, rows in self._tiles.items()},
+            'threat_zone': self._threat_zone,
+            'turns': self.turn
+        }
+        self.out_dir.mkdir(parents=True, exist_ok=True)
+        self._dump(self.out_dir / 'index.json', index)
+        return index
+
+    def _tile_bbox(self, key: str) -> List[float]:
+        x, y = (int(v) for v in key.split('_'))
+        size = self.tile_degrees
+        return [x * size, y * size, (x + 1) * size, (y + 1) * size]
+
+    @staticmethod
+    def _dump(path: Path, data: Dict):
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False, separators=(',', ':'))
+
+
+def main(argv: Optional[List[str]] = None):
+    """Migrate a map page's inline units to a scenario directory"""
+
+    parser = argparse.ArgumentParser(description=main.__doc__)
+    parser.add_argument('html', type=Path,
+                        help="Map page with inline redUnits / militaryUnits (e.g. the copy of the map page)")
+    parser.add_argument('--out', type=Path, default=Path('scenario'), help="Scenario directory")
+    parser.add_argument('--tile-degrees', type=float, default=DEFAULT_TILE_DEGREES)
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO)
+    exporter = ScenarioExporter(args.out, tile_degrees=args.tile_degrees)
+    index = exporter.write_units(extract_inline_units(args.html))
+    print(f"{sum(t['units'] for t in index['tiles'].values())} units in {len(index['tiles'])} tiles -> {args.out}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,379 @@
+"""
+Military symbol lookup for results pipelines
+Loads symbols-index.json once behind an inverted token index, resolves
+battalion types to symbol slugs from battalion_symbol_mapping.md and serves
+symbol SVG fragments by byte offset from the memory-mapped symbology guide
+
+Usage:
+    python symbol_service.py search armour tracked
+    python symbol_service.py battalion "CA BN (Heavy)"
+    python symbol_service.py svg armour > armour.svg
+"""
+
+import argparse
+import json
+import logging
+import mmap
+import os
+import re
+import sys
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+INDEX_PATH = os.path.join(ROOT, 'symbols-index.json')
+MAPPING_PATH = os.path.join(ROOT, 'battalion_symbol_mapping.md')
+GUIDE_PATH = os.path.join(ROOT, 'Military_Symbology_Guide.svg')
+PREVIEW_DIR = os.path.join(ROOT, 'symbols')
+
+# Border path that marks a 600x400 symbol panel (same rule as tools/index_svg_symbols.js)
+PANEL_BORDER = b'd="M 5,5 H 595 V 395 H 5 Z"'
+
+# Team of the first mapping table; later tables are headed "Green (Taiwan):" etc.
+DEFAULT_MAPPING_TEAM = 'Red'
+
+_TOKEN = re.compile(r'[a-z0-9]+')
+_GROUP_TAG = re.compile(rb'<g[\s>]|</g>')
+_TRANSLATE = re.compile(rb'<g\s+transform="translate\(([-0-9.]+),\s*([-0-9.]+)\)"')
+_LABEL_SWITCH = re.compile(r'<switch>.*?</switch>', re.DOTALL)
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase alphanumeric tokens of a label or query"""
+    return _TOKEN.findall(text.lower())
+
+
+@dataclass
+class SymbolEntry:
+    """One labeled panel of the symbology guide (an entry of symbols-index.json)"""
+    slug: str
+    label: str
+    x: float                                        # Panel translate within its parent group
+    y: float
+    span: Optional[Tuple[int, int]] = None          # Byte range of the panel group in the guide
+
+
+@dataclass
+class BattalionSymbol:
+    """Symbol mapping for one battalion type"""
+    team: str
+    battalion_type: str
+    slug: str                  # Symbol file stem (e.g. 'sof' for the custom SOF symbol)
+    label_slug: str            # Guide slug/label the symbol is based on
+    custom: bool               # Symbol is a custom file, not a panel of the guide
+    notes: str
+
+
+class SymbolService:
+    """
+    Symbol search, battalion mapping and SVG fragments
+
+    The index and mapping are read once. The guide SVG is memory-mapped and
+    scanned once for panel byte ranges on first use; fragments are then
+    sliced straight from the map and kept in an LRU cache.
+    """
+
+    def __init__(self,
+                 index_path: str = INDEX_PATH,
+                 mapping_path: Optional[str] = MAPPING_PATH,
+                 guide_path: Optional[str] = None,
+                 preview_dir: str = PREVIEW_DIR,
+                 max_cached_fragments: int = 256):
+        """
+        Args:
+            index_path: symbols-index.json written by tools/index_svg_symbols.js
+            mapping_path: Battalion type mapping table (None to skip)
+            guide_path: Symbology guide SVG (defaults to the index's source file)
+            preview_dir: Directory with per-symbol SVGs (used for custom symbols)
+            max_cached_fragments: Number of SVG fragments to keep in memory
+        """
+        self.logger = logging.getLogger(__name__)
+        self.preview_dir = preview_dir
+        self.max_cached_fragments = max_cached_fragments
+
+        with open(index_path, encoding='utf-8') as f:
+            index = json.load(f)
+
+        self.symbols: List[SymbolEntry] = [
+            SymbolEntry(s['slug'], s.get('label', ''), s['transform']['x'], s['transform']['y'])
+            for s in index.get('symbols', [])
+        ]
+        self._by_slug: Dict[str, SymbolEntry] = {}
+        for entry in self.symbols:
+            self._by_slug.setdefault(entry.slug, entry)
+
+        # Inverted index: label token -> positions of the symbols carrying it
+        self._postings: Dict[str, Set[int]] = {}
+        for i, entry in enumerate(self.symbols):
+            for token in tokenize(entry.label):
+                self._postings.setdefault(token, set()).add(i)
+        self._term_cache: Dict[str, Set[int]] = {}
+
+        self.guide_path = guide_path or os.path.join(os.path.dirname(index_path), index.get('source', ''))
+        self._guide_file = None
+        self._guide: Optional[mmap.mmap] = None
+        self._fragment_cache: "OrderedDict[str, str]" = OrderedDict()
+
+        self.battalions: Dict[Tuple[str, str], BattalionSymbol] = {}
+        if mapping_path:
+            for symbol in parse_battalion_mapping(mapping_path):
+                self.battalions[(symbol.team, symbol.battalion_type)] = symbol
+
+    # Search
+
+    def search(self, *keywords: str) -> List[SymbolEntry]:
+        """
+        Symbols whose label matches every keyword (case-insensitive)
+
+        Like tools/search_symbols.js, a keyword matches any label word that
+        contains it, so 'arm' finds 'armour' and 'combined arms'.
+        """
+
+        matches: Optional[Set[int]] = None
+        for keyword in keywords:
+            for term in tokenize(keyword):
+                hits = self._term_hits(term)
+                matches = hits if matches is None else matches & hits
+                if not matches:
+                    return []
+
+        if matches is None:
+            return []
+        return [self.symbols[i] for i in sorted(matches)]
+
+    def _term_hits(self, term: str) -> Set[int]:
+        """Symbols with a label token containing term (scans the vocabulary, not the labels)"""
+        hits = self._term_cache.get(term)
+        if hits is None:
+            hits = set()
+            for token, postings in self._postings.items():
+                if term in token:
+                    hits |= postings
+            self._term_cache[term] = hits
+        return hits
+
+    def get(self, slug: str) -> Optional[SymbolEntry]:
+        """Index entry for a slug, or None"""
+        return self._by_slug.get(slug)
+
+    # Battalion mapping
+
+    def battalion_symbol(self, battalion_type: str, team: Optional[str] = None) -> Optional[BattalionSymbol]:
+        """Mapping for a battalion type; without a team, Red is tried before Green"""
+
+        teams = [team] if team else [DEFAULT_MAPPING_TEAM] + sorted(
+            {t for t, _ in self.battalions} - {DEFAULT_MAPPING_TEAM})
+        name = ' '.join(battalion_type.split())
+        for candidate in teams:
+            symbol = self.battalions.get((candidate, name))
+            if symbol is not None:
+                return symbol
+        return None
+
+    def slugs_for(self, battalion_types: Iterable[str], team: Optional[str] = None) -> List[Optional[str]]:
+        """Symbol slug for each battalion type in a batch (None where unmapped)"""
+        resolved: Dict[str, Optional[str]] = {}
+        slugs = []
+        for battalion_type in battalion_types:
+            if battalion_type not in resolved:
+                symbol = self.battalion_symbol(battalion_type, team) if isinstance(battalion_type, str) else None
+                resolved[battalion_type] = symbol.slug if symbol else None
+            slugs.append(resolved[battalion_type])
+        return slugs
+
+    # SVG fragments
+
+    def fragment(self, slug: str) -> Optional[str]:
+        """
+        Raw <g transform="translate(x,y)"> panel markup for a slug
+
+        Custom symbols that are not panels of the guide are read from their
+        preview file instead. Returns None for unknown slugs.
+        """
+
+        cached = self._fragment_cache.get(slug)
+        if cached is not None:
+            self._fragment_cache.move_to_end(slug)
+            return cached
+
+        entry = self._by_slug.get(slug)
+        if entry is not None:
+            self._locate_panels()
+        if entry is not None and entry.span is not None:
+            start, end = entry.span
+            fragment = self._guide[start:end].decode('utf-8')
+        else:
+            path = os.path.join(self.preview_dir, f"{slug}.svg")
+            if not os.path.exists(path):
+                return None
+            with open(path, encoding='utf-8') as f:
+                fragment = f.read()
+
+        self._fragment_cache[slug] = fragment
+        if len(self._fragment_cache) > self.max_cached_fragments:
+            self._fragment_cache.popitem(last=False)
+
+        return fragment
+
+    def svg(self, slug: str) -> Optional[str]:
+        """Standalone 600x400 SVG document for a symbol, without its label text"""
+
+        fragment = self.fragment(slug)
+        if fragment is None or fragment.lstrip().startswith('<?xml') or fragment.lstrip().startswith('<svg'):
+            return fragment
+
+        # Drop the outer translate group and the label <switch> blocks
+        inner = fragment[fragment.index('>') + 1:fragment.rindex('</g>')]
+        inner = _LABEL_SWITCH.sub('', inner)
+        return ('<?xml version="1.0" encoding="UTF-8"?>\n'
+                '<svg xmlns="http://www.w3.org/2000/svg" width="600" height="400" viewBox="0 0 600 400">\n'
+                f"{inner.strip()}\n"
+                '</svg>\n')
+
+    def _locate_panels(self):
+        """Map the guide and record the byte range of every indexed panel (once)"""
+
+        if self._guide is not None:
+            return
+
+        self._guide_file = open(self.guide_path, 'rb')
+        self._guide = mmap.mmap(self._guide_file.fileno(), 0, access=mmap.ACCESS_READ)
+        guide = self._guide
+
+        # Match <g> / </g> pairs; groups are listed in start-tag (document) order
+        groups = []
+        stack = []
+        for match in _GROUP_TAG.finditer(guide):
+            if match.group().startswith(b'</'):
+                if stack:
+                    position = stack.pop()
+                    groups[position] = (groups[position][0], match.end())
+            else:
+                stack.append(len(groups))
+                groups.append((match.start(), None))
+
+        # The indexer keeps every translated group that contains a panel border
+        panels = []
+        for start, end in groups:
+            if end is None:
+                continue
+            translate = _TRANSLATE.match(guide, start)
+            if translate and guide.find(PANEL_BORDER, start, end) != -1:
+                panels.append((start, end, float(translate.group(1)), float(translate.group(2))))
+
+        if len(panels) != len(self.symbols):
+            self.logger.warning("Guide has %d panels but the index lists %d symbols; "
+                                "re-run npm run index:symbols", len(panels), len(self.symbols))
+
+        for entry, (start, end, x, y) in zip(self.symbols, panels):
+            if (x, y) == (entry.x, entry.y):
+                entry.span = (start, end)
+
+        self.logger.debug("Located %d symbol panels in %s", len(panels), self.guide_path)
+
+    def close(self):
+        """Release the memory-mapped guide"""
+        if self._guide is not None:
+            self._guide.close()
+            self._guide_file.close()
+            self._guide = None
+            self._guide_file = None
+            for entry in self.symbols:
+                entry.span = None
+        self._fragment_cache.clear()
+
+    def __enter__(self) -> 'SymbolService':
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def parse_battalion_mapping(path: str) -> List[BattalionSymbol]:
+    """
+    Read the battalion type tables from battalion_symbol_mapping.md
+
+    The first table holds Red battalions; a line such as "Green (Taiwan):"
+    starts the next team's table. A note after the slug, e.g.
+    "special_operations_infantry (custom)", marks a custom symbol whose file
+    (symbols/sof.svg) gives the slug.
+    """
+
+    symbols = []
+    team = DEFAULT_MAPPING_TEAM
+
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if not line.startswith('|'):
+                if line.endswith(':') or line.startswith('#'):
+                    heading = line.lstrip('#').strip().rstrip(':')
+                    first_word = heading.split(' ', 1)[0] if heading else ''
+                    if first_word in ('Red', 'Green', 'Blue'):
+                        team = first_word
+                continue
+
+            cells = [cell.strip() for cell in line.strip('|').split('|')]
+            if len(cells) < 3 or cells[0] == 'Battalion Type' or set(cells[0]) <= set('-: '):
+                continue
+
+            battalion_type, slug_cell, file_cell = cells[:3]
+            notes = cells[3] if len(cells) > 3 else ''
+            label_slug, _, note = slug_cell.partition(' ')
+            file_slug = os.path.splitext(os.path.basename(file_cell))[0] if file_cell else label_slug
+
+            symbols.append(BattalionSymbol(
+                team=team,
+                battalion_type=' '.join(battalion_type.split()),
+                slug=file_slug or label_slug,
+                label_slug=label_slug,
+                custom='custom' in note.lower() or file_slug != label_slug,
+                notes=notes
+            ))
+
+    return symbols
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Search and export military symbols")
+    commands = parser.add_subparsers(dest='command', required=True)
+    search = commands.add_parser('search', help="Symbols whose label matches every keyword")
+    search.add_argument('keywords', nargs='+')
+    battalion = commands.add_parser('battalion', help="Symbol for a battalion type")
+    battalion.add_argument('battalion_type')
+    battalion.add_argument('--team', choices=['Red', 'Green'])
+    svg = commands.add_parser('svg', help="Standalone SVG for a slug")
+    svg.add_argument('slug')
+    args = parser.parse_args(argv)
+
+    with SymbolService() as service:
+        if args.command == 'search':
+            matches = service.search(*args.keywords)
+            if not matches:
+                print("No matches.")
+            for i, entry in enumerate(matches, 1):
+                print(f"{i}. {entry.label}")
+                print(f"   slug: {entry.slug}")
+                print(f"   preview: {os.path.join(service.preview_dir, entry.slug + '.svg')}")
+            return 0
+
+        if args.command == 'battalion':
+            symbol = service.battalion_symbol(args.battalion_type, args.team)
+            if symbol is None:
+                print(f"No symbol mapped for {args.battalion_type!r}", file=sys.stderr)
+                return 1
+            print(f"{symbol.team} {symbol.battalion_type}: {symbol.slug}"
+                  + (f" (custom, based on {symbol.label_slug})" if symbol.custom else ""))
+            return 0
+
+        document = service.svg(args.slug)
+        if document is None:
+            print(f"Unknown symbol {args.slug!r}", file=sys.stderr)
+            return 1
+        sys.stdout.write(document)
+        return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,62 @@
+"""
+Shared fixtures for the BOOTS tests
+The BOOTS modules live at the repository root, next to this directory
+"""
+
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+UNIT_TYPES = ['Light', 'Medium', 'Heavy', 'Amphib', 'SP_Arty', 'Towed_Arty', 'Unknown', None]
+TERRAIN_TYPES = ['urban', 'forest', 'mountain', 'coastal', 'open']
+TARGET_TYPES = ['Maneuver', 'Artillery', 'Chokepoints', 'Infrastructure', 'Unknown']
+
+
+@pytest.fixture
+def scenario():
+    """A seeded turn over a 12x12 hex map: (landed_bns, green_maneuver, red_operations, blue_operations, terrain)"""
+
+    rng = np.random.default_rng(11)
+    hexes = [f"{q},{r}" for q in range(-6, 6) for r in range(-6, 6)]
+
+    def some_hex() -> str:
+        return hexes[rng.integers(len(hexes))]
+
+    def unit_lines(most: int):
+        return [{'type': UNIT_TYPES[rng.integers(len(UNIT_TYPES))], 'count': int(rng.integers(0, 4))}
+                for _ in range(rng.integers(0, most))]
+
+    terrain = {h: TERRAIN_TYPES[rng.integers(len(TERRAIN_TYPES))] for h in hexes if rng.random() < 0.8}
+    red_operations = {
+        'airborne_landings': [{'hex': some_hex(), 'bn_count': int(rng.integers(2, 6))} for _ in range(8)],
+        'air_assault_landings': [{'hex': some_hex(), 'bn_count': int(rng.integers(2, 6))} for _ in range(8)],
+        'ground_attacks': [{'origin_hex': some_hex(), 'target_hex': some_hex(),
+                            'attacking_bns': unit_lines(4), 'fire_support': unit_lines(3)} for _ in range(60)]
+    }
+    blue_operations = {
+        'maneuver_movements': [{'unit_id': f"G{i}", 'unit_type': 'Medium', 'unit_count': 2,
+                                'from_to': int(rng.integers(1, 6)), 'to_to': int(rng.integers(1, 6)),
+                                'to_hex': some_hex()} for i in range(10)],
+        'fire_support_plans': [{'plan_id': f"P{i}", 'target_hex': some_hex(),
+                                'target_type': TARGET_TYPES[rng.integers(len(TARGET_TYPES))],
+                                'supporting_units': [{'type': 'SP_Arty', 'count': int(rng.integers(1, 4))}]}
+                               for i in range(10)]
+    }
+    green_maneuver = pd.DataFrame({
+        'Unit_ID': [f"G{i}" for i in range(30)],
+        'Hex': [some_hex() for _ in range(30)],
+        'Unit_Type': [UNIT_TYPES[rng.integers(len(UNIT_TYPES))] for _ in range(30)],
+        'Unit_Count': rng.integers(1, 4, 30)
+    })
+    landed_bns = pd.DataFrame({
+        'Hex': [some_hex() for _ in range(20)],
+        'BN_Type': 'Airborne',
+        'BNs_Landed': rng.integers(1, 5, 20)
+    })
+
+    return landed_bns, green_maneuver, red_operations, blue_operations, terrain
@@ -0,0 +1,26 @@
+import boots_benchmark
+from boots_benchmark import benchmark_stages, generate_scenario
+
+
+def test_excluded_stages_do_no_upstream_work(monkeypatch):
+    compiles = []
+    compile_operations = boots_benchmark.BOOTSCalculator.compile_operations
+
+    def recording_compile(self, red_operations, *args, **kwargs):
+        compiles.append(sorted(red_operations))
+        return compile_operations(self, red_operations, *args, **kwargs)
+
+    monkeypatch.setattr(boots_benchmark.BOOTSCalculator, 'compile_operations', recording_compile)
+    scenario = generate_scenario(20, seed=1)
+
+    results = benchmark_stages(scenario, repeat=1, stages=['_process_red_landings'])
+    assert [r.stage for r in results] == ['_process_red_landings']
+    assert results[0].peak_bytes is None
+    # Only the timed landing step compiles; the batch attacks are never built
+    assert ['ground_attacks'] not in compiles
+    compiles.clear()
+
+    results = benchmark_stages(scenario, repeat=1, stages=['_process_red_ground_attacks_batch'], memory=True)
+    assert results[0].size == 20
+    assert results[0].peak_bytes > 0
+    assert compiles == [['ground_attacks']]
@@ -0,0 +1,138 @@
+import copy
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from boots_calculator import BOOTSCalculator
+from boots_ingest import MISSING_TO, compile_ground_attacks
+from hex_grid import HexTerrainGrid, lookup_terrain
+
+RESULT_FRAMES = ('landing_results', 'attack_results', 'movement_results', 'unit_casualties',
+                 'territory_control', 'fire_support_area_effects')
+
+
+def assert_same_results(a, b):
+    for name in RESULT_FRAMES:
+        pd.testing.assert_frame_equal(getattr(a, name).reset_index(drop=True),
+                                      getattr(b, name).reset_index(drop=True), check_exact=True)
+    assert a.fire_support_effectiveness == b.fire_support_effectiveness
+    assert a.total_attacks_successful == b.total_attacks_successful
+    assert a.total_landings_successful == b.total_landings_successful
+
+
+def run_turn(scenario, hex_terrain=None, seed=7, **kwargs):
+    landed_bns, green_maneuver, red, blue, terrain = scenario
+    calculator = BOOTSCalculator(rng=np.random.default_rng(seed), **kwargs)
+    return calculator.calculate_boots_operations(landed_bns, green_maneuver, red, blue,
+                                                 terrain if hex_terrain is None else hex_terrain)
+
+
+@pytest.mark.parametrize('positioned', [True, False])
+def test_batch_attacks_match_loop(scenario, positioned):
+    landed_bns, green_maneuver, red, blue, terrain = scenario
+    if not positioned:
+        scenario = (pd.DataFrame(), pd.DataFrame(), red, blue, terrain)
+    assert_same_results(run_turn(scenario), run_turn(scenario, batch_attacks=True))
+
+
+def test_batch_attacks_match_loop_for_empty_batches():
+    calculator = BOOTSCalculator(rng=np.random.default_rng(0))
+    loop = calculator._process_red_ground_attacks([], pd.DataFrame(), pd.DataFrame(), {})
+    operations = calculator.compile_operations({'ground_attacks': []}, {})
+    batch = calculator._process_red_ground_attacks_batch(operations.attacks, operations.attack_bns,
+                                                         pd.DataFrame(), pd.DataFrame(), {})
+    assert len(loop) == len(batch) == 0
+    assert list(loop.columns) == list(batch.columns)
+
+
+def test_fire_support_casualties_land_in_area_hexes():
+    landed_bns = pd.DataFrame({'Hex': ['1,0', '2,0', '9,9'], 'BN_Type': 'Airborne', 'BNs_Landed': [2, 1, 3]})
+    blue = {'fire_support_plans': [
+        {'plan_id': 'a', 'target_hex': '1,0', 'target_type': 'Maneuver',
+         'supporting_units': [{'type': 'SP_Arty', 'count': 2}]},
+        {'plan_id': 'b', 'target_hex': '-5,-5', 'target_type': 'Infrastructure',
+         'supporting_units': [{'type': 'SP_Arty', 'count': 1}]}
+    ]}
+    results = BOOTSCalculator(rng=np.random.default_rng(0)).calculate_boots_operations(
+        landed_bns, pd.DataFrame(), {}, blue, {})
+
+    casualties = results.unit_casualties
+    fire_support = casualties[casualties['Operation'] == 'Fire_Support']
+    assert fire_support['Hex'].tolist() == ['1,0', '2,0', 'Various']
+    assert fire_support['Reason'].tolist() == ['Fire support plan a'] * 2 + ['Fire support plan b']
+
+    area = results.fire_support_area_effects.set_index('Hex')
+    expected = (area.loc[['1,0', '2,0'], 'Effect'] / 10).astype(np.int64).tolist()
+    assert fire_support['Casualties'][:2].tolist() == expected
+
+
+def test_batch_attacks_accept_tables_without_codes_or_keys(scenario):
+    landed_bns, green_maneuver, red, _, terrain = scenario
+    calculator = BOOTSCalculator()
+    attacks, attack_bns = compile_ground_attacks(red['ground_attacks'], {})
+    external = (attacks.to_frame()[['Origin_Hex', 'Target_Hex']],
+                attack_bns.to_frame()[['Attack', 'Type', 'Count', 'Fire_Support']])
+    compiled = calculator.compile_operations(red, {}, terrain)
+
+    calculator.rng = np.random.default_rng(3)
+    a = calculator._process_red_ground_attacks_batch(compiled.attacks, compiled.attack_bns,
+                                                     landed_bns, green_maneuver, terrain)
+    calculator.rng = np.random.default_rng(3)
+    b = calculator._process_red_ground_attacks_batch(*external, landed_bns, green_maneuver, terrain)
+    pd.testing.assert_frame_equal(a.to_frame(), b.to_frame(), check_exact=True)
+
+
+def test_grid_terrain_matches_dict(scenario):
+    terrain = scenario[-1]
+    assert_same_results(run_turn(scenario), run_turn(scenario, hex_terrain=HexTerrainGrid.from_dict(terrain)))
+
+
+def test_dict_and_grid_terrain_agree_on_hex_spellings(scenario):
+    landed_bns, green_maneuver, red, blue, terrain = scenario
+    grid = HexTerrainGrid.from_dict(terrain)
+    respelled = copy.deepcopy(red)
+    for operation in respelled['airborne_landings'] + respelled['air_assault_landings']:
+        operation['hex'] = operation['hex'].replace(',', ' , ')
+    for operation in respelled['ground_attacks']:
+        operation['target_hex'] = operation['target_hex'].replace(',', ', ')
+
+    calculator = BOOTSCalculator()
+    warnings = calculator.compile_operations(red, blue, terrain).warnings
+    assert calculator.compile_operations(respelled, blue, terrain).warnings == warnings
+    assert calculator.compile_operations(respelled, blue, grid).warnings == warnings
+
+    hexes = ['0, 0', ' 1,0', '0,0', '99,99', 'nonsense']
+    for hex_terrain in (terrain, grid):
+        assert lookup_terrain(hex_terrain, hexes, {})[0].tolist() == \
+            [terrain['0,0'], terrain['1,0'], terrain['0,0'], 'open', 'open']
+
+    scenario = (landed_bns, green_maneuver, respelled, blue, terrain)
+    by_dict, by_grid = run_turn(scenario), run_turn(scenario, hex_terrain=grid)
+    assert_same_results(by_dict, by_grid)
+    assert by_dict.attack_results['Terrain'].tolist() == run_turn((landed_bns, green_maneuver, red, blue, terrain)
+                                                                  ).attack_results['Terrain'].tolist()
+
+
+def test_dict_step_methods_match_turn(scenario):
+    landed_bns, green_maneuver, red, blue, terrain = scenario
+    turn = run_turn(scenario, seed=5)
+
+    calculator = BOOTSCalculator(rng=np.random.default_rng(5))
+    landings = calculator._process_red_landings(red['airborne_landings'], red['air_assault_landings'], terrain)
+    attacks = calculator._process_red_ground_attacks(red['ground_attacks'], landed_bns, green_maneuver, terrain)
+    pd.testing.assert_frame_equal(landings.to_frame(), turn.landing_results, check_exact=True)
+    pd.testing.assert_frame_equal(attacks.to_frame(), turn.attack_results, check_exact=True)
+
+
+def test_integral_float_tos_are_restricted():
+    movements = [{'unit_id': 'G1', 'unit_type': 'Light', 'unit_count': 1, 'from_to': 3.0, 'to_to': 4.0},
+                 {'unit_id': 'G2', 'unit_type': 'Light', 'unit_count': 1, 'from_to': 3, 'to_to': 4},
+                 {'unit_id': 'G3', 'unit_type': 'Light', 'unit_count': 1, 'from_to': 2.5, 'to_to': 1}]
+    calculator = BOOTSCalculator()
+    operations = calculator.compile_operations({}, {'maneuver_movements': movements})
+
+    assert operations.movements['From_TO'].tolist() == [3, 3, MISSING_TO]
+    assert operations.warnings == ['maneuver_movements: invalid from_to']
+    results = calculator._resolve_blue_movements(operations.movements, pd.DataFrame())
+    assert results['Reason'][:2].tolist() == ['Movement restricted'] * 2
@@ -0,0 +1,67 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from boots_calculator import BOOTSCalculator, BOOTSResults
+from boots_campaign import DIFF_COLUMNS, SNAPSHOT_COLUMNS, BOOTSCampaign
+
+
+def turn_results(rows):
+    """BOOTSResults carrying only territory_control rows (Hex, Control, Strength, Source)"""
+    empty = pd.DataFrame()
+    territory = pd.DataFrame(rows, columns=['Hex', 'Control', 'Strength', 'Source'])
+    return BOOTSResults(empty, empty, empty, empty, territory, {}, 0, 0, 0, 0, [])
+
+
+def test_turn_diffs_hold_only_changed_hexes():
+    initial = pd.DataFrame({'Hex': ['0,0'], 'Control': ['Contested'], 'Strength': [1.0], 'Source': ['Partial Attack']})
+    campaign = BOOTSCampaign(initial_control=initial)
+
+    diff = campaign.apply_turn_results(turn_results([
+        ('0,0', 'Contested', 1.0, 'Partial Attack'),   # unchanged
+        ('1,0', 'Contested', 2.0, 'Partial Attack'),
+        ('1,0', 'Red', 3.0, 'Ground Attack'),          # Red beats Contested
+        ('1,0', 'Red', 1.5, 'Airborne Landing'),
+    ]))
+    assert list(diff.columns) == DIFF_COLUMNS
+    assert diff.values.tolist() == [[1, '1,0', None, 'Red', 4.5, 'Ground Attack']]
+
+    diff = campaign.apply_turn_results(turn_results([('0,0', 'Red', 2.0, 'Ground Attack')]))
+    assert diff[['Turn', 'Hex', 'Previous_Control', 'Control']].values.tolist() == [[2, '0,0', 'Contested', 'Red']]
+    assert campaign.turn == 2
+    assert campaign.control_of('0,0') == 'Red'
+    assert campaign.control_of('5,5') is None
+    assert campaign.diffs()['Hex'].tolist() == ['1,0', '0,0']
+    assert len(campaign.diffs(2, 2)) == 1
+
+    with pytest.raises(ValueError):
+        campaign.diff(3)
+
+
+def test_snapshots_replay_diffs_for_past_turns():
+    campaign = BOOTSCampaign()
+    campaign.apply_turn_results(turn_results([('0,0', 'Contested', 1.0, 'Partial Attack')]))
+    campaign.apply_turn_results(turn_results([]))
+    campaign.apply_turn_results(turn_results([('0,0', 'Red', 2.0, 'Ground Attack'),
+                                              ('2,2', 'Red', 1.0, 'Airborne Landing')]))
+
+    assert campaign.snapshot(0).empty
+    assert list(campaign.snapshot(0).columns) == SNAPSHOT_COLUMNS
+    assert campaign.snapshot(1).values.tolist() == [['0,0', 'Contested', 1.0, 'Partial Attack', 1]]
+    assert campaign.snapshot(2).equals(campaign.snapshot(1))
+    latest = campaign.snapshot()
+    assert latest.values.tolist() == [['0,0', 'Red', 2.0, 'Ground Attack', 3], ['2,2', 'Red', 1.0, 'Airborne Landing', 3]]
+    pd.testing.assert_frame_equal(campaign.snapshot(3), latest)
+
+    with pytest.raises(ValueError):
+        campaign.snapshot(4)
+
+
+def test_run_turn_applies_calculated_territory(scenario):
+    landed_bns, green_maneuver, red, blue, terrain = scenario
+    campaign = BOOTSCampaign(BOOTSCalculator(rng=np.random.default_rng(2)))
+    results = campaign.run_turn(landed_bns, green_maneuver, red, blue, terrain)
+
+    held = set(results.territory_control['Hex'])
+    assert set(campaign.snapshot()['Hex']) == held
+    assert set(campaign.diff(1)['Hex']) == held
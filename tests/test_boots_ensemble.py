@@ -0,0 +1,34 @@
+import pandas as pd
+import pytest
+
+from boots_ensemble import BOOTSEnsembleRunner
+
+ENSEMBLE_FRAMES = ('landing_success_probability', 'attack_outcome_frequencies', 'casualty_quantiles',
+                   'territory_control_probability', 'replication_summary')
+
+
+def test_ensemble_is_reproducible_across_worker_counts(scenario):
+    landed_bns, green_maneuver, red, blue, terrain = scenario
+
+    def run(max_workers):
+        return BOOTSEnsembleRunner(max_workers=max_workers).run(landed_bns, green_maneuver, red, blue, terrain,
+                                                               n_replications=6, root_seed=42)
+
+    serial, parallel = run(1), run(3)
+    assert len(serial.replication_summary) == 6
+    for name in ENSEMBLE_FRAMES:
+        pd.testing.assert_frame_equal(getattr(serial, name), getattr(parallel, name), check_exact=True)
+
+
+def test_ensemble_depends_on_root_seed(scenario):
+    landed_bns, green_maneuver, red, blue, terrain = scenario
+    runner = BOOTSEnsembleRunner(max_workers=1)
+    a = runner.run(landed_bns, green_maneuver, red, blue, terrain, n_replications=4, root_seed=1)
+    b = runner.run(landed_bns, green_maneuver, red, blue, terrain, n_replications=4, root_seed=2)
+    assert not a.replication_summary.equals(b.replication_summary)
+
+
+@pytest.mark.parametrize('n_replications', [0, -3])
+def test_ensemble_rejects_empty_runs(scenario, n_replications):
+    with pytest.raises(ValueError):
+        BOOTSEnsembleRunner(max_workers=1).run(*scenario, n_replications=n_replications)
@@ -0,0 +1,30 @@
+import numpy as np
+import pandas as pd
+
+from boots_calculator import RESULT_TABLES, BOOTSCalculator
+from boots_exchange import read_boots_results, read_table_bundle, write_boots_results, write_table_bundle
+
+
+def test_bundle_round_trips_list_columns(tmp_path):
+    allocations = pd.DataFrame({'Allocation': ['a', 'b', 'c'],
+                                'Units': [['G1', 'G2'], [], {'G3': 2}],
+                                'Count': [2, 0, 1]})
+    write_table_bundle({'bn_allocations': allocations}, str(tmp_path / 'bundle'))
+    tables, _ = read_table_bundle(str(tmp_path / 'bundle'))
+
+    assert tables['bn_allocations']['Units'].tolist() == [['G1', 'G2'], [], {'G3': 2}]
+    assert tables['bn_allocations']['Allocation'].tolist() == ['a', 'b', 'c']
+    assert tables['bn_allocations']['Count'].tolist() == [2, 0, 1]
+
+
+def test_results_round_trip_through_npy_bundles(scenario, tmp_path):
+    results = BOOTSCalculator(rng=np.random.default_rng(4)).calculate_boots_operations(*scenario)
+    write_boots_results(results, str(tmp_path / 'results'))
+    back = read_boots_results(str(tmp_path / 'results'))
+
+    for name in RESULT_TABLES:
+        pd.testing.assert_frame_equal(getattr(results, name).reset_index(drop=True), getattr(back, name),
+                                      check_dtype=False)
+    assert back.fire_support_effectiveness == results.fire_support_effectiveness
+    assert back.total_attacks_successful == results.total_attacks_successful
+    assert back.warnings == results.warnings
@@ -0,0 +1,61 @@
+import tracemalloc
+
+import numpy as np
+
+from boots_calculator import BOOTSCalculator
+from boots_metrics import StageRecorder, metrics_to_frame
+
+STAGES = ['ingest', 'red_landings', 'unit_index', 'red_ground_attacks', 'blue_movements', 'blue_fire_support',
+          'unit_casualties', 'territory_control', 'result_frames']
+
+
+def test_hooks_see_every_stage_in_order(scenario):
+    seen = []
+    calculator = BOOTSCalculator(rng=np.random.default_rng(5))
+    calculator.metrics_hooks.append(seen.append)
+    results = calculator.calculate_boots_operations(*scenario)
+
+    assert [m.stage for m in seen] == STAGES
+    assert list(results.metrics) == STAGES
+    assert results.metrics['red_ground_attacks'].items_out == len(results.attack_results)
+    assert results.metrics['territory_control'].items_out == len(results.territory_control)
+    assert all(m.seconds >= 0 and m.peak_bytes is None for m in seen)
+
+    frame = metrics_to_frame(results.metrics)
+    assert frame['stage'].tolist() == STAGES
+    assert frame['items_in'].tolist() == [m.items_in for m in seen]
+
+
+def test_failing_hooks_do_not_stop_the_run(scenario):
+    def broken(metrics):
+        raise RuntimeError("collector down")
+
+    calculator = BOOTSCalculator(rng=np.random.default_rng(5))
+    calculator.metrics_hooks.append(broken)
+    assert list(calculator.calculate_boots_operations(*scenario).metrics) == STAGES
+
+
+def test_stage_peaks_exclude_memory_traced_before_the_stage():
+    recorder = StageRecorder(track_memory=True)
+    tracemalloc.start()
+    try:
+        held = np.ones(4_000_000)          # 32 MB live through both stages
+        with recorder.stage('small', 1):
+            small = np.ones(100_000)       # 0.8 MB
+        with recorder.stage('large', 1):
+            large = np.ones(1_000_000)     # 8 MB
+        assert tracemalloc.is_tracing()
+    finally:
+        tracemalloc.stop()
+    del held, small, large
+
+    assert 800_000 <= recorder.metrics['small'].peak_bytes < 2_000_000
+    assert 8_000_000 <= recorder.metrics['large'].peak_bytes < 10_000_000
+
+
+def test_recorder_starts_and_stops_tracing_itself():
+    recorder = StageRecorder(track_memory=True)
+    with recorder.stage('alloc', 1):
+        block = np.ones(100_000)
+    assert not tracemalloc.is_tracing()
+    assert recorder.metrics['alloc'].peak_bytes >= block.nbytes
@@ -0,0 +1,80 @@
+import asyncio
+import json
+import socket
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from boots_calculator import BOOTSCalculator
+from boots_remote import (RESULT_FRAMES, BOOTSAsyncClient, BOOTSRemoteError, BOOTSStandInServer, build_scenario,
+                          results_from_json, results_to_json)
+
+
+def local_results(scenario, seed):
+    return BOOTSCalculator(rng=np.random.default_rng(seed)).calculate_boots_operations(*scenario)
+
+
+def test_remote_results_keep_outcome_categories(scenario):
+    results = local_results(scenario, 1)
+
+    decoded = results_from_json(json.loads(json.dumps(results_to_json(results))))
+    outcome = results.attack_results['Outcome']
+    assert decoded.attack_results['Outcome'].cat.categories.tolist() == outcome.cat.categories.tolist()
+    pd.testing.assert_series_equal(decoded.attack_results['Outcome'], outcome)
+
+
+@pytest.mark.parametrize('payload', ['not a dict', {'x': 1}, {'results': []}, {'results': [{'bad': 1}, {}]}])
+def test_malformed_remote_replies_raise(payload):
+    with pytest.raises(BOOTSRemoteError):
+        BOOTSAsyncClient._decode_results(payload, 2)
+
+
+def test_stand_in_server_round_trip_matches_local_runs(scenario):
+    landed_bns, green_maneuver, red, blue, terrain = scenario
+    seeds = [3, 4, 5]
+    payloads = [build_scenario(BOOTSCalculator(), landed_bns, green_maneuver, red, blue, terrain, seed=seed)
+                for seed in seeds]
+
+    async def run():
+        async with BOOTSStandInServer() as server:
+            async with BOOTSAsyncClient(port=server.port, batch_size=2) as client:
+                return await client.run_many(payloads)
+
+    for seed, remote in zip(seeds, asyncio.run(run())):
+        local = local_results(scenario, seed)
+        for name in RESULT_FRAMES:
+            pd.testing.assert_frame_equal(getattr(remote, name), getattr(local, name).reset_index(drop=True),
+                                          check_dtype=False)
+        assert remote.total_attacks_successful == local.total_attacks_successful
+        assert remote.fire_support_effectiveness == local.fire_support_effectiveness
+
+
+def test_server_errors_are_retried_then_raised():
+    attempts = []
+
+    def failing_calculator(**kwargs):
+        attempts.append(kwargs)
+        raise RuntimeError("adjudication unavailable")
+
+    async def run():
+        async with BOOTSStandInServer(calculator_factory=failing_calculator) as server:
+            async with BOOTSAsyncClient(port=server.port, retries=2, backoff=0.001) as client:
+                return await asyncio.wait_for(client.run_many([{'seed': 1}, {'seed': 2}]), 10)
+
+    with pytest.raises(BOOTSRemoteError, match='after 3 attempts'):
+        asyncio.run(run())
+    assert len(attempts) == 6
+
+
+def test_unreachable_server_raises_after_retries():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        port = sock.getsockname()[1]
+
+    async def run():
+        async with BOOTSAsyncClient(port=port, retries=1, backoff=0.001) as client:
+            return await asyncio.wait_for(client.run_many([{'seed': 1}]), 10)
+
+    with pytest.raises(BOOTSRemoteError, match='after 2 attempts'):
+        asyncio.run(run())
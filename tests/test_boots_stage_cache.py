@@ -0,0 +1,16 @@
+import boots_stage_cache
+from boots_stage_cache import CachedBOOTSRunner, StageCache
+
+
+def test_stage_cache_entries_go_stale_with_engine_version(scenario, tmp_path, monkeypatch):
+    landed_bns, green_maneuver, red, blue, terrain = scenario
+
+    def run():
+        runner = CachedBOOTSRunner(cache=StageCache(cache_dir=tmp_path), seed=3)
+        runner.run(landed_bns, green_maneuver, red, blue, terrain)
+        return set(runner.last_hits.values())
+
+    assert run() == {False}
+    assert run() == {True}
+    monkeypatch.setattr(boots_stage_cache, 'engine_version', lambda: 'changed')
+    assert run() == {False}
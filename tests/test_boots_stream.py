@@ -0,0 +1,17 @@
+import json
+
+import pandas as pd
+
+from boots_calculator import BOOTSCalculator
+from boots_stream import STREAM_MANIFEST, write_boots_stream
+
+
+def test_stream_summary_counts_warnings_per_chunk(tmp_path):
+    operations = [{'kind': 'bogus'}] * 3 + [{'kind': 'airborne_landings', 'hex': '0,0', 'bn_count': 2}]
+    summary = write_boots_stream(BOOTSCalculator(), operations, pd.DataFrame(), pd.DataFrame(),
+                                 {'0,0': 'open'}, str(tmp_path), chunk_size=2)
+
+    assert summary.chunk_warnings == [2, 1]
+    assert summary.warnings == 3
+    with open(tmp_path / STREAM_MANIFEST) as f:
+        assert json.load(f)['summary']['warnings'] == 3
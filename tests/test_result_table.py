@@ -0,0 +1,72 @@
+import subprocess
+import sys
+import textwrap
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from boots_calculator import RESULT_TABLES, BOOTSCalculator
+from result_table import ResultTable, column, object_column
+
+REPO = Path(__file__).resolve().parents[1]
+
+
+@pytest.mark.parametrize('batch_attacks', [False, True])
+def test_lightweight_results_match_frames(scenario, batch_attacks):
+    def run(lightweight):
+        calculator = BOOTSCalculator(rng=np.random.default_rng(9), batch_attacks=batch_attacks,
+                                     lightweight=lightweight)
+        return calculator.calculate_boots_operations(*scenario)
+
+    light, full = run(True), run(False)
+    for name in RESULT_TABLES:
+        assert isinstance(getattr(light, name), ResultTable)
+        pd.testing.assert_frame_equal(light.frame(name), getattr(full, name).reset_index(drop=True))
+    assert 'result_frames' not in light.metrics
+    assert light.fire_support_effectiveness == full.fire_support_effectiveness
+    assert light.total_attacks_successful == full.total_attacks_successful
+
+
+def test_outcome_columns_become_categoricals():
+    table = ResultTable({'Outcome': object_column(['Success', 'Failure'])},
+                        {'Outcome': ['Success', 'Partial', 'Failure']})
+    outcome = table.to_frame()['Outcome']
+    assert outcome.cat.categories.tolist() == ['Success', 'Partial', 'Failure']
+    assert column(table, 'Missing').tolist() == [None, None]
+    assert np.isnan(column(table, 'Missing', float)).all()
+
+
+def test_lightweight_run_does_not_import_pandas():
+    script = textwrap.dedent("""
+        import sys
+        import numpy as np
+        from boots_calculator import BOOTSCalculator
+        from result_table import ResultTable, object_column
+
+        landed = ResultTable({'Hex': object_column(['1,0', '2,0']),
+                              'BN_Type': object_column(['Airborne', 'Amphib']),
+                              'BNs_Landed': np.array([2, 1])})
+        green = ResultTable({'Unit_ID': object_column(['G1', 'G2']),
+                             'Unit_Type': object_column(['Light', 'Heavy']),
+                             'Unit_Count': np.array([1, 2]),
+                             'Hex': object_column(['2,0', '3,0'])})
+        terrain = {f"{q},{r}": 'open' for q in range(5) for r in range(3)}
+        red = {'airborne_landings': [{'hex': '4,2', 'bn_count': 2}],
+               'ground_attacks': [{'attack_id': 'a1', 'target_hex': '2,0',
+                                   'attacking_bns': [{'type': 'Airborne', 'count': 2}]}]}
+        blue = {'maneuver_movements': [{'unit_id': 'G2', 'unit_type': 'Heavy', 'unit_count': 2, 'from_to': 1,
+                                        'to_to': 1, 'from_hex': '3,0', 'to_hex': '4,1'}],
+                'fire_support_plans': [{'plan_id': 'f', 'target_hex': '1,0', 'target_type': 'Maneuver',
+                                        'supporting_units': [{'type': 'SP_Arty', 'count': 1}]}]}
+
+        for batch_attacks in (False, True):
+            calculator = BOOTSCalculator(rng=np.random.default_rng(1), batch_attacks=batch_attacks, lightweight=True)
+            results = calculator.calculate_boots_operations(landed, green, red, blue, terrain)
+            assert results.warnings == [], results.warnings
+            assert len(results.attack_results) == 1 and len(results.movement_results) == 1
+        assert 'pandas' not in sys.modules, 'pandas was imported'
+    """)
+    completed = subprocess.run([sys.executable, '-c', script], cwd=REPO, capture_output=True, text=True)
+    assert completed.returncode == 0, completed.stderr
@@ -0,0 +1,76 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from boots_calculator import BOOTSCalculator
+from hex_grid import HexTerrainGrid
+from route_planner import RoutePlanner
+
+GREEN = pd.DataFrame({'Unit_ID': ['G1'], 'Unit_Type': ['Light'], 'Unit_Count': [1], 'Hex': ['0,0']})
+MOVE = {'maneuver_movements': [{'unit_id': 'G1', 'unit_type': 'Light', 'unit_count': 1, 'from_to': 1,
+                                'to_to': 1, 'from_hex': '0,0', 'to_hex': '2,0'}]}
+
+
+def movement(calculator, hex_terrain):
+    results = calculator.calculate_boots_operations(pd.DataFrame(), GREEN, {}, MOVE, hex_terrain)
+    return results.movement_results.iloc[0]
+
+
+def test_routes_follow_terrain_costs():
+    terrain = {f"{q},{r}": 'open' for q in range(-3, 4) for r in range(-3, 4)}
+    terrain['0,0'] = 'mountain'
+    planner = RoutePlanner(terrain, {'open': 1.0, 'mountain': 5.0}, movement_points_per_turn=2.0)
+
+    cost, hops, turns = planner.route_batch(['-1,0', '-1,0', '9,9'], ['1,0', '-1,0', '0,0'])
+    assert hops.tolist() == [3, 0, -1]
+    assert cost[0] == 3.0        # three open hexes around the mountain, not 5 + 1 through it
+    assert turns[0] == 1.5
+    assert np.isinf(cost[2])
+
+
+def test_cached_planner_is_reused_on_an_unchanged_map():
+    terrain = {'0,0': 'open', '1,0': 'open', '2,0': 'open'}
+    calculator = BOOTSCalculator()
+    movement(calculator, terrain)
+    planner = calculator._route_planner[0]
+    movement(calculator, terrain)
+    assert calculator._route_planner[0] is planner
+
+
+def test_dict_map_edits_rebuild_the_planner():
+    terrain = {'0,0': 'open', '1,0': 'open', '2,0': 'open'}
+    calculator = BOOTSCalculator()
+    assert movement(calculator, terrain)['Reason'] == 'Movement completed'
+
+    del terrain['1,0']
+    assert movement(calculator, terrain)['Reason'] == 'No route'
+
+    # A terrain change in place keeps the dict's stamp until the cache is cleared
+    terrain['1,0'] = 'open'
+    movement(calculator, terrain)
+    terrain['1,0'] = 'mountain'
+    calculator.clear_route_cache()
+    assert movement(calculator, terrain)['Path_Length'] == 2
+    assert movement(calculator, terrain)['Arrival_Time'] == pytest.approx(
+        (calculator.terrain_modifiers['mountain'] + calculator.terrain_modifiers['open'])
+        / calculator.movement_points_per_turn)
+
+
+def test_grid_edits_go_through_set_terrain():
+    grid = HexTerrainGrid.from_dict({'0,0': 'open', '1,0': 'open', '2,0': 'open'})
+    calculator = BOOTSCalculator()
+    assert movement(calculator, grid)['Reason'] == 'Movement completed'
+
+    with pytest.raises(ValueError):
+        grid.codes[1, 0] = 0
+    with pytest.raises(ValueError):
+        grid.set_terrain(['5,5'], 'open')
+
+    grid.set_terrain(['1, 0'], None)
+    assert grid.version == 1
+    assert '1,0' not in grid
+    assert movement(calculator, grid)['Reason'] == 'No route'
+
+    grid.set_terrain(['1,0'], 'swamp')
+    assert grid['1,0'] == 'swamp'
+    assert movement(calculator, grid)['Reason'] == 'Movement completed'
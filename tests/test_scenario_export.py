@@ -0,0 +1,111 @@
+import json
+from pathlib import Path
+
+import pandas as pd
+
+from boots_calculator import BOOTSResults
+from scenario_export import UNIT_FIELDS, ScenarioExporter, extract_inline_units
+
+REPO = Path(__file__).resolve().parents[1]
+
+PAGE = """<script>
+        const redUnits = [
+            // landing force
+            {
+                natoType: "amphibious",
+                designation: "AB-1",
+                lat: 24.9,
+                lng: 121.1,
+            },
+            {
+                natoType: "amphibious",
+                designation: "AB-1",
+                lat: 24.95,
+                lng: 121.15,
+            },
+        ];
+        const militaryUnits = [
+            {
+                natoType: "armor",
+                name: "584th",
+                lat: 24.1,
+                lng: 120.6,
+            }
+        ];
+</script>"""
+
+
+def unit(unit_id, force, lat, lng):
+    return {'id': unit_id, 'force': force, 'type': 'infantry', 'lat': lat, 'lng': lng}
+
+
+def turn_results(landings, territory=()):
+    """BOOTSResults with landing rows (Hex, BN_Type, BNs_Landed, Success) and territory_control rows"""
+    empty = pd.DataFrame()
+    landing_results = pd.DataFrame(landings, columns=['Hex', 'BN_Type', 'BNs_Landed', 'Success'])
+    territory_control = pd.DataFrame(list(territory), columns=['Hex', 'Control', 'Strength', 'Source'])
+    return BOOTSResults(landing_results, empty, empty, empty, territory_control, {}, 0, 0, 0, 0, [])
+
+
+def read(path):
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def test_units_are_written_per_tile(tmp_path):
+    exporter = ScenarioExporter(tmp_path, tile_degrees=0.5)
+    index = exporter.write_units([unit('red:1', 'red', 24.1, 121.1), unit('red:2', 'red', 24.4, 121.4),
+                                  unit('red:3', 'red', 24.9, 121.2), unit('green:1', 'green', 23.0, 120.2)])
+
+    assert index['fields'] == UNIT_FIELDS
+    assert index['bbox'] == [120.2, 23.0, 121.4, 24.9]
+    assert {key: tile['units'] for key, tile in index['tiles'].items()} == {'242_48': 2, '242_49': 1, '240_46': 1}
+    assert index['tiles']['242_48']['bbox'] == [121.0, 24.0, 121.5, 24.5]
+    assert sorted(map(tuple, index['threat_zone'])) == [(24.1, 121.1), (24.4, 121.4), (24.9, 121.2)]
+
+    rows = read(tmp_path / 'tiles' / '242_48.json')['rows']
+    assert [dict(zip(UNIT_FIELDS, row))['id'] for row in rows] == ['red:1', 'red:2']
+    assert read(tmp_path / 'index.json') == index
+
+    # Rewriting drops tiles that no longer hold units
+    exporter.write_units([unit('green:1', 'green', 23.0, 120.2)])
+    assert sorted(p.name for p in (tmp_path / 'tiles').iterdir()) == ['240_46.json']
+
+
+def test_turn_deltas_accumulate_landings_by_canonical_hex(tmp_path):
+    exporter = ScenarioExporter(tmp_path)
+    exporter.write_units([unit('green:1', 'green', 23.0, 120.2)])
+
+    delta = exporter.write_turn(turn_results([('3,4', 'Airborne', 2, True), ('3, 4', 'Airborne', 1, True),
+                                              ('1,1', 'Air_Assault', 3, False)],
+                                             [('3,4', 'Red', 3.0, 'Airborne Landing')]),
+                                units=pd.DataFrame({'Unit_ID': ['green:1'], 'Hex': ['0,0'],
+                                                    'Unit_Type': ['Heavy'], 'Unit_Count': [2]}),
+                                removed=['green:9'])
+    rows = [dict(zip(UNIT_FIELDS, row)) for tile in delta['units'].values() for row in tile]
+    assert [(row['id'], row['type'], row['count']) for row in rows] == [
+        ('red:3,4:Airborne', 'airborne', 3.0), ('green:1', 'armor', 2.0)]
+    assert delta['removed'] == ['green:9']
+    assert [f['id'] for f in delta['control']['features'] if f['id'].startswith('hex:')] == ['hex:3,4']
+
+    delta = exporter.write_turn(turn_results([('3,4', 'Airborne', 2, True), ('bad', 'Airborne', 1, True)]))
+    rows = [dict(zip(UNIT_FIELDS, row)) for tile in delta['units'].values() for row in tile]
+    assert [(row['id'], row['count'], row['designation']) for row in rows] == [('red:3,4:Airborne', 5.0, '5x')]
+
+    assert read(tmp_path / 'turns' / '2.json') == delta
+    assert read(tmp_path / 'index.json')['turns'] == 2
+
+
+def test_inline_units_get_unique_ids(tmp_path):
+    page = tmp_path / 'page.html'
+    page.write_text(PAGE, encoding='utf-8')
+    units = extract_inline_units(page)
+    assert [(u['id'], u['force'], u['type']) for u in units] == [
+        ('red:AB-1', 'red', 'amphibious'), ('red:AB-1#2', 'red', 'amphibious'), ('green:0', 'green', 'armor')]
+
+
+def test_exported_scenario_ids_are_unique():
+    index = read(REPO / 'scenario' / 'index.json')
+    ids = [row[0] for key in index['tiles'] for row in read(REPO / 'scenario' / 'tiles' / f"{key}.json")['rows']]
+    assert len(ids) == sum(tile['units'] for tile in index['tiles'].values())
+    assert len(ids) == len(set(ids))
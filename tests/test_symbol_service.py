@@ -0,0 +1,89 @@
+import pytest
+
+from symbol_service import SymbolService, parse_battalion_mapping
+
+MAPPING = """# Battalion symbols
+
+| Battalion Type | Symbol Slug | File | Notes |
+|----------------|-------------|------|-------|
+| CA BN (Heavy) | heavy_armour | symbols/heavy_armour.svg | |
+| SOF  BN | special_operations_infantry (custom) | symbols/sof.svg | Needs work |
+
+Green (Taiwan):
+
+| Battalion Type | Symbol Slug | File | Notes |
+|---|---|---|---|
+| CA BN (Heavy) | armour | symbols/armour.svg | |
+| Recon BN | reconnaissance | | |
+"""
+
+
+@pytest.fixture(scope='module')
+def service():
+    with SymbolService() as service:
+        yield service
+
+
+def test_search_matches_every_keyword_within_label_words(service):
+    slugs = [entry.slug for entry in service.search('ARMOUR', 'tracked')]
+    assert slugs == ['armoured_assault_carriers_tracked', 'amphibious_armoured_assault_carriers_tracked']
+
+    # 'arm' is a substring of both 'armour' and 'arms'
+    slugs = {entry.slug for entry in service.search('arm')}
+    assert {'armour', 'heavy_armour', 'joint_and_combined_arms_organizations'} <= slugs
+    assert service.search('arm', 'no-such-word') == []
+    assert service.search() == []
+
+
+def test_battalion_mapping_tables_per_team(tmp_path):
+    path = tmp_path / 'mapping.md'
+    path.write_text(MAPPING, encoding='utf-8')
+    symbols = parse_battalion_mapping(str(path))
+    assert [(s.team, s.battalion_type, s.slug, s.custom) for s in symbols] == [
+        ('Red', 'CA BN (Heavy)', 'heavy_armour', False),
+        ('Red', 'SOF BN', 'sof', True),
+        ('Green', 'CA BN (Heavy)', 'armour', False),
+        ('Green', 'Recon BN', 'reconnaissance', False),
+    ]
+    assert symbols[1].label_slug == 'special_operations_infantry'
+
+    service = SymbolService(mapping_path=str(path))
+    assert service.battalion_symbol('CA BN (Heavy)').slug == 'heavy_armour'
+    assert service.battalion_symbol('CA BN (Heavy)', 'Green').slug == 'armour'
+    assert service.battalion_symbol('Recon BN').team == 'Green'
+    assert service.battalion_symbol('Recon BN', 'Red') is None
+    assert service.slugs_for(['SOF   BN', 'Unknown BN', None, 'SOF BN']) == ['sof', None, None, 'sof']
+
+
+def test_fragments_are_the_indexed_guide_panels(service):
+    # Slugs repeated in the index resolve to their first panel
+    for entry in map(service.get, {entry.slug for entry in service.symbols}):
+        fragment = service.fragment(entry.slug)
+        assert fragment.startswith(f'<g transform="translate({entry.x:g},{entry.y:g})"')
+        assert fragment.endswith('</g>')
+    assert all(entry.span is not None for entry in service.symbols)
+
+    document = service.svg('armour')
+    assert document.startswith('<?xml') and document.rstrip().endswith('</svg>')
+    assert '<switch>' not in document and 'M 5,5 H 595 V 395 H 5 Z' in document
+
+
+def test_custom_and_unknown_fragments(service):
+    with open(f"{service.preview_dir}/sof.svg", encoding='utf-8') as f:
+        assert service.fragment('sof') == f.read()
+    assert service.svg('sof') == service.fragment('sof')
+    assert service.fragment('no_such_symbol') is None
+    assert service.svg('no_such_symbol') is None
+
+
+def test_fragment_cache_is_bounded_and_close_releases_the_guide():
+    service = SymbolService(max_cached_fragments=2)
+    for slug in ('armour', 'heavy_armour', 'light_armour', 'armour'):
+        service.fragment(slug)
+    assert list(service._fragment_cache) == ['light_armour', 'armour']
+
+    service.close()
+    assert service._guide is None and not service._fragment_cache
+    assert service.get('armour').span is None
+    assert service.fragment('armour').startswith('<g transform=')
+    service.close()
@@ -0,0 +1,14 @@
+from threat_geometry import ThreatGeometry
+
+
+def test_threat_geometry_uses_canonical_hex_keys():
+    geometry = ThreatGeometry()
+    delta = geometry.apply_control_changes(['3, 4', '1,1', '2,2'], ['Red', 'Contested', 'Red'])
+    assert [f['id'] for f in delta['features'] if f['id'].startswith('hex:')] == ['hex:3,4', 'hex:1,1', 'hex:2,2']
+
+    # Another spelling of a tracked hex is the same hex
+    assert geometry.apply_control_changes(['3,4'], ['Red'])['features'] == []
+    delta = geometry.apply_control_changes(['3 ,4', 'nonsense'], [None, 'Red'])
+    assert delta['removed'][0] == 'hex:3,4'
+    assert sorted(f['id'] for f in geometry.snapshot()['features'] if f['id'].startswith('hex:')) == \
+        ['hex:1,1', 'hex:2,2']
@@ -0,0 +1,71 @@
+import numpy as np
+import pandas as pd
+
+from boots_calculator import BOOTSCalculator
+from hex_grid import hex_keys
+from unit_index import HexUnitIndex
+
+STRENGTH = {'Light': 1.0, 'Heavy': 3.0}
+
+
+def test_units_without_hexes_give_no_positions():
+    index = HexUnitIndex(STRENGTH)
+    index.add_units('Red', pd.DataFrame({'Hex': [None, np.nan], 'Unit_Type': ['Light', 'Heavy']}))
+    assert not index.has_positions('Red')
+
+    index.add_units('Red', pd.DataFrame({'Hex': ['1,1'], 'Unit_Type': ['Heavy']}))
+    assert index.has_positions('Red')
+    assert index.strength_at('Red', '1,1') == 3.0
+
+
+def test_move_unit_to_new_hex_after_arrays_grow():
+    green = pd.DataFrame({'Unit_ID': [f"G{i}" for i in range(16)],
+                          'Hex': [f"{i},0" for i in range(16)],
+                          'Unit_Type': 'Heavy', 'Unit_Count': 1})
+    index = HexUnitIndex.build(green, pd.DataFrame(), STRENGTH)
+
+    # The 17th hex grows the strength arrays past their initial 16 slots
+    assert index.move_unit('G0', '99,99')
+    assert index.hex_of('G0') == '99,99'
+    assert index.strength_at('Green', '99,99') == 3.0
+    assert index.strength_at('Green', '0,0') == 0.0
+    assert not index.move_unit('missing', '1,1')
+
+
+def test_strength_within_keys_match_hex_strings():
+    red = pd.DataFrame({'Hex': ['0,0', '1,0', '0,2', '5,5'], 'Unit_Type': ['Light', 'Heavy', 'Light', 'Heavy']})
+    index = HexUnitIndex.build(pd.DataFrame(), red, STRENGTH)
+    targets = ['0,0', 'bad', '4,5']
+
+    by_hex = index.strength_within('Red', targets, 1).to_frame()
+    by_key = index.strength_within('Red', targets, 1, keys=hex_keys(targets)).to_frame()
+    pd.testing.assert_frame_equal(by_hex, by_key)
+    assert sorted(by_hex['Hex']) == ['0,0', '1,0', '5,5']
+
+
+def test_hex_spellings_share_one_slot():
+    green = pd.DataFrame({'Unit_ID': ['G1', 'G2'], 'Hex': ['3,4', '3, 4'], 'Unit_Type': 'Heavy', 'Unit_Count': 1})
+    index = HexUnitIndex.build(green, pd.DataFrame(), {'Heavy': 10.0})
+
+    assert index.strength_at('Green', '3,4') == index.strength_at('Green', ' 3 , 4') == 20.0
+    assert index.strengths_at('Green', ['3, 4', 'bad']).tolist() == [20.0, 0.0]
+    assert index.strength_within('Green', ['3,4'], 0)['Strength'].tolist() == [20.0]
+    assert index.hex_of('G2') == '3,4'
+
+    assert index.move_unit('G2', '4, 4')
+    assert index.strength_at('Green', '3,4') == 10.0
+    assert index.strength_at('Green', '4,4') == 10.0
+    assert not index.move_unit('G1', 'nowhere')
+
+
+def test_attacks_join_defenders_across_hex_spellings():
+    green = pd.DataFrame({'Unit_ID': [f"G{i}" for i in range(5)], 'Hex': '3,4', 'Unit_Type': 'Heavy',
+                          'Unit_Count': 1})
+    red = {'ground_attacks': [{'origin_hex': '2,4', 'target_hex': '3, 4',
+                               'attacking_bns': [{'type': 'Light', 'count': 1}]}]}
+    calculator = BOOTSCalculator(rng=np.random.default_rng(0))
+    for batch in (False, True):
+        calculator.batch_attacks = batch
+        attack = calculator.calculate_boots_operations(pd.DataFrame(), green, red, {}, {}).attack_results
+        assert attack['Defending_Strength'][0] == 5 * calculator.unit_combat_strength['Heavy']
+        assert attack['Outcome'][0] == 'Failure'
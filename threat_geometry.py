@@ -0,0 +1,280 @@
+"""
+Incremental threat-zone and territory geometry for the map
+Tracks Red and contested hexes from each turn's territory_control, keeps the
+Red threat-zone hull up to date incrementally and emits GeoJSON deltas that
+the map can apply without rebuilding its layers
+"""
+
+import logging
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+import numpy as np
+
+from hex_grid import hex_key, parse_hexes
+from result_table import Table, column
+
+KM_PER_DEGREE = 111.32
+
+THREAT_ZONE_ID = 'red_threat_zone'
+CONTROL_STATES = ('Red', 'Contested')
+
+
+def _canonical_hexes(hexes) -> List[Optional[str]]:
+    """Canonical "q,r" key of each hex, None where a hex cannot be parsed"""
+    q, r, valid = parse_hexes(hexes)
+    return [hex_key(int(a), int(b)) if ok else None for a, b, ok in zip(q, r, valid)]
+
+
+def convex_hull(points: np.ndarray) -> np.ndarray:
+    """
+    Indices of the convex hull vertices of (n, 2) points, counter-clockwise
+
+    Andrew's monotone chain, as in the map's convexHull(); collinear points
+    are dropped. Fewer than three distinct points are returned as they are.
+    """
+
+    order = np.lexsort((points[:, 1], points[:, 0]))
+    if len(order) < 3:
+        return order
+
+    def cross(o: int, a: int, b: int) -> float:
+        return ((points[a, 0] - points[o, 0]) * (points[b, 1] - points[o, 1]) -
+                (points[a, 1] - points[o, 1]) * (points[b, 0] - points[o, 0]))
+
+    lower: List[int] = []
+    for i in order:
+        while len(lower) >= 2 and cross(lower[-2], lower[-1], i) <= 0:
+            lower.pop()
+        lower.append(i)
+
+    upper: List[int] = []
+    for i in order[::-1]:
+        while len(upper) >= 2 and cross(upper[-2], upper[-1], i) <= 0:
+            upper.pop()
+        upper.append(i)
+
+    return np.asarray(lower[:-1] + upper[:-1], dtype=np.int64)
+
+
+def inside_convex(hull: np.ndarray, points: np.ndarray) -> np.ndarray:
+    """Whether each point lies inside or on a counter-clockwise convex polygon"""
+    if len(hull) < 3:
+        return np.zeros(len(points), dtype=bool)
+    start = hull
+    end = np.roll(hull, -1, axis=0)
+    cross = ((end[:, None, 0] - start[:, None, 0]) * (points[None, :, 1] - start[:, None, 1]) -
+             (end[:, None, 1] - start[:, None, 1]) * (points[None, :, 0] - start[:, None, 0]))
+    return (cross >= -1e-9).all(axis=0)
+
+
+@dataclass
+class HexProjection:
+    """
+    Placement of the axial hex grid on the map
+
+    Pointy-top hexes on a local flat-earth approximation around the origin,
+    which is accurate enough at theatre scale.
+    """
+    origin_lat: float = 23.7     # Hex 0,0 (placeholder - from scenario)
+    origin_lng: float = 121.0
+    hex_size_km: float = 5.0     # Centre-to-corner distance (placeholder)
+
+    def to_plane(self, q: np.ndarray, r: np.ndarray) -> np.ndarray:
+        """Hex centres as (n, 2) east/north km offsets from the origin"""
+        x = self.hex_size_km * np.sqrt(3) * (q + r / 2)
+        y = -self.hex_size_km * 1.5 * r  # r grows southward
+        return np.column_stack([x, y]).astype(np.float64)
+
+    def corner_offsets(self) -> np.ndarray:
+        """(6, 2) km offsets of a hex's corners from its centre"""
+        angles = np.deg2rad(30 + 60 * np.arange(6))
+        return self.hex_size_km * np.column_stack([np.cos(angles), np.sin(angles)])
+
+    def to_lnglat(self, plane: np.ndarray) -> np.ndarray:
+        """km offsets to (n, 2) [lng, lat] degrees"""
+        lat = self.origin_lat + plane[:, 1] / KM_PER_DEGREE
+        lng = self.origin_lng + plane[:, 0] / (KM_PER_DEGREE * np.cos(np.deg2rad(self.origin_lat)))
+        return np.column_stack([lng, lat])
+
+
+class ThreatGeometry:
+    """
+    Map geometry for Red and contested territory across turns
+
+    Hex control is kept in a dict, so a turn costs time proportional to the
+    hexes it changed. The Red threat zone is the convex hull of every Red
+    hex; the hull of their centres is maintained incrementally (new hexes
+    inside it leave it untouched; it is only rebuilt when a hull-vertex hex
+    stops being Red) and widened by the hex outline for display.
+    """
+
+    def __init__(self, projection: Optional[HexProjection] = None, precision: int = 5):
+        """
+        Args:
+            projection: Hex grid placement (default placeholder projection)
+            precision: Decimal places of emitted coordinates (5 ~ 1 m)
+        """
+        self.logger = logging.getLogger(__name__)
+        self.projection = projection or HexProjection()
+        self.precision = precision
+        self.turn = 0
+
+        # Hex -> Control for every hex held by Red or contested
+        self._control: Dict[str, str] = {}
+        # Red hex -> centre in plane km
+        self._red: Dict[str, Tuple[float, float]] = {}
+
+        # Current hull of Red hex centres (vertex coordinates and their hexes)
+        self._hull = np.zeros((0, 2))
+        self._hull_order: List[str] = []
+        self._hull_hexes: Set[str] = set()
+        self._zone: Optional[List[List[float]]] = None
+
+    def apply_turn_results(self, results) -> Dict:
+        """
+        Apply a turn's BOOTSResults.territory_control and return its GeoJSON delta
+
+        Several rows for one hex resolve like BOOTSCampaign: Red beats
+        Contested.
+        """
+        return self.apply_territory(results.territory_control)
+
+    def apply_territory(self, territory_control: Table) -> Dict:
+        """Apply territory_control rows (DataFrame or ResultTable); returns the GeoJSON delta"""
+
+        turn_control: Dict[str, str] = {}
+        for hex_coord, control in zip(_canonical_hexes(column(territory_control, 'Hex', object)),
+                                      column(territory_control, 'Control', object)):
+            if hex_coord is not None and control in CONTROL_STATES and turn_control.get(hex_coord) != 'Red':
+                turn_control[hex_coord] = control
+
+        return self.apply_control_changes(turn_control.keys(), turn_control.values())
+
+    def apply_control_changes(self, hexes: Iterable[str], controls: Iterable[Optional[str]]) -> Dict:
+        """
+        Apply new control per hex and return the GeoJSON delta
+
+        Accepts BOOTSCampaign diffs directly (diff['Hex'], diff['Control']). A
+        control of None returns the hex to Green, removing its feature. Hexes
+        are tracked by canonical "q,r" key, so "3, 4" and "3,4" are one hex;
+        unparsable hexes are skipped.
+        """
+
+        self.turn += 1
+        latest: Dict[str, Optional[str]] = {}
+        for hex_coord, control in zip(_canonical_hexes(list(hexes)), controls):
+            if hex_coord is not None:
+                latest[hex_coord] = control if control in CONTROL_STATES else None
+        changed = {hex_coord: control for hex_coord, control in latest.items()
+                   if self._control.get(hex_coord) != control}
+
+        keys = list(changed)
+        q, r, _ = parse_hexes(keys)
+        centres = self.projection.to_plane(q, r)
+
+        gained: List[int] = []
+        lost: List[str] = []
+        upserted: List[Dict] = []
+        removed: List[str] = []
+
+        for i, hex_coord in enumerate(keys):
+            control = changed[hex_coord]
+            was_red = hex_coord in self._red
+
+            if control is None:
+                self._control.pop(hex_coord, None)
+                removed.append(f"hex:{hex_coord}")
+            else:
+                self._control[hex_coord] = control
+                upserted.append(self._hex_feature(hex_coord, int(q[i]), int(r[i]), control))
+
+            if control == 'Red' and not was_red:
+                self._red[hex_coord] = (float(centres[i, 0]), float(centres[i, 1]))
+                gained.append(i)
+            elif control != 'Red' and was_red:
+                del self._red[hex_coord]
+                lost.append(hex_coord)
+
+        # Update the threat zone
+        zone_changed = False
+        if lost and self._hull_hexes.intersection(lost):
+            zone_changed = self._rebuild_hull()
+        elif gained:
+            zone_changed = self._extend_hull([keys[i] for i in gained], centres[gained])
+
+        if zone_changed:
+            if self._zone is None:
+                removed.append(THREAT_ZONE_ID)
+            else:
+                upserted.append(self._zone_feature())
+
+        self.logger.debug("Geometry turn %d: %d features updated, %d removed",
+                          self.turn, len(upserted), len(removed))
+
+        return {'type': 'FeatureCollection', 'turn': self.turn, 'features': upserted, 'removed': removed}
+
+    def snapshot(self) -> Dict:
+        """Full FeatureCollection of the current geometry (initial map load)"""
+
+        keys = list(self._control)
+        q, r, _ = parse_hexes(keys)
+        features = [self._hex_feature(hex_coord, int(q[i]), int(r[i]), self._control[hex_coord])
+                    for i, hex_coord in enumerate(keys)]
+        if self._zone is not None:
+            features.append(self._zone_feature())
+
+        return {'type': 'FeatureCollection', 'turn': self.turn, 'features': features}
+
+    def _extend_hull(self, hexes: List[str], centres: np.ndarray) -> bool:
+        """Add new Red hex centres to the hull; False if the hull did not change"""
+
+        outside = ~inside_convex(self._hull, centres)
+        if not outside.any():
+            return False
+
+        points = np.vstack([self._hull, centres[outside]])
+        owners = [h for h in self._hull_order] + [h for h, o in zip(hexes, outside) if o]
+        return self._set_hull(points, owners)
+
+    def _rebuild_hull(self) -> bool:
+        """Recompute the hull from every Red hex"""
+        owners = list(self._red)
+        points = np.array([self._red[h] for h in owners], dtype=np.float64).reshape(-1, 2)
+        return self._set_hull(points, owners)
+
+    def _set_hull(self, points: np.ndarray, owners: List[str]) -> bool:
+        vertices = convex_hull(points) if len(points) else np.zeros(0, dtype=np.int64)
+        self._hull = points[vertices]
+        self._hull_order = [owners[i] for i in vertices]
+        self._hull_hexes = set(self._hull_order)
+
+        if len(self._hull) == 0:
+            self._zone = None
+            return True
+
+        # Widen the centre hull by the hex outline so the zone covers whole hexes
+        corners = (self._hull[:, None, :] + self.projection.corner_offsets()[None, :, :]).reshape(-1, 2)
+        outline = corners[convex_hull(corners)]
+        ring = np.round(self.projection.to_lnglat(outline), self.precision).tolist()
+        self._zone = ring + ring[:1]
+        return True
+
+    def _hex_feature(self, hex_coord: str, q: int, r: int, control: str) -> Dict:
+        centre = self.projection.to_plane(np.array([q]), np.array([r]))
+        ring = np.round(self.projection.to_lnglat(centre + self.projection.corner_offsets()),
+                        self.precision).tolist()
+        return {
+            'type': 'Feature',
+            'id': f"hex:{hex_coord}",
+            'geometry': {'type': 'Polygon', 'coordinates': [ring + ring[:1]]},
+            'properties': {'layer': 'territory', 'hex': hex_coord, 'control': control}
+        }
+
+    def _zone_feature(self) -> Dict:
+        return {
+            'type': 'Feature',
+            'id': THREAT_ZONE_ID,
+            'geometry': {'type': 'Polygon', 'coordinates': [self._zone]},
+            'properties': {'layer': 'threat_zone', 'red_hexes': len(self._red)}
+        }
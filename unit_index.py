@@ -0,0 +1,225 @@
+"""
+Per-turn index of unit combat strength by hex
+Lets attacks resolve against the actual defenders in their target hexes with
+one vectorized join instead of filtering the unit frames once per attack
+"""
+
+import logging
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from hex_grid import NO_HEX_KEY, hex_key, hex_keys, pack_axial, parse_hexes, unpack_axial
+from result_table import ResultTable, Table, is_missing, object_column
+
+TEAMS = ('Green', 'Red')
+
+def hex_offsets(radius: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Axial offsets (dq, dr) of every hex within radius, with their hex distance"""
+    dq, dr = np.meshgrid(np.arange(-radius, radius + 1), np.arange(-radius, radius + 1), indexing='ij')
+    dq, dr = dq.ravel(), dr.ravel()
+    distance = (np.abs(dq) + np.abs(dr) + np.abs(dq + dr)) // 2
+    inside = distance <= radius
+    return dq[inside], dr[inside], distance[inside]
+
+
+# Unit tables come from different stages with different column names
+UNIT_TYPE_COLUMNS = ('Unit_Type', 'BN_Type', 'Type')
+UNIT_COUNT_COLUMNS = ('Unit_Count', 'BNs_Landed', 'Count')
+
+
+def _first_column(units: Table, candidates: Tuple[str, ...]) -> Optional[str]:
+    for column in candidates:
+        if column in units.columns:
+            return column
+    return None
+
+
+class HexUnitIndex:
+    """
+    Combat strength per hex for Green and Red units
+
+    Hexes are assigned integer slots by packed axial key (hex_grid.hex_keys),
+    so "3,4" and "3, 4" are one hex; each team's strength is a float array
+    over those slots, so a batch of target hexes is resolved with one sorted
+    key search and a single gather. Units whose hex cannot be parsed are
+    left out. Units with a Unit_ID are also tracked individually so
+    move_unit() can shift their strength between hexes without rebuilding
+    the index.
+    """
+
+    def __init__(self, unit_combat_strength: Dict[str, float]):
+        self.logger = logging.getLogger(__name__)
+        self.unit_combat_strength = unit_combat_strength
+
+        # Packed hex key -> slot, and the canonical "q,r" hex of each slot
+        self._slot_of: Dict[int, int] = {}
+        self._hexes: List[str] = []
+        self._key_index: Optional[Tuple[np.ndarray, np.ndarray]] = None
+        self._strength = {team: np.zeros(16, dtype=np.float64) for team in TEAMS}
+        self._positioned = {team: False for team in TEAMS}
+
+        # Unit_ID -> (team, slot, strength)
+        self._units: Dict[str, Tuple[str, int, float]] = {}
+
+    @classmethod
+    def build(cls,
+              green_units: Table,
+              red_units: Table,
+              unit_combat_strength: Dict[str, float]) -> 'HexUnitIndex':
+        """Build the index for a turn from the Green and landed Red unit tables"""
+        index = cls(unit_combat_strength)
+        index.add_units('Green', green_units)
+        index.add_units('Red', red_units)
+        return index
+
+    def has_positions(self, team: str) -> bool:
+        """Whether any units of the team were indexed with a Hex position"""
+        return self._positioned[team]
+
+    def add_units(self, team: str, units: Table):
+        """Add a unit table (Hex, unit type and count columns; DataFrame or ResultTable) to the index"""
+
+        if units is None or len(units) == 0 or 'Hex' not in units.columns:
+            return
+        keys = hex_keys(units['Hex'])
+        positioned = keys != NO_HEX_KEY
+        keys = keys[positioned]
+
+        type_column = _first_column(units, UNIT_TYPE_COLUMNS)
+        count_column = _first_column(units, UNIT_COUNT_COLUMNS)
+
+        counts = (np.asarray(units[count_column], dtype=np.float64)[positioned] if count_column
+                  else np.ones(len(keys)))
+        if type_column:
+            strength_of = self.unit_combat_strength
+            unit_types = np.asarray(units[type_column], dtype=object)[positioned]
+            unit_strength = np.fromiter((strength_of.get(t, 1.0) if not is_missing(t) else 1.0 for t in unit_types),
+                                        dtype=np.float64, count=len(unit_types))
+        else:
+            unit_strength = np.ones(len(keys))
+        strengths = counts * unit_strength
+
+        slots = self._slots_for(keys)
+        np.add.at(self._strength[team], slots, strengths)
+        # A table without parsable hexes gives no positions
+        self._positioned[team] |= bool(len(keys))
+
+        if 'Unit_ID' in units.columns:
+            unit_ids = np.asarray(units['Unit_ID'], dtype=object)[positioned]
+            for unit_id, slot, strength in zip(unit_ids, slots.tolist(), strengths):
+                self._units[unit_id] = (team, slot, float(strength))
+
+        self.logger.debug("Indexed %d %s units", len(keys), team)
+
+    def strength_at(self, team: str, hex_coord: str) -> float:
+        """Total combat strength of a team's units in one hex"""
+        slot = self._slot_of.get(int(hex_keys([hex_coord])[0]))
+        return 0.0 if slot is None else float(self._strength[team][slot])
+
+    def strengths_at(self, team: str, hexes: Iterable[str], keys: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Total combat strength of a team's units for each hex in a batch
+
+        keys are the packed keys of hexes (hex_grid.hex_keys), if already computed.
+        """
+        slots = self._key_slots(hex_keys(hexes) if keys is None else np.asarray(keys, dtype=np.int64))
+        strength = np.zeros(len(slots), dtype=np.float64)
+        found = slots >= 0
+        strength[found] = self._strength[team][slots[found]]
+        return strength
+
+    def hex_of(self, unit_id: str) -> Optional[str]:
+        """Current hex ("q,r") of a tracked unit, or None if the unit is unknown"""
+        unit = self._units.get(unit_id)
+        return self._hexes[unit[1]] if unit else None
+
+    def strength_within(self, team: str, hexes: Iterable[str], radius: int,
+                        keys: Optional[np.ndarray] = None) -> ResultTable:
+        """
+        Hexes holding a team's strength within radius of each query hex
+
+        Candidate hexes for every query are generated from axial offsets and
+        resolved against the hex buckets in one join. keys are the packed
+        keys of hexes (hex_grid.hex_keys), if already computed.
+
+        Returns:
+            ResultTable with Query (position in hexes), Hex, Distance, Strength
+        """
+
+        q, r, valid = parse_hexes(hexes) if keys is None else unpack_axial(keys)
+        dq, dr, distance = hex_offsets(radius)
+
+        query = np.repeat(np.nonzero(valid)[0], len(dq))
+        cand_q = np.repeat(q[valid], len(dq)) + np.tile(dq, int(valid.sum()))
+        cand_r = np.repeat(r[valid], len(dr)) + np.tile(dr, int(valid.sum()))
+        cand_distance = np.tile(distance, int(valid.sum()))
+
+        slots = self._key_slots(pack_axial(cand_q, cand_r))
+        found = slots >= 0
+        strength = np.zeros(len(slots), dtype=np.float64)
+        strength[found] = self._strength[team][slots[found]]
+        hit = found & (strength > 0)
+
+        return ResultTable({
+            'Query': query[hit],
+            'Hex': object_column(self._hexes)[slots[hit]],
+            'Distance': cand_distance[hit],
+            'Strength': strength[hit]
+        })
+
+    def move_unit(self, unit_id: str, to_hex: str) -> bool:
+        """Move a tracked unit's strength to another hex; False if the unit is unknown or to_hex unparsable"""
+
+        unit = self._units.get(unit_id)
+        to_key = hex_keys([to_hex])[0]
+        if unit is None or to_key == NO_HEX_KEY:
+            return False
+
+        team, from_slot, strength = unit
+        # Assign the slot first: it may grow (replace) the strength arrays
+        to_slot = int(self._slots_for(np.array([to_key]))[0])
+        self._strength[team][from_slot] -= strength
+        self._strength[team][to_slot] += strength
+        self._units[unit_id] = (team, to_slot, strength)
+
+        return True
+
+    def _slots_for(self, keys: np.ndarray) -> np.ndarray:
+        """Slots for packed hex keys, assigning new slots (and growing arrays) as needed"""
+
+        slots = []
+        for key in keys.tolist():
+            slot = self._slot_of.get(key)
+            if slot is None:
+                slot = len(self._hexes)
+                self._slot_of[key] = slot
+                q, r, _ = unpack_axial(np.array([key]))
+                self._hexes.append(hex_key(int(q[0]), int(r[0])))
+                self._key_index = None
+            slots.append(slot)
+
+        capacity = len(self._strength[TEAMS[0]])
+        if len(self._hexes) > capacity:
+            new_capacity = max(len(self._hexes), capacity * 2)
+            for team in TEAMS:
+                grown = np.zeros(new_capacity, dtype=np.float64)
+                grown[:capacity] = self._strength[team]
+                self._strength[team] = grown
+
+        return np.asarray(slots, dtype=np.int64)
+
+    def _key_slots(self, packed: np.ndarray) -> np.ndarray:
+        """Slot for each packed hex key, -1 where no indexed hex matches"""
+
+        if self._key_index is None:
+            keys = np.fromiter(self._slot_of.keys(), dtype=np.int64, count=len(self._slot_of))
+            slots = np.fromiter(self._slot_of.values(), dtype=np.int64, count=len(self._slot_of))
+            order = np.argsort(keys)
+            self._key_index = (keys[order], slots[order])
+
+        sorted_keys, sorted_slots = self._key_index
+        if len(sorted_keys) == 0:
+            return np.full(len(packed), -1, dtype=np.int64)
+        position = np.minimum(np.searchsorted(sorted_keys, packed), len(sorted_keys) - 1)
+        return np.where(sorted_keys[position] == packed, sorted_slots[position], -1)